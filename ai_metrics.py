@@ -1,146 +1,584 @@
+import os
 import re
+from bisect import bisect_right
+from heapq import nlargest, nsmallest
+from operator import itemgetter
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
+from bs4.builder import LXMLTreeBuilder
+from bs4.element import Tag
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 import json
-from collections import Counter
+from collections import Counter, deque
 import statistics
 
+# Opcionális: RE2 lineáris idejű regex motor a backtracking-érzékeny mintákhoz
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Opcionális: Aho-Corasick automata a fix szólistás számlálókhoz
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Opcionális: orjson gyorsabb JSON-LD parse-hoz
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _compile_all(patterns, flags=0) -> tuple:
+    """Pattern lista előfordítása modul betöltéskor - a hívások már csak a kész regexeket használják"""
+    return tuple(re.compile(pattern, flags) for pattern in patterns)
+
+
+def _count_matches(pattern, text: str) -> int:
+    """Találatok megszámolása lista építése nélkül (finditer, nem findall)"""
+    return sum(1 for _ in pattern.finditer(text))
+
+
+def _compile_linear(pattern: str, ignorecase: bool = False):
+    """RE2 fordítás, ha elérhető és a pattern ASCII (RE2 alatt a \\b és \\w csak ASCII betűt ismer)"""
+    if RE2_AVAILABLE and pattern.isascii():
+        return re2.compile(f'(?i){pattern}' if ignorecase else pattern)
+    return re.compile(pattern, re.IGNORECASE if ignorecase else 0)
+
+
+def _compile_union(patterns, flags=0) -> re.Pattern:
+    """Egy kategória pattern-jeinek összevonása egyetlen alternációba - egy szövegbejárás kategóriánként"""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), flags)
+
+
+def _json_loads(content: str):
+    """JSON parse orjson-nal, ha elérhető - amit elutasít (pl. NaN, 64 bitnél nagyobb egész), azt a stdlib json próbálja"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+def _compile_keywords(words) -> tuple:
+    """Fix szólista -> (Aho-Corasick automata vagy None, \\b(?:...)\\b regex tartalék) pár"""
+    pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b', re.IGNORECASE)
+    if not AHOCORASICK_AVAILABLE:
+        return None, pattern
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word.lower(), len(word))
+    automaton.make_automaton()
+    return automaton, pattern
+
+
+def _is_word_char(char: str) -> bool:
+    """A re modul \\w definíciója (Unicode betű/szám vagy aláhúzás)"""
+    return char.isalnum() or char == '_'
+
+
+def _count_keywords(keywords: tuple, text: str) -> int:
+    """Egész szavas kulcsszó találatok száma - automatával egy bejárás, a szóhatárt utólag ellenőrizzük"""
+    automaton, pattern = keywords
+    lowered = text.lower()
+    # Ha a kisbetűsítés eltolja az indexeket (pl. 'İ'), a regex számol
+    if automaton is None or len(lowered) != len(text):
+        return _count_matches(pattern, text)
+    count = 0
+    last = len(lowered) - 1
+    for end, length in automaton.iter(lowered):
+        start = end - length + 1
+        if start > 0 and _is_word_char(lowered[start - 1]):
+            continue
+        if end < last and _is_word_char(lowered[end + 1]):
+            continue
+        count += 1
+    return count
+
+
+# Fejlett kérdés pattern-ek - több nyelven és formátumban
+QUESTION_PATTERNS = (
+    # Magyar kérdőszavak
+    r'\b(mi(?:t|nek|ért|kor|lyen|nden)?|hol|hogy(?:an)?|miért|melyik|mennyi|ki(?:t|nek)?|mikor)\b',
+    # Angol kérdőszavak
+    r'\b(what|when|where|how|why|which|who|whom|whose|how\s+(?:to|do|does|can|much|many))\b',
+    # Kérdőjelek és pattern-ek
+    r'\?',
+    # Step-by-step jelzők
+    r'\b(lépés|step|phase|stage|először|first|második|second|harmadik|third)\b',
+    # Tutorial jelzők
+    r'\b(útmutató|tutorial|guide|how-to|hogyan)\b'
+)
+
+ANSWER_INDICATORS = (
+    'válasz', 'answer', 'megoldás', 'solution', 'eredmény', 'result',
+    'következő', 'next', 'végül', 'finally', 'összefoglalva', 'summary'
+)
+
+# AI-barát tartalom jelek
+AI_FRIENDLY_STEP_BY_STEP = (
+    r'\b\d+\.\s',  # 1. 2. 3.
+    r'\bstep\s+\d+',  # step 1, step 2
+    r'\b(első|második|harmadik|negyedik|ötödik)\s+(lépés|phase)',
+    r'\b(first|second|third|fourth|fifth)\s+(step|stage)',
+    r'(kezdésként|first|először|to\s+start)',
+    r'(végül|finally|last|utoljára)'
+)
+
+AI_FRIENDLY_CODE_EXAMPLES = (
+    r'<code[^>]*>.*?</code>',
+    r'```[\s\S]*?```',
+    r'<pre[^>]*>.*?</pre>',
+    r'\b(példa|example|code|kód):\s*\n',
+    r'function\s+\w+\s*\(',
+    r'def\s+\w+\s*\(',
+    r'class\s+\w+',
+    r'import\s+\w+'
+)
+
+AI_FRIENDLY_INTERACTIVE = (
+    r'<button[^>]*>',
+    r'<input[^>]*>',
+    r'onclick\s*=',
+    r'addEventListener',
+    r'\b(kattints|click|select|choose|válassz)\b'
+)
+
+
+def _question_type(pattern: str) -> str:
+    """Kérdés pattern típusa (direct / numbered / indirect) a pattern szövege alapján"""
+    if any(word in pattern for word in ['mi', 'what', 'how']):
+        return 'direct'
+    elif any(word in pattern for word in ['step', 'lépés']):
+        return 'numbered'
+    return 'indirect'
+
+
+# Előre fordított változatok - (regex, kérdés típus) párok
+QUESTION_RE = tuple((re.compile(pattern, re.IGNORECASE), _question_type(pattern)) for pattern in QUESTION_PATTERNS)
+AI_FRIENDLY_STEP_BY_STEP_RE = _compile_all(AI_FRIENDLY_STEP_BY_STEP, re.IGNORECASE)
+AI_FRIENDLY_CODE_EXAMPLES_RE = _compile_all(AI_FRIENDLY_CODE_EXAMPLES, re.IGNORECASE)
+AI_FRIENDLY_INTERACTIVE_RE = _compile_all(AI_FRIENDLY_INTERACTIVE, re.IGNORECASE)
+
+# Dátum formátumok - (pattern, típus) párok, egyetlen alternációba fűzve névvel ellátott csoportokkal
+_DATE_PATTERNS = (
+    # ISO formátumok
+    (r'\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2})?(?:Z|[+-]\d{2}:\d{2})?', 'iso'),
+    # Amerikai formátum
+    (r'\d{1,2}/\d{1,2}/\d{4}', 'us'),
+    # Európai formátum
+    (r'\d{1,2}\.\d{1,2}\.\d{4}', 'eu'),
+    # Magyar formátum
+    (r'\d{4}\.\s*(?:január|február|március|április|május|június|július|augusztus|szeptember|október|november|december)\s*\d{1,2}', 'hu'),
+    # Angol hónapok
+    (r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}', 'en'),
+    # Relatív dátumok
+    (r'\b(?:today|yesterday|törtenap|ma|tegnap|\d+\s+(?:days?|napja?|weeks?|hete?|months?|hónapja?)\s+ago)\b', 'relative')
+)
+_DATE_TYPES = tuple(date_type for _, date_type in _DATE_PATTERNS)
+_DATE_RE = re.compile('|'.join(f'(?P<{date_type}>{pattern})' for pattern, date_type in _DATE_PATTERNS), re.IGNORECASE)
+
+# Frissítési indikátorok
+_FRESHNESS_RE = _compile_union((
+    r'\b(?:friss(?:ítve|ített)|updated?|last\s+(?:modified|updated)|utolj(?:ára\s+)?(?:módosítva|frissítve))\b',
+    r'\b(?:új|new|latest|legújabb|aktuális|current)\b',
+    r'\b(?:nemrég|recently|lately|not\s+long\s+ago)\b',
+    r'\b\d{4}(?:\.|-)(?:0[1-9]|1[0-2])(?:\.|-)(?:0[1-9]|[12]\d|3[01])\b'  # timestamp pattern
+), re.IGNORECASE)
+
+# Forrás minőség indikátorok
+_SOURCE_QUALITY_RE = _compile_union((
+    r'\b(?:forrás|source|references?|bibliography|irodalom)\s*:',
+    r'\b(?:according\s+to|szerint|alapján|hivatkozva)\b',
+    r'\b(?:study|research|kutatás|tanulmány|vizsgálat)\b',
+    r'\b(?:egyetem|university|akadémia|academy|institute)\b'
+), re.IGNORECASE)
+
+# Szakmai és technikai kifejezések (kis/nagybetű érzékeny - rövidítések)
+_TECHNICAL_RE = _compile_union((
+    r'\b[A-Z]{2,}\b',  # Acronyms
+    r'\b\w+(?:ás|és|ség|ság|tat|tel|kor|ban|ben)\b',  # Magyar szakmai képzők
+    r'\b(?:algorithm|protocol|framework|methodology|implementation|optimization)\b',  # Angol technikai
+    r'\b\w+(?:ing|tion|sion|ment|ness|ity|acy|ism)\b'  # Angol szakmai képzők
+))
+
+# Definíciók és magyarázatok
+_DEFINITION_RE = _compile_union((
+    r'\b(?:például|azaz|vagyis|jelentése|definíció|that\s+is|i\.e\.|e\.g\.|namely|specifically)\b',
+    r'\b\w+\s+(?:azt\s+jelenti|means|refers\s+to|is\s+defined\s+as)\b',
+    r':\s*[A-Z]',  # Definíció pattern
+), re.IGNORECASE)
+
+# Példák és esettanulmányok
+_EXAMPLE_RE = _compile_union((
+    r'\b(?:például|for\s+example|for\s+instance|such\s+as|like)\b',
+    r'\b(?:case\s+study|esettanulmány|example|példa)\b',
+    r'\b(?:consider|képzelje\s+el|imagine|suppose)\b'
+), re.IGNORECASE)
+
+# Adatok és hivatkozások mélysége
+_DATA_DEPTH_RE = _compile_union((
+    r'\b(?:research|kutatás|study|tanulmány|survey|felmérés|analysis|elemzés)\b',
+    r'\b(?:data|adat|statistics|statisztika|findings|eredmények)\b',
+    r'\b(?:according\s+to|szerint|based\s+on|alapján)\b'
+), re.IGNORECASE)
+
+# Közvetlen megszólítás
+_DIRECT_ADDRESS_RE = _compile_union((
+    r'\b(?:ön|te|maga|önt|téged|you|your)\b',
+    r'\b(?:kedves\s+(?:olvasó|látogató)|dear\s+(?:reader|visitor))\b',
+    r'\b(?:ha\s+(?:ön|te|you)|if\s+you)\b'
+), re.IGNORECASE)
+
+# Beszélgetős kifejezések
+_CONVERSATIONAL_RE = _compile_union((
+    r'\b(?:tudod|látod|érted|gondold|képzeld|nézd|figyelj)\b',
+    r'\b(?:you\s+know|you\s+see|you\s+understand|look|listen|imagine)\b',
+    r'\b(?:egyszerűen|simply|just|merely|csak|csupán)\b',
+    r'\b(?:természetesen|obviously|of\s+course|clearly|nyilvánvalóan)\b'
+), re.IGNORECASE)
+
+# Informális nyelvi elemek - a hármas pont str.count-tal, a többszörös felkiáltás csak 3+ '!' esetén fut
+_INFORMAL_RE = _compile_union((
+    r'\b(?:na|well|so|szóval|tehát|persze|sure|yeah|okay|oké)\b',
+    r'\b(?:amúgy|egyébként|by\s+the\s+way|btw|incidentally)\b'
+), re.IGNORECASE)
+_MULTI_EXCLAMATION_RE = re.compile(r'!\s*!\s*!')
+
+# Empátia és kapcsolódás - a mondat szintű, .*-os minta külön fut,
+# hogy ne nyelje el a soron belüli többi találatot
+_EMPATHY_SENTENCE_RE = re.compile(r'\b(?:értem|understand|tudom|know|érzem|feel)\b.*\b(?:hogy|that|mit|what)\b', re.IGNORECASE)
+_EMPATHY_RE = _compile_union((
+    r'\b(?:természetes|natural|normális|normal|érthető|understandable)\b',
+    r'\b(?:segíteni|help|támogatni|support|könnyíteni|make\s+easier)\b'
+), re.IGNORECASE)
+
+# CTA (Call to Action) elemek
+_CTA_RE = _compile_union((
+    r'\b(?:kattints|click|regisztrálj|sign\s+up|iratkozz\s+fel|subscribe)\b',
+    r'\b(?:töltsd\s+le|download|vásárolj|buy|rendelj|order)\b',
+    r'\b(?:kezdd\s+el|start|próbáld\s+ki|try\s+it|tanuld\s+meg|learn)\b'
+), re.IGNORECASE)
+
+# Egyedi minták
+_TRAILING_COMMA_OBJ_RE = re.compile(r',\s*}')
+_TRAILING_COMMA_ARR_RE = re.compile(r',\s*]')
+_FAQ_PAGE_TYPE_RE = re.compile(r'"@type"\s*:\s*"FAQPage"')
+_QUESTION_TYPE_RE = re.compile(r'"@type"\s*:\s*"Question"')
+_STEP_WORD_RE = re.compile(r'\b(?:step|lépés)\b', re.IGNORECASE)
+_NUMERIC_REF_RE = _compile_linear(r'\[\d+\]')
+_DOI_RE = _compile_linear(r'(?:doi:|DOI:)\s*10\.\d{4,}\/[^\s]+')
+_ARXIV_RE = _compile_linear(r'arXiv:\d{4}\.\d{4,5}')
+# Mondat = írásjelek közötti szakasz, amiben van nem-whitespace karakter (split + strip nélkül számolható)
+_SENTENCE_RE = re.compile(r'\s*[^.!?\s][^.!?]*')
+_NUMBER_RE = re.compile(r'\b\d+(?:[.,]\d+)?(?:%|kg|g|m|cm|mm|km|l|ml|€|$|Ft|°C|°F)?\b')
+_PERCENTAGE_RE = re.compile(r'\b\d+(?:[.,]\d+)?%\b')
+_RANGE_RE = re.compile(r'\b\d+(?:[.,]\d+)?\s*[-–—]\s*\d+(?:[.,]\d+)?\b')
+_RHETORICAL_RE = _compile_linear(r'\b(?:vajon|ugye|nem\s+igaz|isn\'t\s+it|right|don\'t\s+you\s+think)\b.*?\?', ignorecase=True)
+# Fix szólisták - Aho-Corasick automata, ha a pyahocorasick telepítve van
+_INTERACTIVE_WORDS = _compile_keywords(('kattints', 'click', 'válassz', 'choose', 'próbáld', 'try', 'teszteld', 'test'))
+_PERSONAL_PRONOUNS = _compile_keywords(('én', 'te', 'ő', 'mi', 'ti', 'ők', 'i', 'you', 'he', 'she', 'we', 'they',
+                                        'my', 'your', 'his', 'her', 'our', 'their'))
+_NUMBERED_QA_RE = re.compile(r'\d+\.\s*(?:mi|what|how|ki|who|hol|where|mikor|when|miért|why)', re.IGNORECASE)
+_BULLETED_QA_RE = re.compile(r'[•▪▫◦]\s*(?:mi|what|how|ki|who|hol|where|mikor|when|miért|why)', re.IGNORECASE)
+_NUMBERED_STEP_RE = re.compile(r'\b(?:step\s+)?\d+[.)]\s+', re.IGNORECASE)
+
+# AI-readiness metrikák súlyozása: (név, szekció, pontszám kulcs, súly, AI fontosság)
+_METRIC_PATHS = (
+    ("structure", "content_structure", "structure_score", 0.20, "high"),  # AI-k szeretik a jó struktúrát
+    ("qa_format", "qa_format", "qa_score", 0.18, "critical"),  # Q&A formátum nagyon fontos
+    ("entities", "entity_markup", "entity_score", 0.15, "high"),
+    ("freshness", "content_freshness", "freshness_score", 0.08, "medium"),
+    ("citations", "citation_readiness", "citation_score", 0.12, "high"),
+    ("formatting", "ai_friendly_formatting", "formatting_score", 0.15, "high"),
+    ("depth", "knowledge_depth", "depth_score", 0.10, "medium"),
+    ("conversational", "conversational_elements", "conversational_score", 0.02, "low")  # Kevésbé fontos, de hasznos
+)
+
+METRIC_CONFIGS = {
+    key: {"path": [section, score_key], "weight": weight, "ai_importance": importance}
+    for key, section, score_key, weight, importance in _METRIC_PATHS
+}
+
+# Kategóriák és a hozzájuk tartozó metrikák - az összefoglaló kategória átlagaihoz
+_CATEGORY_METRICS = (
+    ("structural", ("structure", "formatting")),
+    ("content", ("qa_format", "depth", "conversational")),
+    ("semantic", ("entities", "citations")),
+    ("technical", ("freshness",))
+)
+
+# Metrika-specifikus javaslatok, fejlesztési nehézség szorzók és terület leírások
+_METRIC_SUGGESTIONS = {
+    "structure": "Hozz létre számozott listákat és javítsd a heading hierarchiát. AI-k jobban értik a strukturált tartalmat.",
+    "qa_format": "Implementálj FAQ schema markup-ot és hozz létre Q&A szekciót. Ez kritikus az AI platformoknak.",
+    "entities": "Adj hozzá Schema.org markup-ot személyekhez, helyekhez és termékekhez. Segíti az AI megértést.",
+    "freshness": "Adj hozzá publikálási és módosítási dátumokat. Friss tartalom magasabb prioritást kap.",
+    "citations": "Hivatkozz külső forrásokra és adj hozzá idézeteket. Növeli a tartalom hitelességét.",
+    "formatting": "Javítsd a képek alt szövegeit és add hozzá a táblázat feliratokat. AI-barát formázás.",
+    "depth": "Bővítsd ki a tartalmat példákkal és részletes magyarázatokkal. Mélyebb tudás jobb AI értékelést ad.",
+    "conversational": "Használj kérdéseket és közvetlen megszólítást. Beszélgetős stílus jobban működik chatbotokkal."
+}
+
+_DIFFICULTY_MULTIPLIERS = {
+    "structure": 0.8,      # Relatively easy
+    "qa_format": 0.9,      # Easy with schema
+    "entities": 0.7,       # Requires technical knowledge
+    "freshness": 0.9,      # Very easy
+    "citations": 0.6,      # Requires content work
+    "formatting": 0.8,     # Technical but straightforward  
+    "depth": 0.5,          # Content-heavy
+    "conversational": 0.7  # Style change needed
+}
+
+_AREA_DESCRIPTIONS = {
+    "structure": "Tartalom strukturáltsága és szervezettsége",
+    "qa_format": "Kérdés-válasz formátum és FAQ elemek",
+    "entities": "Szemantikus jelölések és entitások", 
+    "freshness": "Tartalom frissessége és időszerűsége",
+    "citations": "Hivatkozások és források megléte",
+    "formatting": "AI-barát formázás és hozzáférhetőség",
+    "depth": "Tudás mélysége és részletessége",
+    "conversational": "Beszélgetős elemek és interaktivitás"
+}
+
+# Terület szintek: bisect_right(_LEVEL_THRESHOLDS, score) adja a _LEVELS indexét (>= 40 / 60 / 80)
+_LEVEL_THRESHOLDS = (40, 60, 80)
+_LEVELS = ("Gyenge", "Közepes", "Jó", "Kiváló")
+
+_EMPTY = {}
+
+# Szálanként egy újrahasznosított parser builder - batch auditnál nem építjük újra minden oldalra
+_SOUP_BUILDERS = threading.local()
+
+
+def _make_soup(html: str) -> BeautifulSoup:
+    """HTML parse-olása a szálhoz tartozó, újrahasznosított tree builderrel"""
+    builder = getattr(_SOUP_BUILDERS, 'builder', None)
+    if builder is None:
+        builder = _SOUP_BUILDERS.builder = LXMLTreeBuilder()
+    return BeautifulSoup(html, builder=builder)
+
+
+# Minőségi források - a link host részén vizsgálva (pl. "government.com" nem számít .gov-nak)
+_QUALITY_HOST_RE = re.compile(
+    r'(?:^|\.)(?:wikipedia\.org|(?:gov|edu)(?:\.[a-z]{2})?)$'
+    r'|academic|research|pubmed|scholar\.google|arxiv',
+    re.IGNORECASE
+)
+
+# Bármilyen (unicode) betű - leíró heading ellenőrzéshez
+_HAS_ALPHA_RE = re.compile(r'[^\W\d_]')
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+SEMANTIC_TAGS = ('article', 'section', 'header', 'footer', 'aside', 'main')
+
+# Statikus kulcsszó halmazok - import időben egyszer épülnek, O(1) tagság vizsgálat
+_QA_TYPES = frozenset({'Question', 'Answer'})
+_HIGH_VALUE_ENTITIES = frozenset({
+    'Person', 'Organization', 'Product', 'Article', 'HowTo', 'Recipe',
+    'FAQPage', 'QAPage', 'Course', 'VideoObject', 'WebPage'
+})
+_DATE_FIELDS = frozenset({'datePublished', 'dateModified', 'dateCreated', 'uploadDate', 'releaseDate'})
+_SCHEMA_DATE_PROPS = ('datePublished', 'dateModified', 'dateCreated')
+
+
+def _attr_contains_selector(attr: str, fragments, tags=('',)) -> str:
+    """CSS selector union: [attr*="x" i] minden tag/fragmens párosra - egy DOM bejárás regex helyett"""
+    return ', '.join(f'{tag}[{attr}*="{fragment}" i]' for tag in tags for fragment in fragments)
+
+
+# Előre összeállított selectorok a class/role alapú kereséshez
+_FAQ_CLASS_SELECTOR = _attr_contains_selector('class', ('faq', 'question', 'answer', 'qa'))
+_ACCORDION_CLASS_SELECTOR = _attr_contains_selector('class', ('accordion', 'collapse', 'toggle'))
+_ACCORDION_QA_CLASS_SELECTOR = _attr_contains_selector('class', ('accordion', 'collapse', 'toggle', 'expand'))
+_FOOTNOTE_CLASS_SELECTOR = _attr_contains_selector('class', ('footnote', 'reference', 'citation', 'biblio'))
+_BREADCRUMB_CLASS_SELECTOR = _attr_contains_selector('class', ('breadcrumb',))
+_CONTENT_SECTION_SELECTOR = _attr_contains_selector(
+    'class', ('content', 'article', 'section'), tags=('section', 'article', 'div')
+)
+_LANDMARK_ROLE_SELECTOR = ', '.join(
+    f'[role*="{role}"]' for role in ('main', 'banner', 'navigation', 'complementary', 'contentinfo')
+)
+_NAV_SELECTOR = 'nav, [role="navigation"]'
+
+# Kibővített dátum meta tagek
+_DATE_META_SELECTOR = ', '.join([
+    'meta[property^="article:"]',
+    'meta[name*="date"]',
+    'meta[name*="published"]',
+    'meta[name*="modified"]',
+    'meta[name*="updated"]',
+    'meta[property="og:updated_time"]',
+    'meta[name="last-modified"]',
+    'meta[name="revised"]'
+])
+
+
+# A census által számolt attribútumok - '@' prefixes kulccsal kerülnek a tag nevek mellé
+_CENSUS_ATTRS = tuple((attr, f'@{attr}') for attr in ('itemscope', 'typeof', 'aria-label', 'aria-describedby'))
+
+
+def _tag_census(soup: BeautifulSoup) -> Counter:
+    """Egyetlen DOM bejárás: tag nevek és a _CENSUS_ATTRS attribútumok előfordulásai egy Counter-ben"""
+    census = Counter()
+    for el in soup.descendants:
+        if isinstance(el, Tag):
+            census[el.name] += 1
+            if el.attrs:
+                for attr, key in _CENSUS_ATTRS:
+                    if attr in el.attrs:
+                        census[key] += 1
+    return census
+
+
+def _has_child(tag: Tag, name: str) -> bool:
+    """Közvetlen gyermek keresése rekurzív .find() helyett (pl. caption, figcaption)"""
+    return any(getattr(child, 'name', None) == name for child in tag.children)
+
+
+def _is_quality_link(href: str) -> bool:
+    """Minőségi (akadémiai, kormányzati, lexikon) forrásra mutat-e a link"""
+    try:
+        host = urlparse(href).hostname
+    except ValueError:  # pl. hibás IPv6 literál
+        return False
+    return bool(host and _QUALITY_HOST_RE.search(host))
+
+
+def _analyze_page(page: Tuple[str, str]) -> Dict:
+    """Process pool worker - csak a nyers HTML és az URL lépi át a processz határt"""
+    html, url = page
+    try:
+        return AISpecificMetrics().analyze_ai_readiness(html, url)
+    except Exception as e:
+        return {"error": str(e)}
+
 
 class AISpecificMetrics:
     """TURBÓZOTT AI-specifikus metrikák elemzése GEO optimalizáláshoz"""
     
     def __init__(self):
-        # Fejlett kérdés pattern-ek - több nyelven és formátumban
-        self.question_patterns = [
-            # Magyar kérdőszavak
-            r'\b(mi(?:t|nek|ért|kor|lyen|nden)?|hol|hogy(?:an)?|miért|melyik|mennyi|ki(?:t|nek)?|mikor)\b',
-            # Angol kérdőszavak
-            r'\b(what|when|where|how|why|which|who|whom|whose|how\s+(?:to|do|does|can|much|many))\b',
-            # Kérdőjelek és pattern-ek
-            r'\?',
-            # Step-by-step jelzők
-            r'\b(lépés|step|phase|stage|először|first|második|second|harmadik|third)\b',
-            # Tutorial jelzők
-            r'\b(útmutató|tutorial|guide|how-to|hogyan)\b'
-        ]
-        
-        self.answer_indicators = [
-            'válasz', 'answer', 'megoldás', 'solution', 'eredmény', 'result',
-            'következő', 'next', 'végül', 'finally', 'összefoglalva', 'summary'
-        ]
-        
-        # AI-barát tartalom jelek
+        # Visszafelé kompatibilis aliasok a modul szintű konstansokra
+        self.question_patterns = QUESTION_PATTERNS
+        self.answer_indicators = ANSWER_INDICATORS
         self.ai_friendly_patterns = {
-            'step_by_step': [
-                r'\b\d+\.\s',  # 1. 2. 3.
-                r'\bstep\s+\d+',  # step 1, step 2
-                r'\b(első|második|harmadik|negyedik|ötödik)\s+(lépés|phase)',
-                r'\b(first|second|third|fourth|fifth)\s+(step|stage)',
-                r'(kezdésként|first|először|to\s+start)',
-                r'(végül|finally|last|utoljára)'
-            ],
-            'code_examples': [
-                r'<code[^>]*>.*?</code>',
-                r'```[\s\S]*?```',
-                r'<pre[^>]*>.*?</pre>',
-                r'\b(példa|example|code|kód):\s*\n',
-                r'function\s+\w+\s*\(',
-                r'def\s+\w+\s*\(',
-                r'class\s+\w+',
-                r'import\s+\w+'
-            ],
-            'interactive_elements': [
-                r'<button[^>]*>',
-                r'<input[^>]*>',
-                r'onclick\s*=',
-                r'addEventListener',
-                r'\b(kattints|click|select|choose|válassz)\b'
-            ]
+            'step_by_step': AI_FRIENDLY_STEP_BY_STEP,
+            'code_examples': AI_FRIENDLY_CODE_EXAMPLES,
+            'interactive_elements': AI_FRIENDLY_INTERACTIVE
         }
 
     def analyze_ai_readiness(self, html: str, url: str) -> Dict:
         """TURBÓZOTT AI-readiness elemzés - minden AI platform igényére optimalizálva"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = _make_soup(html)
         text_content = soup.get_text()
         
+        # JSON-LD scriptek egyszeri parse-olása - minden helper ezt használja
+        jsonld = self._parse_jsonld_scripts(soup)
+        # Tag és attribútum darabszámok egyetlen DOM bejárásból - a puszta számlálások ebből olvasnak
+        census = _tag_census(soup)
+        # A lépéses listák számát a formázás elemzés is felhasználja - a li szövegek csak egyszer készülnek
+        content_structure = self._analyze_enhanced_content_structure(soup, text_content, census)
+        step_lists = content_structure["lists"]["step_by_step_lists"]
+        
         return {
-            "content_structure": self._analyze_enhanced_content_structure(soup, text_content),
-            "qa_format": self._detect_enhanced_qa_format(soup, text_content),
-            "entity_markup": self._check_enhanced_entity_markup(soup),
-            "content_freshness": self._check_enhanced_content_freshness(soup, text_content),
-            "citation_readiness": self._check_enhanced_citations(soup, text_content),
-            "ai_friendly_formatting": self._check_enhanced_ai_formatting(soup, text_content),
-            "knowledge_depth": self._analyze_enhanced_knowledge_depth(text_content, soup),
+            "content_structure": content_structure,
+            "qa_format": self._detect_enhanced_qa_format(soup, text_content, jsonld, census),
+            "entity_markup": self._check_enhanced_entity_markup(soup, jsonld, census),
+            "content_freshness": self._check_enhanced_content_freshness(soup, text_content, jsonld),
+            "citation_readiness": self._check_enhanced_citations(soup, text_content, jsonld),
+            "ai_friendly_formatting": self._check_enhanced_ai_formatting(soup, text_content, census, step_lists),
+            "knowledge_depth": self._analyze_enhanced_knowledge_depth(text_content, soup, census),
             "conversational_elements": self._detect_enhanced_conversational_elements(text_content, soup)
         }
 
-    def _analyze_enhanced_content_structure(self, soup: BeautifulSoup, text: str) -> Dict:
+    def analyze_batch(self, pages: List[Tuple[str, str]], max_workers: Optional[int] = None) -> List[Dict]:
+        """Több oldal (html, url) AI-readiness elemzése párhuzamosan processz poolban - a sorrend a bemenetét követi"""
+        max_workers = max_workers or os.cpu_count() or 1
+        if len(pages) <= 1 or max_workers <= 1:
+            return [_analyze_page(page) for page in pages]
+        
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pages))) as executor:
+            return list(executor.map(_analyze_page, pages))
+
+    def _analyze_enhanced_content_structure(self, soup: BeautifulSoup, text: str,
+                                            census: Optional[Counter] = None) -> Dict:
         """TURBÓZOTT tartalom strukturáltság elemzése - AI platformok preferenciáira optimalizálva"""
+        census = census if census is not None else _tag_census(soup)
         
         # Alapvető struktúra elemzés
         ordered_lists = soup.find_all('ol')
-        unordered_lists = soup.find_all('ul') 
-        list_items = soup.find_all('li')
+        unordered_lists = census['ul']
+        list_items = census['li']
         
         # Fejlett lista elemzés
-        numbered_lists = len([ol for ol in ordered_lists if len(ol.find_all('li')) >= 3])
-        step_lists = len([ol for ol in ordered_lists if 
-                         any(re.search(r'\b(step|lépés)\b', li.get_text().lower()) for li in ol.find_all('li'))])
+        # Listaelem szövegek egyszeri kigyűjtése - a lista minőség pontozás is ezt használja
+        ordered_list_texts = [[li.get_text() for li in ol.find_all('li')] for ol in ordered_lists]
+        numbered_lists = sum(1 for items in ordered_list_texts if len(items) >= 3)
+        step_lists = sum(1 for items in ordered_list_texts if
+                         any(_STEP_WORD_RE.search(item) for item in items))
         
         # Táblázatok és adatstruktúrák
         tables = soup.find_all('table')
-        data_tables = len([t for t in tables if len(t.find_all('tr')) >= 3 and len(t.find_all('th')) > 0])
+        data_tables = sum(1 for t in tables if len(t.find_all('tr')) >= 3 and t.find('th') is not None)
         
         # Bekezdések minősége
         paragraphs = soup.find_all('p')
-        para_texts = [p.get_text().strip() for p in paragraphs if p.get_text().strip()]
+        para_texts = [para_text for p in paragraphs if (para_text := p.get_text().strip())]
         para_lengths = [len(text) for text in para_texts]
         
         # Optimális bekezdés hossz AI-hez (100-300 karakter)
-        optimal_paras = len([length for length in para_lengths if 100 <= length <= 300])
+        optimal_paras = sum(1 for length in para_lengths if 100 <= length <= 300)
         
-        # Címek és hierarchia
-        headings = {}
-        heading_texts = {}
-        for i in range(1, 7):
-            h_tags = soup.find_all(f'h{i}')
-            headings[f'h{i}'] = len(h_tags)
-            heading_texts[f'h{i}'] = [h.get_text().strip() for h in h_tags]
+        # Címek és hierarchia - egyetlen bejárás, szintenkénti számlálással
+        headings = dict.fromkeys(HEADING_TAGS, 0)
+        heading_texts = []
+        for h in soup.find_all(HEADING_TAGS):
+            headings[h.name] += 1
+            heading_texts.append(h.get_text().strip())
         
         # Heading SEO minőség
-        descriptive_headings = 0
-        for level, texts in heading_texts.items():
-            for text in texts:
-                if len(text) > 3 and any(char.isalpha() for char in text):
-                    descriptive_headings += 1
+        descriptive_headings = sum(1 for t in heading_texts if len(t) > 3 and _HAS_ALPHA_RE.search(t))
+        total_headings = len(heading_texts)
+        hierarchy_score = self._calculate_heading_hierarchy_score(headings)
         
         # Kód blokkok és példák (AI-k szeretik)
-        code_blocks = len(soup.find_all(['code', 'pre']))
-        inline_code = len(soup.find_all('code'))
+        code_elements = soup.find_all(['code', 'pre'])
+        code_blocks = len(code_elements)
+        inline_code = sum(1 for el in code_elements if el.name == 'code')
         
         # Interaktív elemek
-        interactive_elements = len(soup.find_all(['button', 'input', 'select', 'textarea']))
+        interactive_elements = census['button'] + census['input'] + census['select'] + census['textarea']
         
-        # Step-by-step tartalom detektálása
+        # Step-by-step tartalom detektálása - a teljes oldalszövegen (a text paramétert
+        # korábban a heading ciklus felülírta, így csak az utolsó címen futott)
         step_indicators = 0
-        for pattern in self.ai_friendly_patterns['step_by_step']:
-            step_indicators += len(re.findall(pattern, text, re.IGNORECASE))
+        for pattern in AI_FRIENDLY_STEP_BY_STEP_RE:
+            step_indicators += _count_matches(pattern, text)
         
         return {
             "lists": {
                 "ordered": len(ordered_lists),
-                "unordered": len(unordered_lists), 
-                "total_items": len(list_items),
+                "unordered": unordered_lists, 
+                "total_items": list_items,
                 "numbered_lists": numbered_lists,
                 "step_by_step_lists": step_lists,
-                "has_structured_lists": len(list_items) > 0,
-                "list_quality_score": self._calculate_list_quality(ordered_lists, unordered_lists, step_lists)
+                "has_structured_lists": list_items > 0,
+                "list_quality_score": self._calculate_list_quality(ordered_lists, unordered_lists, step_lists,
+                                                                   ordered_list_texts)
             },
             "tables": {
                 "count": len(tables),
                 "data_tables": data_tables,
-                "headers": len(soup.find_all('th')),
+                "headers": census['th'],
                 "structured_data": data_tables > 0,
                 "table_quality_score": min(100, data_tables * 25)
             },
@@ -153,10 +591,10 @@ class AISpecificMetrics:
             },
             "headings": {
                 **headings,
-                "total_headings": sum(headings.values()),
+                "total_headings": total_headings,
                 "descriptive_headings": descriptive_headings,
-                "hierarchy_score": self._calculate_heading_hierarchy_score(headings),
-                "quality_score": min(100, (descriptive_headings / max(1, sum(headings.values()))) * 100)
+                "hierarchy_score": hierarchy_score,
+                "quality_score": min(100, (descriptive_headings / max(1, total_headings)) * 100)
             },
             "code_and_examples": {
                 "code_blocks": code_blocks,
@@ -171,45 +609,34 @@ class AISpecificMetrics:
                 "interactivity_score": min(100, interactive_elements * 10 + (20 if step_indicators >= 3 else 0))
             },
             "structure_score": self._calculate_enhanced_structure_score(
-                len(ordered_lists), len(unordered_lists), len(list_items), 
-                data_tables, optimal_paras, len(para_texts), headings, 
+                len(ordered_lists), unordered_lists, list_items, 
+                data_tables, optimal_paras, len(para_texts), hierarchy_score,
                 descriptive_headings, code_blocks, step_indicators
             )
         }
 
-    def _detect_enhanced_qa_format(self, soup: BeautifulSoup, text: str) -> Dict:
+    def _detect_enhanced_qa_format(self, soup: BeautifulSoup, text: str,
+                                   jsonld: Optional[Tuple[List, List[str]]] = None,
+                                   census: Optional[Counter] = None) -> Dict:
         """TURBÓZOTT Q&A formátum detektálása - robusztus JSON parsing és modern pattern-ek"""
+        census = census if census is not None else _tag_census(soup)
         
         # FAQ schema detektálás - TURBÓZOTT verzió
-        faq_schemas = soup.find_all("script", type="application/ld+json")
+        jsonld_docs, broken_scripts = jsonld if jsonld is not None else self._parse_jsonld_scripts(soup)
         has_faq_schema = False
         faq_count = 0
         qa_schemas = []
         
-        for script in faq_schemas:
+        # Fallback: hibás JSON-ból próbáljunk meg részleges információt kinyerni
+        for script_content in broken_scripts:
+            faq_match = _FAQ_PAGE_TYPE_RE.search(script_content)
+            if faq_match:
+                has_faq_schema = True
+                # Próbáljuk meg a mainEntity-k számát megbecsülni
+                faq_count = max(faq_count, _count_matches(_QUESTION_TYPE_RE, script_content))
+        
+        for data in jsonld_docs:
             try:
-                script_content = script.string
-                if not script_content:
-                    continue
-                    
-                # Tisztítás és normalizálás
-                script_content = script_content.strip()
-                # Gyakori problémák javítása
-                script_content = re.sub(r',\s*}', '}', script_content)  # trailing commas
-                script_content = re.sub(r',\s*]', ']', script_content)  # trailing commas in arrays
-                
-                try:
-                    data = json.loads(script_content)
-                except json.JSONDecodeError:
-                    # Fallback: próbáljunk meg részleges JSON-t kinyerni
-                    faq_match = re.search(r'"@type"\s*:\s*"FAQPage"', script_content)
-                    if faq_match:
-                        has_faq_schema = True
-                        # Próbáljuk meg a mainEntity-k számát megbecsülni
-                        entity_matches = re.findall(r'"@type"\s*:\s*"Question"', script_content)
-                        faq_count = max(faq_count, len(entity_matches))
-                    continue
-                
                 # Rekurzív keresés minden schema típusra
                 found_schemas = self._find_qa_schemas_recursive(data)
                 qa_schemas.extend(found_schemas)
@@ -227,41 +654,37 @@ class AISpecificMetrics:
         questions_found = 0
         question_types = {'direct': 0, 'indirect': 0, 'numbered': 0}
         
-        for pattern in self.question_patterns:
-            matches = re.findall(pattern, text.lower())
-            questions_found += len(matches)
+        for pattern, question_type in QUESTION_RE:
+            matches = _count_matches(pattern, text)
+            questions_found += matches
             
             # Kérdés típusok azonosítása
-            if any(word in pattern for word in ['mi', 'what', 'how']):
-                question_types['direct'] += len(matches)
-            elif any(word in pattern for word in ['step', 'lépés']):
-                question_types['numbered'] += len(matches)
-            else:
-                question_types['indirect'] += len(matches)
+            question_types[question_type] += matches
         
         # HTML FAQ elemek - TURBÓZOTT verzió
-        faq_elements = len(soup.find_all(['details', 'summary']))
-        faq_classes = len(soup.find_all(class_=re.compile(r'faq|question|answer|qa|qanda', re.I)))
-        accordion_elements = len(soup.find_all(class_=re.compile(r'accordion|collapse|toggle', re.I)))
+        faq_elements = census['details'] + census['summary']
+        faq_classes = len(soup.select(_FAQ_CLASS_SELECTOR))
+        accordion_elements = len(soup.select(_ACCORDION_CLASS_SELECTOR))
         
         # Válasz indikátorok és párosítás
         answer_indicators = 0
         qa_pairs = 0
         
-        for indicator in self.answer_indicators:
-            count = text.lower().count(indicator)
+        text_lower = text.lower()
+        for indicator in ANSWER_INDICATORS:
+            count = text_lower.count(indicator)
             answer_indicators += count
             
         # Q&A párok becslése
         qa_pairs = min(questions_found, answer_indicators)
         
         # Modern Q&A formátumok
-        structured_qa = self._detect_structured_qa_patterns(soup, text)
+        structured_qa = self._detect_structured_qa_patterns(soup, text, census)
         
         # AI-barát Q&A jellemzők
         ai_qa_features = {
             'has_numbered_questions': question_types['numbered'] > 0,
-            'has_step_by_step': any(re.search(pattern, text, re.I) for pattern in self.ai_friendly_patterns['step_by_step']),
+            'has_step_by_step': any(pattern.search(text) for pattern in AI_FRIENDLY_STEP_BY_STEP_RE),
             'has_clear_answers': answer_indicators >= questions_found * 0.5,
             'has_html_structure': faq_elements > 0 or accordion_elements > 0
         }
@@ -286,8 +709,11 @@ class AISpecificMetrics:
             "qa_score": qa_score
         }
 
-    def _check_enhanced_entity_markup(self, soup: BeautifulSoup) -> Dict:
+    def _check_enhanced_entity_markup(self, soup: BeautifulSoup,
+                                      jsonld: Optional[Tuple[List, List[str]]] = None,
+                                      census: Optional[Counter] = None) -> Dict:
         """TURBÓZOTT entitás markup ellenőrzése - több schema típus és jobb detektálás"""
+        census = census if census is not None else _tag_census(soup)
         
         # Kibővített Schema.org entitások
         entity_types = {
@@ -303,26 +729,16 @@ class AISpecificMetrics:
         
         schema_entities = {}
         for category, types in entity_types.items():
-            count = 0
-            for schema_type in types:
-                count += len(soup.find_all(attrs={"itemtype": re.compile(rf"schema\.org/{schema_type}", re.I)}))
-            schema_entities[category] = count
+            selector = _attr_contains_selector('itemtype', [f"schema.org/{schema_type}" for schema_type in types])
+            schema_entities[category] = len(soup.select(selector))
         
         # JSON-LD entitások - TURBÓZOTT parsing
         jsonld_entities = []
         jsonld_entity_details = {}
         
-        scripts = soup.find_all("script", type="application/ld+json")
-        for script in scripts:
+        jsonld_docs = (jsonld if jsonld is not None else self._parse_jsonld_scripts(soup))[0]
+        for data in jsonld_docs:
             try:
-                script_content = script.string
-                if not script_content:
-                    continue
-                    
-                # Tisztítás
-                script_content = script_content.strip()
-                data = json.loads(script_content)
-                
                 entities = self._extract_entities_recursive(data)
                 jsonld_entities.extend(entities)
                 
@@ -332,12 +748,11 @@ class AISpecificMetrics:
                         jsonld_entity_details[entity] = 0
                     jsonld_entity_details[entity] += 1
                     
-            except (json.JSONDecodeError, AttributeError, TypeError):
+            except (AttributeError, TypeError):
                 continue
         
         # Microdata és RDFa
-        microdata_items = len(soup.find_all(attrs={"itemscope": True}))
-        rdfa_items = len(soup.find_all(attrs={"typeof": True}))
+        microdata_items, rdfa_items = census['@itemscope'], census['@typeof']
         
         # Szemantikai gazdagság értékelése
         semantic_richness = self._calculate_semantic_richness(
@@ -361,67 +776,28 @@ class AISpecificMetrics:
                                semantic_richness * 0.3 + ai_entity_value * 0.2)
         }
 
-    def _check_enhanced_content_freshness(self, soup: BeautifulSoup, text: str) -> Dict:
+    def _check_enhanced_content_freshness(self, soup: BeautifulSoup, text: str,
+                                          jsonld: Optional[Tuple[List, List[str]]] = None) -> Dict:
         """TURBÓZOTT tartalom frissesség ellenőrzése"""
         
-        # Kibővített dátum meta tagek
-        date_meta_selectors = [
-            'meta[property^="article:"]',
-            'meta[name*="date"]',
-            'meta[name*="published"]', 
-            'meta[name*="modified"]',
-            'meta[name*="updated"]',
-            'meta[property="og:updated_time"]',
-            'meta[name="last-modified"]',
-            'meta[name="revised"]'
-        ]
-        
-        date_metas = []
-        for selector in date_meta_selectors:
-            date_metas.extend(soup.select(selector))
-        
-        # Fejlett dátum pattern keresés
-        date_patterns = [
-            # ISO formátumok
-            (r'\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2})?(?:Z|[+-]\d{2}:\d{2})?', 'iso'),
-            # Amerikai formátum
-            (r'\d{1,2}/\d{1,2}/\d{4}', 'us'),
-            # Európai formátum
-            (r'\d{1,2}\.\d{1,2}\.\d{4}', 'eu'),
-            # Magyar formátum
-            (r'\d{4}\.\s*(?:január|február|március|április|május|június|július|augusztus|szeptember|október|november|december)\s*\d{1,2}', 'hu'),
-            # Angol hónapok
-            (r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}', 'en'),
-            # Relatív dátumok
-            (r'\b(?:today|yesterday|törtenap|ma|tegnap|\d+\s+(?:days?|napja?|weeks?|hete?|months?|hónapja?)\s+ago)\b', 'relative')
-        ]
+        # Kibővített dátum meta tagek - egyetlen selector union, egy DOM bejárás
+        date_metas = soup.select(_DATE_META_SELECTOR)
         
-        date_mentions = {}
-        total_date_mentions = 0
-        
-        for pattern, date_type in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            date_mentions[date_type] = len(matches)
-            total_date_mentions += len(matches)
+        # Fejlett dátum pattern keresés - egy bejárás, típusonként névvel ellátott csoportokkal
+        date_mentions = dict.fromkeys(_DATE_TYPES, 0)
+        for match in _DATE_RE.finditer(text):
+            date_mentions[match.lastgroup] += 1
+        total_date_mentions = sum(date_mentions.values())
         
         # Frissítési indikátorok keresése
-        freshness_indicators = [
-            r'\b(?:friss(?:ítve|ített)|updated?|last\s+(?:modified|updated)|utolj(?:ára\s+)?(?:módosítva|frissítve))\b',
-            r'\b(?:új|new|latest|legújabb|aktuális|current)\b',
-            r'\b(?:nemrég|recently|lately|not\s+long\s+ago)\b',
-            r'\b\d{4}(?:\.|-)(?:0[1-9]|1[0-2])(?:\.|-)(?:0[1-9]|[12]\d|3[01])\b'  # timestamp pattern
-        ]
-        
-        freshness_signals = 0
-        for pattern in freshness_indicators:
-            freshness_signals += len(re.findall(pattern, text, re.IGNORECASE))
+        freshness_signals = _count_matches(_FRESHNESS_RE, text)
         
         # JSON-LD dátum mezők
-        jsonld_dates = self._extract_jsonld_dates(soup)
+        jsonld_dates = self._extract_jsonld_dates(soup, jsonld)
         
         # Time elemek HTML5-ben
         time_elements = soup.find_all('time')
-        datetime_attrs = len([t for t in time_elements if t.get('datetime')])
+        datetime_attrs = sum(1 for t in time_elements if t.get('datetime'))
         
         # Schema.org publishedDate, modifiedDate
         schema_date_fields = self._check_schema_date_fields(soup)
@@ -441,7 +817,8 @@ class AISpecificMetrics:
                                  datetime_attrs * 10 + len(schema_date_fields) * 8)
         }
 
-    def _check_enhanced_citations(self, soup: BeautifulSoup, text: str) -> Dict:
+    def _check_enhanced_citations(self, soup: BeautifulSoup, text: str,
+                                  jsonld: Optional[Tuple[List, List[str]]] = None) -> Dict:
         """TURBÓZOTT hivatkozások és idézetek ellenőrzése"""
         
         # Külső linkek részletes elemzése
@@ -458,11 +835,8 @@ class AISpecificMetrics:
         
         # Hivatkozás minőség elemzése
         quality_external_links = [
-            link for link in external_links 
-            if any(domain in link.get('href', '') for domain in [
-                'wikipedia.org', 'gov', 'edu', 'academic', 'research',
-                'pubmed', 'scholar.google', 'researchgate', 'arxiv'
-            ])
+            link for link in external_links
+            if _is_quality_link(link['href'])
         ]
         
         # Idézetek és hivatkozások
@@ -473,32 +847,20 @@ class AISpecificMetrics:
         ]
         
         # Footnotes és referenciák
-        footnotes = soup.find_all(class_=re.compile(r'footnote|reference|citation|biblio', re.I))
+        footnotes = soup.select(_FOOTNOTE_CLASS_SELECTOR)
         
         # Numerikus hivatkozások [1], [2] stb.
-        numeric_refs = re.findall(r'\[\d+\]', text)
+        numeric_refs = _count_matches(_NUMERIC_REF_RE, text)
         
         # DOI és arXiv linkek
-        doi_pattern = r'(?:doi:|DOI:)\s*10\.\d{4,}\/[^\s]+'
-        arxiv_pattern = r'arXiv:\d{4}\.\d{4,5}'
-        
-        doi_links = re.findall(doi_pattern, text)
-        arxiv_links = re.findall(arxiv_pattern, text)
+        doi_links = _count_matches(_DOI_RE, text)
+        arxiv_links = _count_matches(_ARXIV_RE, text)
         
         # Schema.org citation markup
-        citation_schema = self._check_citation_schema(soup)
+        citation_schema = self._check_citation_schema(soup, jsonld)
         
         # Forrás minőség indikátorok
-        source_quality_indicators = [
-            r'\b(?:forrás|source|references?|bibliography|irodalom)\s*:',
-            r'\b(?:according\s+to|szerint|alapján|hivatkozva)\b',
-            r'\b(?:study|research|kutatás|tanulmány|vizsgálat)\b',
-            r'\b(?:egyetem|university|akadémia|academy|institute)\b'
-        ]
-        
-        source_quality_score = 0
-        for pattern in source_quality_indicators:
-            source_quality_score += len(re.findall(pattern, text, re.IGNORECASE))
+        source_quality_score = _count_matches(_SOURCE_QUALITY_RE, text)
         
         return {
             "external_links": len(external_links),
@@ -507,55 +869,57 @@ class AISpecificMetrics:
             "citations": len(citations),
             "quality_citations": len(quality_citations),
             "footnotes": len(footnotes),
-            "numeric_references": len(numeric_refs),
-            "doi_links": len(doi_links),
-            "arxiv_links": len(arxiv_links),
+            "numeric_references": numeric_refs,
+            "doi_links": doi_links,
+            "arxiv_links": arxiv_links,
             "has_citation_schema": len(citation_schema) > 0,
             "citation_schema_types": citation_schema,
             "source_quality_indicators": source_quality_score,
             "citation_score": min(100, len(external_links) * 2 + len(quality_external_links) * 8 + 
                                  len(quality_citations) * 12 + len(footnotes) * 8 + 
-                                 len(numeric_refs) * 5 + (len(doi_links) + len(arxiv_links)) * 15 + 
+                                 numeric_refs * 5 + (doi_links + arxiv_links) * 15 + 
                                  len(citation_schema) * 20 + source_quality_score * 3)
         }
 
-    def _check_enhanced_ai_formatting(self, soup: BeautifulSoup, text: str) -> Dict:
+    def _check_enhanced_ai_formatting(self, soup: BeautifulSoup, text: str,
+                                      census: Optional[Counter] = None,
+                                      step_lists: Optional[int] = None) -> Dict:
         """TURBÓZOTT AI-barát formázás ellenőrzése"""
+        census = census if census is not None else _tag_census(soup)
         
         # Táblázatok minőségi elemzése
         tables = soup.find_all('table')
-        tables_with_captions = len([t for t in tables if t.find('caption')])
-        tables_with_headers = len([t for t in tables if t.find('thead') or t.find('th')])
-        data_rich_tables = len([t for t in tables if len(t.find_all('tr')) >= 3])
+        tables_with_captions = sum(1 for t in tables if _has_child(t, 'caption'))
+        tables_with_headers = sum(1 for t in tables if t.find(['thead', 'th']) is not None)
+        data_rich_tables = sum(1 for t in tables if len(t.find_all('tr', limit=3)) >= 3)
         
         # Képek és média elemzése
         images = soup.find_all('img')
-        images_with_alt = len([img for img in images if img.get('alt') and len(img.get('alt').strip()) > 3])
-        images_with_title = len([img for img in images if img.get('title')])
-        figures_with_captions = len(soup.find_all('figure', lambda fig: fig.find('figcaption')))
+        images_with_alt = sum(1 for img in images if img.get('alt') and len(img.get('alt').strip()) > 3)
+        images_with_title = sum(1 for img in images if img.get('title'))
+        figures_with_captions = sum(1 for fig in soup.find_all('figure') if _has_child(fig, 'figcaption'))
         
         # Listák minőségi elemzése
         lists = soup.find_all(['ul', 'ol'])
-        lists_with_labels = len([lst for lst in lists if lst.get('aria-label') or lst.get('title')])
-        nested_lists = len([lst for lst in lists if lst.find(['ul', 'ol'])])
+        lists_with_labels = sum(1 for lst in lists if lst.get('aria-label') or lst.get('title'))
+        nested_lists = sum(1 for lst in lists if lst.find(['ul', 'ol']) is not None)
         
         # Navigáció és struktúra
-        nav_elements = len(soup.find_all(['nav', '[role="navigation"]']))
-        breadcrumbs = len(soup.find_all(class_=re.compile(r'breadcrumb', re.I)))
-        landmarks = len(soup.find_all(attrs={'role': re.compile(r'main|banner|navigation|complementary|contentinfo')}))
+        nav_elements = len(soup.select(_NAV_SELECTOR))
+        breadcrumbs = len(soup.select(_BREADCRUMB_CLASS_SELECTOR))
+        landmarks = len(soup.select(_LANDMARK_ROLE_SELECTOR))
         
         # ARIA és accessibility
-        aria_labels = len(soup.find_all(attrs={'aria-label': True}))
-        aria_describedby = len(soup.find_all(attrs={'aria-describedby': True}))
+        aria_labels, aria_describedby = census['@aria-label'], census['@aria-describedby']
         
         # Szemantikus HTML5 elemek
-        semantic_elements = len(soup.find_all(['article', 'section', 'header', 'footer', 'aside', 'main']))
+        semantic_elements = sum(census[name] for name in SEMANTIC_TAGS)
         
         # Kód formázás AI-hez
         code_quality = self._analyze_code_formatting(soup)
         
         # Step-by-step formázás
-        step_formatting = self._analyze_step_formatting(soup, text)
+        step_formatting = self._analyze_step_formatting(soup, text, step_lists)
         
         return {
             "tables": {
@@ -599,77 +963,51 @@ class AISpecificMetrics:
             )
         }
 
-    def _analyze_enhanced_knowledge_depth(self, text: str, soup: BeautifulSoup) -> Dict:
+    def _analyze_enhanced_knowledge_depth(self, text: str, soup: BeautifulSoup,
+                                          census: Optional[Counter] = None) -> Dict:
         """TURBÓZOTT tudás mélység elemzése"""
+        census = census if census is not None else _tag_census(soup)
         
         # Alapvető metrikák
         words = text.split()
         word_count = len(words)
-        sentences = re.split(r'[.!?]+', text)
-        sentence_count = len([s for s in sentences if s.strip()])
+        sentence_count = _count_matches(_SENTENCE_RE, text)
         avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
         
-        # Szókincs gazdagság és komplexitás
-        unique_words = set(word.lower().strip('.,!?;:"()[]{}') for word in words if word.isalpha())
+        # Szókincs gazdagság, hosszú és komplex szavak - egyetlen bejárás a szavakon
+        unique_words = set()
+        long_words = 0
+        complex_words = 0
+        for word in words:
+            length = len(word)
+            if length > 6:
+                long_words += 1
+                if length > 8:
+                    complex_words += 1
+            if word.isalpha():  # csak betűk, így nincs mit strip-elni
+                unique_words.add(word.lower())
         vocabulary_richness = len(unique_words) / word_count if word_count > 0 else 0
         
-        # Hosszú és komplex szavak
-        long_words = [word for word in words if len(word) > 6]
-        complex_words = [word for word in words if len(word) > 8]
-        
         # Szakmai és technikai kifejezések
-        technical_patterns = [
-            r'\b[A-Z]{2,}\b',  # Acronyms
-            r'\b\w+(?:ás|és|ség|ság|tat|tel|kor|ban|ben)\b',  # Magyar szakmai képzők
-            r'\b(?:algorithm|protocol|framework|methodology|implementation|optimization)\b',  # Angol technikai
-            r'\b\w+(?:ing|tion|sion|ment|ness|ity|acy|ism)\b'  # Angol szakmai képzők
-        ]
-        
-        technical_terms = 0
-        for pattern in technical_patterns:
-            technical_terms += len(re.findall(pattern, text))
+        technical_terms = _count_matches(_TECHNICAL_RE, text)
         
         # Számok, statisztikák, mértékegységek
-        numbers = re.findall(r'\b\d+(?:[.,]\d+)?(?:%|kg|g|m|cm|mm|km|l|ml|€|$|Ft|°C|°F)?\b', text)
-        percentages = re.findall(r'\b\d+(?:[.,]\d+)?%\b', text)
-        ranges = re.findall(r'\b\d+(?:[.,]\d+)?\s*[-–—]\s*\d+(?:[.,]\d+)?\b', text)
+        numbers = _count_matches(_NUMBER_RE, text)
+        percentages = _count_matches(_PERCENTAGE_RE, text)
+        ranges = _count_matches(_RANGE_RE, text)
         
         # Definíciók és magyarázatok
-        definition_patterns = [
-            r'\b(?:például|azaz|vagyis|jelentése|definíció|that\s+is|i\.e\.|e\.g\.|namely|specifically)\b',
-            r'\b\w+\s+(?:azt\s+jelenti|means|refers\s+to|is\s+defined\s+as)\b',
-            r':\s*[A-Z]',  # Definíció pattern
-        ]
-        
-        definitions = 0
-        for pattern in definition_patterns:
-            definitions += len(re.findall(pattern, text, re.IGNORECASE))
+        definitions = _count_matches(_DEFINITION_RE, text)
         
         # Példák és esettanulmányok
-        example_patterns = [
-            r'\b(?:például|for\s+example|for\s+instance|such\s+as|like)\b',
-            r'\b(?:case\s+study|esettanulmány|example|példa)\b',
-            r'\b(?:consider|képzelje\s+el|imagine|suppose)\b'
-        ]
-        
-        examples = 0
-        for pattern in example_patterns:
-            examples += len(re.findall(pattern, text, re.IGNORECASE))
+        examples = _count_matches(_EXAMPLE_RE, text)
         
         # Adatok és hivatkozások mélysége
-        data_depth_indicators = [
-            r'\b(?:research|kutatás|study|tanulmány|survey|felmérés|analysis|elemzés)\b',
-            r'\b(?:data|adat|statistics|statisztika|findings|eredmények)\b',
-            r'\b(?:according\s+to|szerint|based\s+on|alapján)\b'
-        ]
-        
-        data_depth = 0
-        for pattern in data_depth_indicators:
-            data_depth += len(re.findall(pattern, text, re.IGNORECASE))
+        data_depth = _count_matches(_DATA_DEPTH_RE, text)
         
         # Tartalmi struktúra mélysége (HTML alapján)
-        content_sections = len(soup.find_all(['section', 'article', 'div'], class_=re.compile(r'content|article|section', re.I)))
-        subheadings = len(soup.find_all(['h2', 'h3', 'h4', 'h5', 'h6']))
+        content_sections = len(soup.select(_CONTENT_SECTION_SELECTOR))
+        subheadings = sum(census[name] for name in HEADING_TAGS[1:])
         
         return {
             "word_metrics": {
@@ -677,14 +1015,14 @@ class AISpecificMetrics:
                 "sentence_count": sentence_count,
                 "avg_sentence_length": round(avg_sentence_length, 1),
                 "vocabulary_richness": round(vocabulary_richness, 3),
-                "long_words": len(long_words),
-                "complex_words": len(complex_words)
+                "long_words": long_words,
+                "complex_words": complex_words
             },
             "technical_depth": {
                 "technical_terms": technical_terms,
-                "numbers_statistics": len(numbers),
-                "percentages": len(percentages),
-                "ranges": len(ranges),
+                "numbers_statistics": numbers,
+                "percentages": percentages,
+                "ranges": ranges,
                 "technical_density": round(technical_terms / word_count * 1000, 1) if word_count > 0 else 0
             },
             "explanatory_content": {
@@ -699,7 +1037,7 @@ class AISpecificMetrics:
                 "structural_depth": subheadings / max(1, content_sections)
             },
             "depth_score": min(100, (word_count / 50) + (technical_terms * 2) + 
-                             (len(numbers) * 3) + (definitions * 8) + 
+                             (numbers * 3) + (definitions * 8) + 
                              (examples * 6) + (data_depth * 4) + 
                              (vocabulary_richness * 50) + (subheadings * 2))
         }
@@ -708,74 +1046,36 @@ class AISpecificMetrics:
         """TURBÓZOTT beszélgetős elemek detektálása"""
         
         # Közvetlen megszólítás - fejlettebb pattern-ek
-        direct_address_patterns = [
-            r'\b(?:ön|te|maga|önt|téged|you|your)\b',
-            r'\b(?:kedves\s+(?:olvasó|látogató)|dear\s+(?:reader|visitor))\b',
-            r'\b(?:ha\s+(?:ön|te|you)|if\s+you)\b'
-        ]
-        
-        direct_address = 0
-        for pattern in direct_address_patterns:
-            direct_address += len(re.findall(pattern, text.lower()))
+        direct_address = _count_matches(_DIRECT_ADDRESS_RE, text)
         
         # Kérdések és felkiáltások
         questions = text.count('?')
         exclamations = text.count('!')
         
         # Retorikai kérdések
-        rhetorical_questions = len(re.findall(r'\b(?:vajon|ugye|nem\s+igaz|isn\'t\s+it|right|don\'t\s+you\s+think)\b.*?\?', text, re.IGNORECASE))
+        rhetorical_questions = _count_matches(_RHETORICAL_RE, text)
         
         # Beszélgetős kifejezések
-        conversational_patterns = [
-            r'\b(?:tudod|látod|érted|gondold|képzeld|nézd|figyelj)\b',
-            r'\b(?:you\s+know|you\s+see|you\s+understand|look|listen|imagine)\b',
-            r'\b(?:egyszerűen|simply|just|merely|csak|csupán)\b',
-            r'\b(?:természetesen|obviously|of\s+course|clearly|nyilvánvalóan)\b'
-        ]
-        
-        conversational_phrases = 0
-        for pattern in conversational_patterns:
-            conversational_phrases += len(re.findall(pattern, text.lower()))
+        conversational_phrases = _count_matches(_CONVERSATIONAL_RE, text)
         
         # Informális nyelvi elemek
-        informal_elements = [
-            r'\b(?:na|well|so|szóval|tehát|persze|sure|yeah|okay|oké)\b',
-            r'\b(?:amúgy|egyébként|by\s+the\s+way|btw|incidentally)\b',
-            r'\.{3}|\.\.\.',  # Three dots
-            r'!\s*!\s*!',     # Multiple exclamations
-        ]
-        
-        informal_count = 0
-        for pattern in informal_elements:
-            informal_count += len(re.findall(pattern, text.lower()))
+        # (a szavas és írásjeles találatok nem fedhetik egymást, így külön számolva is összeadhatók)
+        informal_count = _count_matches(_INFORMAL_RE, text) + text.count('...')
+        if exclamations >= 3:
+            informal_count += _count_matches(_MULTI_EXCLAMATION_RE, text)
         
         # Empátia és kapcsolódás
-        empathy_patterns = [
-            r'\b(?:értem|understand|tudom|know|érzem|feel)\b.*\b(?:hogy|that|mit|what)\b',
-            r'\b(?:természetes|natural|normális|normal|érthető|understandable)\b',
-            r'\b(?:segíteni|help|támogatni|support|könnyíteni|make\s+easier)\b'
-        ]
-        
-        empathy_expressions = 0
-        for pattern in empathy_patterns:
-            empathy_expressions += len(re.findall(pattern, text.lower()))
+        empathy_expressions = (_count_matches(_EMPATHY_SENTENCE_RE, text) +
+                               _count_matches(_EMPATHY_RE, text))
         
         # Interaktív elemek
-        interactive_words = len(re.findall(r'\b(?:kattints|click|válassz|choose|próbáld|try|teszteld|test)\b', text.lower()))
+        interactive_words = _count_keywords(_INTERACTIVE_WORDS, text)
         
         # CTA (Call to Action) elemek
-        cta_patterns = [
-            r'\b(?:kattints|click|regisztrálj|sign\s+up|iratkozz\s+fel|subscribe)\b',
-            r'\b(?:töltsd\s+le|download|vásárolj|buy|rendelj|order)\b',
-            r'\b(?:kezdd\s+el|start|próbáld\s+ki|try\s+it|tanuld\s+meg|learn)\b'
-        ]
-        
-        cta_elements = 0
-        for pattern in cta_patterns:
-            cta_elements += len(re.findall(pattern, text.lower()))
+        cta_elements = _count_matches(_CTA_RE, text)
         
         # Personal pronouns és birtokos névmások
-        personal_pronouns = len(re.findall(r'\b(?:én|te|ő|mi|ti|ők|i|you|he|she|we|they|my|your|his|her|our|their)\b', text.lower()))
+        personal_pronouns = _count_keywords(_PERSONAL_PRONOUNS, text)
         
         return {
             "direct_address": direct_address,
@@ -798,9 +1098,10 @@ class AISpecificMetrics:
 
     # HELPER METHODS - Számítási és segédfüggvények
     
-    def _calculate_list_quality(self, ordered_lists, unordered_lists, step_lists) -> int:
+    def _calculate_list_quality(self, ordered_lists, unordered_lists: int, step_lists,
+                                ordered_list_texts: Optional[List[List[str]]] = None) -> int:
         """Lista minőség számítása"""
-        total_lists = len(ordered_lists) + len(unordered_lists)
+        total_lists = len(ordered_lists) + unordered_lists
         if total_lists == 0:
             return 0
         
@@ -808,15 +1109,16 @@ class AISpecificMetrics:
         
         # Ordered lists are better for AI
         quality_score += len(ordered_lists) * 15
-        quality_score += len(unordered_lists) * 10
+        quality_score += unordered_lists * 10
         quality_score += step_lists * 25  # Step-by-step lists are excellent
         
         # List item depth check
-        for ol in ordered_lists:
-            items = ol.find_all('li')
+        if ordered_list_texts is None:
+            ordered_list_texts = [[li.get_text() for li in ol.find_all('li')] for ol in ordered_lists]
+        for items in ordered_list_texts:
             if len(items) >= 3:  # Good length
                 quality_score += 10
-            if any(len(item.get_text().strip()) > 20 for item in items):  # Descriptive items
+            if any(len(item.strip()) > 20 for item in items):  # Descriptive items
                 quality_score += 5
         
         return min(100, quality_score)
@@ -848,7 +1150,7 @@ class AISpecificMetrics:
 
     def _calculate_enhanced_structure_score(self, ordered_lists: int, unordered_lists: int, 
                                           list_items: int, data_tables: int, optimal_paras: int,
-                                          total_paras: int, headings: Dict, descriptive_headings: int,
+                                          total_paras: int, heading_score: int, descriptive_headings: int,
                                           code_blocks: int, step_indicators: int) -> int:
         """Enhanced struktúra pontszám számítása"""
         score = 0
@@ -866,8 +1168,7 @@ class AISpecificMetrics:
             para_quality = (optimal_paras / total_paras) * 20
             score += para_quality
         
-        # Headings (max 20 points)
-        heading_score = self._calculate_heading_hierarchy_score(headings)
+        # Headings (max 20 points) - a hívó által már kiszámolt hierarchia pontszám
         score += (heading_score / 100) * 20
         
         # Code blocks (max 10 points) - AI-k szeretik a kódpéldákat
@@ -879,35 +1180,56 @@ class AISpecificMetrics:
         
         return min(100, score)
 
-    def _find_qa_schemas_recursive(self, data, schemas=None) -> List[Dict]:
-        """Rekurzív schema keresés Q&A típusokra"""
-        if schemas is None:
-            schemas = []
-        
-        if isinstance(data, dict):
-            schema_type = data.get("@type")
-            if schema_type == "FAQPage":
-                main_entity = data.get("mainEntity", [])
-                schemas.append({
-                    "type": "FAQPage",
-                    "count": len(main_entity) if isinstance(main_entity, list) else 1
-                })
-            elif schema_type == "QAPage":
-                schemas.append({"type": "QAPage", "count": 1})
-            elif schema_type in ["Question", "Answer"]:
-                schemas.append({"type": schema_type, "count": 1})
+    def _parse_jsonld_scripts(self, soup: BeautifulSoup) -> Tuple[List, List[str]]:
+        """JSON-LD scriptek egyszeri parse-olása - (parse-olt dokumentumok, hibás nyers tartalmak)"""
+        jsonld_docs = []
+        broken_scripts = []
+        
+        for script in soup.find_all("script", type="application/ld+json"):
+            script_content = script.string
+            if not script_content:
+                continue
             
-            # Rekurzív keresés
-            for value in data.values():
-                self._find_qa_schemas_recursive(value, schemas)
+            # Tisztítás és normalizálás
+            script_content = script_content.strip()
+            # Gyakori problémák javítása
+            script_content = _TRAILING_COMMA_OBJ_RE.sub('}', script_content)  # trailing commas
+            script_content = _TRAILING_COMMA_ARR_RE.sub(']', script_content)  # trailing commas in arrays
+            
+            try:
+                jsonld_docs.append(_json_loads(script_content))
+            except json.JSONDecodeError:
+                broken_scripts.append(script_content)
+        
+        return jsonld_docs, broken_scripts
+
+    def _find_qa_schemas_recursive(self, data) -> List[Dict]:
+        """Schema keresés Q&A típusokra - iteratív mélységi bejárás (dokumentum sorrendben)"""
+        schemas = []
+        stack = deque([data])
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                schema_type = node.get("@type")
+                if schema_type == "FAQPage":
+                    main_entity = node.get("mainEntity", [])
+                    schemas.append({
+                        "type": "FAQPage",
+                        "count": len(main_entity) if isinstance(main_entity, list) else 1
+                    })
+                elif schema_type == "QAPage":
+                    schemas.append({"type": "QAPage", "count": 1})
+                elif isinstance(schema_type, str) and schema_type in _QA_TYPES:  # listás @type nem hash-elhető
+                    schemas.append({"type": schema_type, "count": 1})
                 
-        elif isinstance(data, list):
-            for item in data:
-                self._find_qa_schemas_recursive(item, schemas)
+                stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
         
         return schemas
 
-    def _detect_structured_qa_patterns(self, soup: BeautifulSoup, text: str) -> Dict:
+    def _detect_structured_qa_patterns(self, soup: BeautifulSoup, text: str,
+                                       census: Optional[Counter] = None) -> Dict:
         """Strukturált Q&A minták detektálása"""
         patterns = {
             "numbered_qa": 0,
@@ -917,19 +1239,18 @@ class AISpecificMetrics:
         }
         
         # Numbered Q&A
-        numbered_qa = re.findall(r'\d+\.\s*(?:mi|what|how|ki|who|hol|where|mikor|when|miért|why)', text, re.IGNORECASE)
-        patterns["numbered_qa"] = len(numbered_qa)
+        numbered_qa = _count_matches(_NUMBERED_QA_RE, text)
+        patterns["numbered_qa"] = numbered_qa
         
         # Bulleted Q&A
-        bulleted_qa = re.findall(r'[•▪▫◦]\s*(?:mi|what|how|ki|who|hol|where|mikor|when|miért|why)', text, re.IGNORECASE)
-        patterns["bulleted_qa"] = len(bulleted_qa)
+        bulleted_qa = _count_matches(_BULLETED_QA_RE, text)
+        patterns["bulleted_qa"] = bulleted_qa
         
         # Accordion/collapsible elements
-        patterns["accordion_qa"] = len(soup.find_all(class_=re.compile(r'accordion|collapse|toggle|expand', re.I)))
+        patterns["accordion_qa"] = len(soup.select(_ACCORDION_QA_CLASS_SELECTOR))
         
         # Definition lists (dl, dt, dd)
-        definition_lists = soup.find_all('dl')
-        patterns["definition_lists"] = len(definition_lists)
+        patterns["definition_lists"] = census['dl'] if census is not None else len(soup.find_all('dl'))
         
         return patterns
 
@@ -959,25 +1280,23 @@ class AISpecificMetrics:
         
         return min(100, score)
 
-    def _extract_entities_recursive(self, data, entities=None) -> List[str]:
-        """Rekurzív entitás kinyerés JSON-LD-ből"""
-        if entities is None:
-            entities = []
-        
-        if isinstance(data, dict):
-            schema_type = data.get("@type")
-            if schema_type:
-                if isinstance(schema_type, list):
-                    entities.extend(schema_type)
-                else:
-                    entities.append(schema_type)
-            
-            for value in data.values():
-                self._extract_entities_recursive(value, entities)
+    def _extract_entities_recursive(self, data) -> List[str]:
+        """Entitás kinyerés JSON-LD-ből - iteratív mélységi bejárás (dokumentum sorrendben)"""
+        entities = []
+        stack = deque([data])
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                schema_type = node.get("@type")
+                if schema_type:
+                    if isinstance(schema_type, list):
+                        entities.extend(schema_type)
+                    else:
+                        entities.append(schema_type)
                 
-        elif isinstance(data, list):
-            for item in data:
-                self._extract_entities_recursive(item, entities)
+                stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
         
         return entities
 
@@ -998,64 +1317,60 @@ class AISpecificMetrics:
 
     def _calculate_ai_entity_value(self, jsonld_entities: Dict, schema_entities: Dict) -> int:
         """AI platform specifikus entitás érték"""
-        high_value_entities = [
-            'Person', 'Organization', 'Product', 'Article', 'HowTo', 'Recipe',
-            'FAQPage', 'QAPage', 'Course', 'VideoObject', 'WebPage'
-        ]
-        
         value = 0
-        for entity in high_value_entities:
+        for entity in _HIGH_VALUE_ENTITIES:
             value += jsonld_entities.get(entity, 0) * 10
             value += schema_entities.get(entity, 0) * 8
         
         return min(100, value)
 
-    def _extract_jsonld_dates(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_jsonld_dates(self, soup: BeautifulSoup,
+                              jsonld: Optional[Tuple[List, List[str]]] = None) -> List[str]:
         """JSON-LD dátum mezők kinyerése"""
         date_fields = []
-        scripts = soup.find_all("script", type="application/ld+json")
+        jsonld_docs = (jsonld if jsonld is not None else self._parse_jsonld_scripts(soup))[0]
         
-        for script in scripts:
+        for data in jsonld_docs:
             try:
-                data = json.loads(script.string)
                 self._find_date_fields_recursive(data, date_fields)
-            except (json.JSONDecodeError, AttributeError, TypeError):
+            except (AttributeError, TypeError):
                 continue
         
         return list(set(date_fields))
 
     def _find_date_fields_recursive(self, data, date_fields) -> None:
-        """Rekurzív dátum mező keresés"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key in ['datePublished', 'dateModified', 'dateCreated', 'uploadDate', 'releaseDate']:
-                    date_fields.append(key)
-                elif isinstance(value, (dict, list)):
-                    self._find_date_fields_recursive(value, date_fields)
-        elif isinstance(data, list):
-            for item in data:
-                self._find_date_fields_recursive(item, date_fields)
+        """Dátum mező keresés - iteratív bejárás"""
+        stack = deque([data])
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key in _DATE_FIELDS:
+                        date_fields.append(key)
+                    elif isinstance(value, (dict, list)):
+                        stack.append(value)
+            elif isinstance(node, list):
+                stack.extend(node)
 
     def _check_schema_date_fields(self, soup: BeautifulSoup) -> List[str]:
         """Schema.org dátum mezők ellenőrzése"""
         date_fields = []
-        date_props = ['datePublished', 'dateModified', 'dateCreated']
         
-        for prop in date_props:
+        for prop in _SCHEMA_DATE_PROPS:
             elements = soup.find_all(attrs={'itemprop': prop})
             if elements:
                 date_fields.append(prop)
         
         return date_fields
 
-    def _check_citation_schema(self, soup: BeautifulSoup) -> List[str]:
+    def _check_citation_schema(self, soup: BeautifulSoup,
+                               jsonld: Optional[Tuple[List, List[str]]] = None) -> List[str]:
         """Idézet schema ellenőrzése"""
         citation_schemas = []
-        scripts = soup.find_all("script", type="application/ld+json")
+        jsonld_docs = (jsonld if jsonld is not None else self._parse_jsonld_scripts(soup))[0]
         
-        for script in scripts:
+        for data in jsonld_docs:
             try:
-                data = json.loads(script.string)
                 if self._has_citation_in_schema(data):
                     citation_schemas.append("Citation")
             except:
@@ -1064,13 +1379,16 @@ class AISpecificMetrics:
         return citation_schemas
 
     def _has_citation_in_schema(self, data) -> bool:
-        """Rekurzív citation keresés schema-ban"""
-        if isinstance(data, dict):
-            if 'citation' in data or '@type' in data and 'citation' in str(data).lower():
-                return True
-            return any(self._has_citation_in_schema(v) for v in data.values())
-        elif isinstance(data, list):
-            return any(self._has_citation_in_schema(item) for item in data)
+        """Citation keresés schema-ban - iteratív bejárás, az első találatnál kilép"""
+        stack = deque([data])
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                if 'citation' in node:
+                    return True
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
         return False
 
     def _calculate_table_quality_score(self, tables, with_captions: int, 
@@ -1104,9 +1422,12 @@ class AISpecificMetrics:
     def _analyze_code_formatting(self, soup: BeautifulSoup) -> Dict:
         """Kód formázás elemzése"""
         code_blocks = soup.find_all(['pre', 'code'])
-        syntax_highlighted = len([block for block in code_blocks 
-                                if block.get('class') and any('language' in cls or 'highlight' in cls 
-                                                            for cls in block.get('class'))])
+        syntax_highlighted = 0
+        for block in code_blocks:
+            # Class lista egyszeri lekérése és összefűzése - egy C szintű substring keresés tokenenkénti ciklus helyett
+            classes = ' '.join(block.get('class') or ())
+            if 'language' in classes or 'highlight' in classes:
+                syntax_highlighted += 1
         
         return {
             "total_code_blocks": len(code_blocks),
@@ -1114,12 +1435,16 @@ class AISpecificMetrics:
             "code_quality_score": min(100, len(code_blocks) * 20 + syntax_highlighted * 10)
         }
 
-    def _analyze_step_formatting(self, soup: BeautifulSoup, text: str) -> Dict:
+    def _analyze_step_formatting(self, soup: BeautifulSoup, text: str,
+                                 step_lists: Optional[int] = None) -> Dict:
         """Step-by-step formázás elemzése"""
-        numbered_steps = len(re.findall(r'\b(?:step\s+)?\d+[.)]\s+', text, re.IGNORECASE))
-        ordered_lists_with_steps = len([ol for ol in soup.find_all('ol') 
-                                      if any(re.search(r'\b(?:step|lépés)\b', li.get_text(), re.I) 
-                                           for li in ol.find_all('li'))])
+        numbered_steps = _count_matches(_NUMBERED_STEP_RE, text)
+        if step_lists is not None:
+            ordered_lists_with_steps = step_lists
+        else:
+            ordered_lists_with_steps = sum(1 for ol in soup.find_all('ol')
+                                           if any(_STEP_WORD_RE.search(li.get_text())
+                                                  for li in ol.find_all('li')))
         
         return {
             "numbered_steps": numbered_steps,
@@ -1173,74 +1498,23 @@ class AISpecificMetrics:
     def get_ai_readiness_summary(self, metrics: Dict) -> Dict:
         """TURBÓZOTT AI-readiness összefoglaló - fejlett súlyozással és kategorizálással"""
         
-        # Extract individual scores with enhanced error handling
+        # Extract individual scores - előre lapított (szekció, kulcs) útvonalakkal
+        # Clamp és súlyozott összeg ugyanabban a bejárásban
         scores = {}
         score_weights = {}
+        total_score = 0
         
-        # Enhanced scoring system with dynamic weights
-        metric_configs = {
-            "structure": {
-                "path": ["content_structure", "structure_score"],
-                "weight": 0.20,
-                "ai_importance": "high"  # AI-k szeretik a jó struktúrát
-            },
-            "qa_format": {
-                "path": ["qa_format", "qa_score"], 
-                "weight": 0.18,
-                "ai_importance": "critical"  # Q&A formátum nagyon fontos
-            },
-            "entities": {
-                "path": ["entity_markup", "entity_score"],
-                "weight": 0.15,
-                "ai_importance": "high"
-            },
-            "freshness": {
-                "path": ["content_freshness", "freshness_score"],
-                "weight": 0.08,
-                "ai_importance": "medium"
-            },
-            "citations": {
-                "path": ["citation_readiness", "citation_score"], 
-                "weight": 0.12,
-                "ai_importance": "high"
-            },
-            "formatting": {
-                "path": ["ai_friendly_formatting", "formatting_score"],
-                "weight": 0.15,
-                "ai_importance": "high"
-            },
-            "depth": {
-                "path": ["knowledge_depth", "depth_score"],
-                "weight": 0.10,
-                "ai_importance": "medium"
-            },
-            "conversational": {
-                "path": ["conversational_elements", "conversational_score"],
-                "weight": 0.02,
-                "ai_importance": "low"  # Kevésbé fontos, de hasznos
-            }
-        }
-        
-        # Extract scores safely
-        for key, config in metric_configs.items():
-            try:
-                value = metrics
-                for path_part in config["path"]:
-                    value = value.get(path_part, {})
-                
-                if isinstance(value, (int, float)):
-                    scores[key] = max(0, min(100, value))  # Clamp to 0-100
-                    score_weights[key] = config["weight"]
-                else:
-                    scores[key] = 0
-                    score_weights[key] = config["weight"]
-                    
-            except (AttributeError, TypeError, KeyError):
-                scores[key] = 0
-                score_weights[key] = config["weight"]
-        
-        # Calculate weighted average
-        total_score = sum(scores[key] * score_weights[key] for key in scores)
+        for key, section, score_key, weight, _ in _METRIC_PATHS:
+            section_data = metrics.get(section, _EMPTY)
+            value = section_data.get(score_key, 0) if isinstance(section_data, dict) else 0
+            
+            if isinstance(value, (int, float)):
+                score = max(0, min(100, value))  # Clamp to 0-100
+            else:
+                score = 0
+            scores[key] = score
+            score_weights[key] = weight
+            total_score += score * weight
         
         # AI enhancement bonus (if available)
         enhancement_bonus = 0
@@ -1257,15 +1531,24 @@ class AISpecificMetrics:
             "category_performance": self._analyze_category_performance(scores),
             "top_strengths": self._get_top_areas(scores, top=True),
             "improvement_areas": self._get_top_areas(scores, top=False),
-            "ai_optimization_suggestions": self._generate_ai_optimization_suggestions(scores, metric_configs),
-            "score_breakdown": {
-                "excellent": len([s for s in scores.values() if s >= 80]),
-                "good": len([s for s in scores.values() if 60 <= s < 80]),
-                "fair": len([s for s in scores.values() if 40 <= s < 60]),
-                "poor": len([s for s in scores.values() if s < 40])
-            }
+            "ai_optimization_suggestions": self._generate_ai_optimization_suggestions(scores, METRIC_CONFIGS),
+            "score_breakdown": self._get_score_breakdown(scores)
         }
 
+    def _get_score_breakdown(self, scores: Dict) -> Dict:
+        """Pontszámok sávokba sorolása egyetlen bejárással"""
+        breakdown = {"excellent": 0, "good": 0, "fair": 0, "poor": 0}
+        for score in scores.values():
+            if score >= 80:
+                breakdown["excellent"] += 1
+            elif score >= 60:
+                breakdown["good"] += 1
+            elif score >= 40:
+                breakdown["fair"] += 1
+            else:
+                breakdown["poor"] += 1
+        return breakdown
+
     def _get_enhanced_readiness_level(self, score: float) -> str:
         """Enhanced AI-readiness szint meghatározása"""
         if score >= 85:
@@ -1281,16 +1564,9 @@ class AISpecificMetrics:
 
     def _analyze_category_performance(self, scores: Dict) -> Dict:
         """Kategória teljesítmény elemzése"""
-        categories = {
-            "structural": ["structure", "formatting"],
-            "content": ["qa_format", "depth", "conversational"], 
-            "semantic": ["entities", "citations"],
-            "technical": ["freshness"]
-        }
-        
         category_scores = {}
-        for category, metrics in categories.items():
-            category_score = statistics.mean([scores.get(metric, 0) for metric in metrics])
+        for category, metrics in _CATEGORY_METRICS:
+            category_score = sum(scores.get(metric, 0) for metric in metrics) / len(metrics)
             category_scores[category] = round(category_score, 1)
         
         return category_scores
@@ -1324,44 +1600,23 @@ class AISpecificMetrics:
 
     def _get_specific_suggestion(self, metric: str, score: float) -> str:
         """Metric-specifikus javaslatok"""
-        suggestions = {
-            "structure": "Hozz létre számozott listákat és javítsd a heading hierarchiát. AI-k jobban értik a strukturált tartalmat.",
-            "qa_format": "Implementálj FAQ schema markup-ot és hozz létre Q&A szekciót. Ez kritikus az AI platformoknak.",
-            "entities": "Adj hozzá Schema.org markup-ot személyekhez, helyekhez és termékekhez. Segíti az AI megértést.",
-            "freshness": "Adj hozzá publikálási és módosítási dátumokat. Friss tartalom magasabb prioritást kap.",
-            "citations": "Hivatkozz külső forrásokra és adj hozzá idézeteket. Növeli a tartalom hitelességét.",
-            "formatting": "Javítsd a képek alt szövegeit és add hozzá a táblázat feliratokat. AI-barát formázás.",
-            "depth": "Bővítsd ki a tartalmat példákkal és részletes magyarázatokkal. Mélyebb tudás jobb AI értékelést ad.",
-            "conversational": "Használj kérdéseket és közvetlen megszólítást. Beszélgetős stílus jobban működik chatbotokkal."
-        }
-        
-        return suggestions.get(metric, "Általános optimalizálás szükséges ezen a területen.")
+        return _METRIC_SUGGESTIONS.get(metric, "Általános optimalizálás szükséges ezen a területen.")
 
     def _estimate_improvement_potential(self, metric: str, current_score: float) -> int:
         """Fejlesztési potenciál becslése"""
         max_potential = 100 - current_score
         
         # Metric-specific multipliers based on how easy they are to improve
-        difficulty_multipliers = {
-            "structure": 0.8,      # Relatively easy
-            "qa_format": 0.9,      # Easy with schema
-            "entities": 0.7,       # Requires technical knowledge
-            "freshness": 0.9,      # Very easy
-            "citations": 0.6,      # Requires content work
-            "formatting": 0.8,     # Technical but straightforward  
-            "depth": 0.5,          # Content-heavy
-            "conversational": 0.7  # Style change needed
-        }
-        
-        multiplier = difficulty_multipliers.get(metric, 0.6)
+        multiplier = _DIFFICULTY_MULTIPLIERS.get(metric, 0.6)
         return round(max_potential * multiplier)
 
     def _get_top_areas(self, scores: Dict, top: bool = True) -> List[Dict]:
         """Legjobb/leggyengébb területek részletes elemzéssel"""
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=top)
+        # Csak a 3 szélső elem kell - teljes rendezés helyett (holtversenyben ugyanaz a sorrend, mint a sorted-nél)
+        picker = nlargest if top else nsmallest
         
         areas = []
-        for area, score in sorted_scores[:3]:
+        for area, score in picker(3, scores.items(), key=itemgetter(1)):
             areas.append({
                 "area": area,
                 "score": score,
@@ -1373,26 +1628,10 @@ class AISpecificMetrics:
 
     def _get_area_level(self, score: float) -> str:
         """Terület szint meghatározása"""
-        if score >= 80:
-            return "Kiváló"
-        elif score >= 60:
-            return "Jó" 
-        elif score >= 40:
-            return "Közepes"
-        else:
-            return "Gyenge"
+        if score != score:  # NaN: a korábbi >= láncnál is "Gyenge" lett
+            return _LEVELS[0]
+        return _LEVELS[bisect_right(_LEVEL_THRESHOLDS, score)]
 
     def _get_area_description(self, area: str) -> str:
         """Terület leírása"""
-        descriptions = {
-            "structure": "Tartalom strukturáltsága és szervezettsége",
-            "qa_format": "Kérdés-válasz formátum és FAQ elemek",
-            "entities": "Szemantikus jelölések és entitások", 
-            "freshness": "Tartalom frissessége és időszerűsége",
-            "citations": "Hivatkozások és források megléte",
-            "formatting": "AI-barát formázás és hozzáférhetőség",
-            "depth": "Tudás mélysége és részletessége",
-            "conversational": "Beszélgetős elemek és interaktivitás"
-        }
-        
-        return descriptions.get(area, "Ismeretlen terület")
\ No newline at end of file
+        return _AREA_DESCRIPTIONS.get(area, "Ismeretlen terület")
\ No newline at end of file
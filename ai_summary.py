@@ -1,15 +1,191 @@
+import asyncio
+import hashlib
 import json
-from openai import OpenAI
-from typing import Dict, Any, Optional, Tuple
+import random
+import re
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Tuple
 import os
-from dotenv import load_dotenv
 import logging
 
+from cache_manager import CacheManager
+
+# Az openai SDK (httpx, pydantic, anyio) és a dotenv csak első használatkor töltődik be
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Opcionális: orjson gyorsabb JSON szerializáláshoz
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Opcionális: tiktoken a pontos input token számláláshoz
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Alapértelmezett modell - az OPENAI_MODEL környezeti változóval felülírható
+DEFAULT_MODEL = "gpt-4o-mini"  # 128k kontextus, töredék ár a gpt-4-hez képest
+
+# Chat completion paraméterek (a modell nélkül) - a szinkron, async és Batch API hívás is ezeket használja
+CHAT_PARAMS = {
+    "temperature": 0.7,
+    "max_tokens": 4000,  # 2 x max. 1000 szó magyarul
+    "response_format": {"type": "json_object"}  # A válasz garantáltan JSON objektum
+}
+
+# Párhuzamos (async) generálás: egyidejű kérések száma és újrapróbálkozás átmeneti hibáknál -
+# az újrapróbálkozást csak mi végezzük, az SDK kliensek max_retries=0-val készülnek
+MAX_CONCURRENT_REQUESTS = 20
+MAX_RETRIES = 5
+
+# Több oldal egy kérésben (generate_many): becsült input token keret és oldalszám kérésenként -
+# a max_tokens oldalanként szorzódik (4 x 4000 a gpt-4o-mini 16k output keretén belül marad)
+PACKED_PROMPT_TOKEN_BUDGET = 30000
+PACKED_MAX_ITEMS = 4
+# Szólimit oldalanként - ugyanaz, mint az egyoldalas promptban
+SUMMARY_MAX_WORDS = 1000
+
+# Prompt sablonok - import időben egyszer épülnek, hívásonként csak egy .format() fut
+SYSTEM_PROMPT = """Te egy SEO és web optimalizálási szakértő vagy. A feladatod, hogy elemezd a weboldal GEO (Generative Engine Optimization) eredményeit és készíts összefoglalót és javaslatokat."""
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+USER_PROMPT_TEMPLATE = """Készítettem egy generative engine optimization ellenőrzést egy url-ről, az eredményt az alábbi json táblázatban küldöm. ELemezd a teljes JSON fájlt, utána az a feladatod, hogy:
+
+1. Készíts egy összefoglalót a JSON fájlban tárolt eredmények alapján. Légy alapos és szigorú. Haladj végig a HTML adatokon, AI metrikákon, Olvashatóságon, Schema és Google validáláson, SEO tartalmaok, Platformokon és Sebességen is.  (maximum 1000 szó)
+2. Készíts egy javaslatot a GEO eredmények javítására az 1. pontban írt összefoglaló alapján. Mindenképp használd fel hozzá a JSON fájlban feltüntetett Javítási javaslatokat is. (maximum 1000 szó, konkrét, végrehajtható lépések)
+
+JSON adatok:
+{data}
+
+Kérlek, válaszolj JSON formátumban az alábbi struktúrával:
+{{
+    "summary": "Az összefoglaló szövege...",
+    "recommendations": "A javaslatok szövege..."
+}}"""
+
+PACKED_PROMPT_TEMPLATE = """Készítettem generative engine optimization ellenőrzést {count} url-ről, az eredményeket az alábbi json táblázatokban küldöm. Elemezd mindegyiket külön, és oldalanként:
+
+1. Készíts egy összefoglalót a JSON adatok alapján. Légy alapos és szigorú. (maximum {max_words} szó)
+2. Készíts egy javaslatot a GEO eredmények javítására az összefoglaló és a JSON-ban feltüntetett Javítási javaslatok alapján. (maximum {max_words} szó, konkrét, végrehajtható lépések)
+
+{sites}
+
+Kérlek, válaszolj JSON formátumban, a "results" tömbben {count} elemmel, az oldalakkal azonos sorrendben:
+{{
+    "results": [
+        {{"summary": "Az összefoglaló szövege...", "recommendations": "A javaslatok szövege..."}}
+    ]
+}}"""
+
+# Az AI-nak átadott JSON maximális hossza karakterben (~25k token, bőven a 128k kontextuson belül)
+JSON_CHAR_LIMIT = 100000
+
+# Input token keret a JSON adatokhoz (tiktoken esetén) - a prompt többi része és a válasz bőven elfér mellette
+MAX_INPUT_TOKENS = 25000
+# Token keret túllépésekor ezek a (nagy, részletes) mezők esnek ki elsőként, ebben a sorrendben -
+# az összesítések (ai_metrics_summary, platform_suggestions) és a javítási javaslatok maradnak
+LOW_PRIORITY_RESULT_KEYS = ("pagespeed_insights", "platform_analysis", "ai_metrics", "content_quality", "auto_fixes")
+
+# Szekció fejléc kulcsszavak a nem-JSON válaszok manuális feldolgozásához
+SUMMARY_SECTION_RE = re.compile(r'összefoglaló|summary|áttekintés', re.IGNORECASE)
+RECOMMENDATIONS_SECTION_RE = re.compile(r'javaslat|recommendation|tanács|ajánlás', re.IGNORECASE)
+
+# Összefoglaló cache: azonos prompt (modell + üzenetek) esetén nincs új API hívás
+SUMMARY_CACHE_DIR = ".ai_summary_cache"
+SUMMARY_CACHE_TTL = 30 * 24 * 3600  # 30 nap
+
+ERROR_SUMMARY = "Hiba történt az AI összefoglaló generálása során. Kérlek, ellenőrizd az OpenAI API kulcsot és próbáld újra."
+ERROR_RECOMMENDATIONS = "Az AI javaslatok nem elérhetők. Manuálisan ellenőrizd az eredményeket és készíts optimalizálási tervet."
+
+def _dumps_indented(data: Any) -> str:
+    """JSON szerializálás 2 szóközös behúzással - orjson-nal, ha elérhető (azonos kimenet, mint a json.dumps)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # pl. nem támogatott típus vagy 64 bitnél nagyobb egész - a stdlib json dönt
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _valid_items_within_limit(items, limit: Optional[int]) -> List[Any]:
+    """A hibátlan eredmények legrövidebb eleje, amelynek szerializált hossza már túllépi a limitet -
+    szűrés és vágás egy menetben, a többi elem úgyis levágódna, ezért se szűrni, se szerializálni nem kell.
+    limit=None esetén az összes hibátlan eredmény (vágás nélkül)"""
+    if limit is None:
+        return [item for item in items if isinstance(item, dict) and 'error' not in item]
+    
+    kept = []
+    size = 0
+    for item in items:
+        if not isinstance(item, dict) or 'error' in item:
+            continue
+        kept.append(item)
+        # Önmagában szerializálva rövidebb, mint beágyazva (kisebb behúzás), így alsó becslés
+        size += len(_dumps_indented(item))
+        if size > limit:
+            break
+    return kept
+
+
+def _drop_result_key(full_data: Any, key: str) -> Any:
+    """Egy mező elhagyása minden eredményből - másolatot ad, a hívó adatait nem módosítja"""
+    def drop(item):
+        if isinstance(item, dict) and key in item:
+            return {k: v for k, v in item.items() if k != key}
+        return item
+    
+    if isinstance(full_data, dict) and 'results' in full_data:
+        return {**full_data, 'results': [drop(item) for item in full_data['results']]}
+    if isinstance(full_data, list):
+        return [drop(item) for item in full_data]
+    return drop(full_data)
+
+
+def _get_token_encoding(model: str):
+    """tiktoken encoding a modellhez - None, ha a tiktoken nem elérhető vagy nem tölthető be"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")  # gpt-4o család
+    except Exception as e:
+        logger.warning(f"tiktoken encoding nem tölthető be, karakter limit marad: {str(e)}")
+        return None
+
+
+def _load_json_file(json_file_path: str) -> Any:
+    """JSON fájl betöltése bináris olvasással és orjson parse-szal, ha elérhető -
+    amit az orjson elutasít (pl. a json.dump által írt NaN), azt a stdlib json olvassa be"""
+    with open(json_file_path, 'rb') as f:
+        content = f.read()
+    
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content.decode('utf-8'))
+
+
+_dotenv_loaded = False
+
+
 def get_openai_api_key():
-    """Biztonságos API kulcs lekérés Streamlit függőségek nélkül"""
-    load_dotenv()
+    """Biztonságos API kulcs lekérés Streamlit függőségek nélkül - a .env fájlt csak egyszer keresi meg"""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
     return os.getenv("OPENAI_API_KEY")
 
 class AISummaryGenerator:
@@ -17,18 +193,33 @@ class AISummaryGenerator:
     OpenAI API-val történő összefoglaló és javaslat generálás
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, enable_cache: bool = True):
         """
         Inicializálja az AI Summary Generator-t
         
         Args:
             api_key: OpenAI API kulcs (ha nincs megadva, környezetből veszi)
+            enable_cache: Generált összefoglalók cache-elése a prompt hash-e alapján
         """
         self.api_key = api_key or get_openai_api_key()
         if not self.api_key:
             raise ValueError("OpenAI API kulcs szükséges. Állítsd be a OPENAI_API_KEY environment változót.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        import httpx
+        from openai import OpenAI
+        # Keep-alive kapcsolat pool - a TCP/TLS kézfogás csak egyszer fut, párhuzamos hívásoknál is
+        self.client = OpenAI(
+            api_key=self.api_key,
+            max_retries=0,  # Újrapróbálkozás: _call_with_retries
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+                timeout=60
+            )
+        )
+        self.model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+        self.chat_params = {"model": self.model, **CHAT_PARAMS}
+        self._encoding = _get_token_encoding(self.model)
+        self.cache_manager = CacheManager(SUMMARY_CACHE_DIR) if enable_cache else None
     
     def generate_summary_and_recommendations(self, json_data: Dict[str, Any]) -> Tuple[str, str]:
         """
@@ -41,117 +232,518 @@ class AISummaryGenerator:
             Tuple[str, str]: (összefoglaló, javaslatok)
         """
         try:
-            # JSON adatok előkészítése
-            formatted_data = self._format_json_for_ai(json_data)
+            # A streamelt válasz összefűzése, majd feldolgozása
+            ai_response = "".join(self.generate_summary_and_recommendations_stream(json_data))
+            return self._parse_ai_response(ai_response)
+                
+        except Exception as e:
+            logger.error(f"Hiba az AI összefoglaló generálása során: {str(e)}")
+            return ERROR_SUMMARY, ERROR_RECOMMENDATIONS
+    
+    def generate_summary_and_recommendations_stream(self, json_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Streamelt generálás - a nyers (JSON) válasz darabjai azonnal, ahogy megérkeznek
+        
+        Args:
+            json_data: Az elemzés eredményét tartalmazó JSON adatok
+            
+        Yields:
+            str: A válasz következő darabja (cache találatnál a teljes válasz egyben)
+            
+        Raises:
+            Exception: API hiba esetén - a hibaszövegek a nem streamelt változatban vannak
+        """
+        # JSON adatok előkészítése
+        formatted_data = self._format_json_for_ai(json_data)
+        messages = self._build_messages(formatted_data)
+        
+        cache_key = self._get_cache_key(messages)
+        cached = self._get_cached_summary(cache_key)
+        if cached:
+            summary, recommendations = cached
+            yield json.dumps({"summary": summary, "recommendations": recommendations}, ensure_ascii=False)
+            return
+        
+        # OpenAI API hívás - stream=True, az első token után már jön a válasz
+        chunks = []
+        finish_reason = None
+        response = self._call_with_retries(
+            self.client.chat.completions.create,
+            messages=messages,
+            stream=True,
+            **self.chat_params
+        )
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            content = choice.delta.content
+            if content:
+                chunks.append(content)
+                yield content
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        # Csak a teljes (nem levágott) és valid JSON válasz kerül a cache-be - a manuális
+        # szétválasztás csak becslés, azt nem játsszuk vissza
+        result, complete = self._parse_ai_response_checked("".join(chunks))
+        if complete and finish_reason == "stop":
+            self._set_cached_summary(cache_key, result)
+    
+    def generate_many(self, json_datas: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Több elemzés összefoglalója úgy, hogy egy kérés több oldalt is tartalmaz - a rendszer prompt
+        és az utasítások csak kérésenként egyszer kerülnek kiszámlázásra
+        
+        Args:
+            json_datas: Elemzési eredmények listája
             
-            # OpenAI API hívás
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        formatted = [self._format_json_for_ai(json_data) for json_data in json_datas]
+        results = [None] * len(json_datas)
+        
+        # Cache: a kulcs ugyanaz, mint az egyoldalas hívásé, így a már generált oldalak nem kerülnek újra számlázásra
+        cache_keys = [None] * len(json_datas)
+        pending = []
+        for i, formatted_data in enumerate(formatted):
+            if self.cache_manager:
+                cache_keys[i] = self._get_cache_key(self._build_messages(formatted_data))
+                cached = self._get_cached_summary(cache_keys[i])
+                if cached:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+        
+        # Csoportosítás becsült token szám alapján (~4 karakter / token)
+        groups = []
+        current, current_tokens = [], 0
+        for i in pending:
+            tokens = len(formatted[i]) // 4
+            if current and (current_tokens + tokens > PACKED_PROMPT_TOKEN_BUDGET or len(current) >= PACKED_MAX_ITEMS):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        
+        for group in groups:
+            packed = self._generate_packed([formatted[i] for i in group]) if len(group) > 1 else None
+            if packed is None:
+                # Egyelemű csoport, vagy a közös válasz nem volt feldolgozható: egyenkénti hívás (saját cache-eléssel)
+                for i in group:
+                    results[i] = self.generate_summary_and_recommendations(json_datas[i])
+                continue
+            for i, (result, complete) in zip(group, packed):
+                results[i] = result
+                if complete and cache_keys[i]:
+                    self._set_cached_summary(cache_keys[i], result)
+        
+        return results
+    
+    def _generate_packed(self, formatted_datas: List[str]) -> Optional[List[Tuple[Tuple[str, str], bool]]]:
+        """
+        Egyetlen chat completion több oldalra - None, ha a válasz nem a várt JSON tömb
+        
+        Returns:
+            Optional[List[Tuple[Tuple[str, str], bool]]]: oldalanként ((összefoglaló, javaslatok), cache-elhető-e) -
+                cache-elhető, ha mindkét mező megvan és a válasz nem lett levágva
+        """
+        count = len(formatted_datas)
+        chat_params = dict(self.chat_params)
+        chat_params["max_tokens"] *= count  # Minden oldal a teljes, egyoldalas output keretet kapja
+        sites = "\n\n".join(f"--- {i + 1}. oldal JSON adatai ---\n{formatted_data}"
+                             for i, formatted_data in enumerate(formatted_datas))
+        
+        try:
+            # Streamelt hívás: a 60 mp-es HTTP timeout így darabonként érvényes, nem a (többszörös
+            # max_tokens miatt) hosszú teljes generálásra - nem futunk újra és újra timeoutba
+            response = self._call_with_retries(
+                self.client.chat.completions.create,
                 messages=[
+                    SYSTEM_MESSAGE,
                     {
-                        "role": "system",
-                        "content": """Te egy SEO és web optimalizálási szakértő vagy. A feladatod, hogy elemezd a weboldal GEO (Generative Engine Optimization) eredményeit és készíts összefoglalót és javaslatokat."""
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"""Készítettem egy generative engine optimization ellenőrzést egy url-ről, az eredményt az alábbi json táblázatban küldöm. ELemezd a teljes JSON fájlt, utána az a feladatod, hogy:
-
-1. Készíts egy összefoglalót a JSON fájlban tárolt eredmények alapján. Légy alapos és szigorú. Haladj végig a HTML adatokon, AI metrikákon, Olvashatóságon, Schema és Google validáláson, SEO tartalmaok, Platformokon és Sebességen is.  (maximum 1000 szó)
-2. Készíts egy javaslatot a GEO eredmények javítására az 1. pontban írt összefoglaló alapján. Mindenképp használd fel hozzá a JSON fájlban feltüntetett Javítási javaslatokat is. (maximum 1000 szó, konkrét, végrehajtható lépések)
-
-JSON adatok:
-{formatted_data}
-
-Kérlek, válaszolj JSON formátumban az alábbi struktúrával:
-{{
-    "summary": "Az összefoglaló szövege...",
-    "recommendations": "A javaslatok szövege..."
-}}"""
+                        "role": "user",
+                        "content": PACKED_PROMPT_TEMPLATE.format(count=count, max_words=SUMMARY_MAX_WORDS, sites=sites)
                     }
                 ],
-                temperature=0.7,
-                max_tokens=3000  # Csökkentjük a token limitet hogy elférjen a 8192 token kontextusba
+                stream=True,
+                **chat_params
             )
+            chunks = []
+            finish_reason = None
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.delta.content:
+                    chunks.append(choice.delta.content)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+            
+            parsed_response = json.loads("".join(chunks).strip()).get("results")
+        except Exception as e:
+            logger.warning(f"Közös (több oldalas) AI válasz hiba, egyenkénti feldolgozás: {str(e)}")
+            return None
+        
+        if (not isinstance(parsed_response, list) or len(parsed_response) != count or
+                not all(isinstance(item, dict) for item in parsed_response)):
+            logger.warning("A közös AI válasz nem a várt JSON tömb, egyenkénti feldolgozás...")
+            return None
+        
+        stopped = finish_reason == "stop"
+        return [((item.get("summary", "Nem sikerült generálni az összefoglalót."),
+                  item.get("recommendations", "Nem sikerült generálni a javaslatokat.")),
+                 stopped and bool(item.get("summary")) and bool(item.get("recommendations")))
+                for item in parsed_response]
+    
+    def generate_summaries_concurrent(self, json_datas: List[Dict[str, Any]],
+                                      max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Tuple[str, str]]:
+        """
+        Több elemzés összefoglalója párhuzamos API hívásokkal - szinkron wrapper az agenerate_many köré
+        
+        Args:
+            json_datas: Elemzési eredmények listája
+            max_concurrency: Egyidejűleg futó kérések maximális száma
             
-            # Válasz feldolgozása
-            ai_response = response.choices[0].message.content.strip()
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        return asyncio.run(self.agenerate_many(json_datas, max_concurrency))
+    
+    async def agenerate_many(self, json_datas: List[Dict[str, Any]],
+                             max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Tuple[str, str]]:
+        """
+        Több elemzés összefoglalója AsyncOpenAI-val, szemaforral korlátozott párhuzamossággal
+        
+        Args:
+            json_datas: Elemzési eredmények listája
+            max_concurrency: Egyidejűleg futó kérések maximális száma
+            
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        if not json_datas:
+            return []
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Az async kliens a futó event loop-hoz kötődik, ezért hívásonként készül és záródik
+        from openai import AsyncOpenAI
+        async with AsyncOpenAI(api_key=self.api_key, max_retries=0) as aclient:
+            async def bounded(json_data):
+                async with semaphore:
+                    return await self.agenerate_summary_and_recommendations(json_data, aclient)
+            
+            return list(await asyncio.gather(*(bounded(json_data) for json_data in json_datas)))
+    
+    async def agenerate_summary_and_recommendations(self, json_data: Dict[str, Any],
+                                                    aclient: "AsyncOpenAI") -> Tuple[str, str]:
+        """
+        Async összefoglaló generálás - átmeneti hibáknál (rate limit, timeout) exponenciális visszalépéssel újrapróbál
+        
+        Args:
+            json_data: Az elemzés eredményét tartalmazó JSON adatok
+            aclient: Az agenerate_many által megosztott AsyncOpenAI kliens (max_retries=0, az
+                újrapróbálkozás itt történik)
+            
+        Returns:
+            Tuple[str, str]: (összefoglaló, javaslatok)
+        """
+        from openai import RateLimitError, APITimeoutError, APIConnectionError
+        retryable_errors = (RateLimitError, APITimeoutError, APIConnectionError)
+        
+        try:
+            messages = self._build_messages(self._format_json_for_ai(json_data))
+            
+            cache_key = self._get_cache_key(messages)
+            cached = self._get_cached_summary(cache_key)
+            if cached:
+                return cached
+            
+            for attempt in range(MAX_RETRIES):
+                try:
+                    response = await aclient.chat.completions.create(messages=messages, **self.chat_params)
+                    break
+                except retryable_errors as e:
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    delay = 2 ** attempt + random.random()
+                    logger.warning(f"Átmeneti API hiba ({type(e).__name__}), újrapróbálás {delay:.1f} mp múlva...")
+                    await asyncio.sleep(delay)
+            
+            choice = response.choices[0]
+            result, complete = self._parse_ai_response_checked(choice.message.content)
+            if complete and choice.finish_reason == "stop":
+                self._set_cached_summary(cache_key, result)
+            return result
             
-            try:
-                # JSON parsing
-                parsed_response = json.loads(ai_response)
-                summary = parsed_response.get("summary", "Nem sikerült generálni az összefoglalót.")
-                recommendations = parsed_response.get("recommendations", "Nem sikerült generálni a javaslatokat.")
-                
-                return summary, recommendations
-                
-            except json.JSONDecodeError:
-                # Ha nem valid JSON, próbáljuk szétválasztani manuálisan
-                logger.warning("AI válasz nem valid JSON, manuális feldolgozás...")
-                return self._parse_ai_response_manually(ai_response)
-                
         except Exception as e:
             logger.error(f"Hiba az AI összefoglaló generálása során: {str(e)}")
-            error_summary = "Hiba történt az AI összefoglaló generálása során. Kérlek, ellenőrizd az OpenAI API kulcsot és próbáld újra."
-            error_recommendations = "Az AI javaslatok nem elérhetők. Manuálisan ellenőrizd az eredményeket és készíts optimalizálási tervet."
-            return error_summary, error_recommendations
+            return ERROR_SUMMARY, ERROR_RECOMMENDATIONS
+    
+    def generate_summaries_batch(self, json_datas: List[Dict[str, Any]], poll_interval: int = 30) -> List[Tuple[str, str]]:
+        """
+        Több elemzés összefoglalója az OpenAI Batch API-n keresztül (fél áron, RPM limit nélkül)
+        
+        Args:
+            json_datas: Elemzési eredmények listája
+            poll_interval: Állapot lekérdezések közötti várakozás másodpercben
+            
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        if not json_datas:
+            return []
+        
+        try:
+            batch_id = self.submit_batch(json_datas)
+            results = self.wait_for_batch(batch_id, poll_interval)
+        except Exception as e:
+            # Fallback: szinkron hívások egyenként
+            logger.warning(f"Batch API hiba, szinkron feldolgozás: {str(e)}")
+            return [self.generate_summary_and_recommendations(json_data) for json_data in json_datas]
+        
+        return [results.get(self._batch_custom_id(i), (ERROR_SUMMARY, ERROR_RECOMMENDATIONS))
+                for i in range(len(json_datas))]
+    
+    def submit_batch(self, json_datas: List[Dict[str, Any]]) -> str:
+        """
+        Batch kérés beküldése - JSONL feltöltés és batch indítás
+        
+        Args:
+            json_datas: Elemzési eredmények listája
+            
+        Returns:
+            str: A batch azonosítója
+        """
+        lines = []
+        for i, json_data in enumerate(json_datas):
+            request = {
+                "custom_id": self._batch_custom_id(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "messages": self._build_messages(self._format_json_for_ai(json_data)),
+                    **self.chat_params
+                }
+            }
+            lines.append(json.dumps(request, ensure_ascii=False))
+        
+        batch_file = self._call_with_retries(
+            self.client.files.create,
+            file=("geo_summary_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self._call_with_retries(
+            self.client.batches.create,
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Batch elküldve: {batch.id} ({len(lines)} kérés)")
+        return batch.id
+    
+    def wait_for_batch(self, batch_id: str, poll_interval: int = 30) -> Dict[str, Tuple[str, str]]:
+        """
+        Batch befejezésének megvárása és az eredmények feldolgozása
+        
+        Args:
+            batch_id: A submit_batch által visszaadott azonosító
+            poll_interval: Állapot lekérdezések közötti várakozás másodpercben
+            
+        Returns:
+            Dict[str, Tuple[str, str]]: custom_id -> (összefoglaló, javaslatok)
+        """
+        batch = self._call_with_retries(self.client.batches.retrieve, batch_id)
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self._call_with_retries(self.client.batches.retrieve, batch_id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"A batch nem fejeződött be sikeresen: {batch_id} ({batch.status})")
+        
+        results = {}
+        for line in self._call_with_retries(self.client.files.content, batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                logger.error(f"Batch kérés hiba ({item.get('custom_id')}): {item.get('error')}")
+                results[item.get("custom_id")] = (ERROR_SUMMARY, ERROR_RECOMMENDATIONS)
+                continue
+            
+            content = response["body"]["choices"][0]["message"]["content"]
+            results[item.get("custom_id")] = self._parse_ai_response(content)
+        
+        return results
+    
+    @staticmethod
+    def _call_with_retries(func, *args, **kwargs):
+        """
+        Szinkron API hívás - átmeneti hibáknál (rate limit, timeout) exponenciális visszalépéssel újrapróbál,
+        ugyanúgy, mint az async változat
+        """
+        from openai import RateLimitError, APITimeoutError, APIConnectionError
+        retryable_errors = (RateLimitError, APITimeoutError, APIConnectionError)
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except retryable_errors as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning(f"Átmeneti API hiba ({type(e).__name__}), újrapróbálás {delay:.1f} mp múlva...")
+                time.sleep(delay)
+    
+    def _get_cache_key(self, messages: List[Dict[str, str]]) -> str:
+        """Cache kulcs: SHA-256 a modell paraméterekből és a teljes prompt-ból"""
+        key_string = json.dumps({"params": self.chat_params, "messages": messages}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+    
+    def _get_cached_summary(self, cache_key: str) -> Optional[Tuple[str, str]]:
+        """Cache-elt (összefoglaló, javaslatok) pár, ha van"""
+        if not self.cache_manager:
+            return None
+        cached = self.cache_manager.get_cached_result(cache_key)
+        if not cached:
+            return None
+        return cached.get("summary"), cached.get("recommendations")
+    
+    def _set_cached_summary(self, cache_key: str, result: Tuple[str, str]) -> None:
+        """Generált összefoglaló mentése a cache-be"""
+        if self.cache_manager:
+            summary, recommendations = result
+            self.cache_manager.set_cached_result(
+                cache_key, {"summary": summary, "recommendations": recommendations}, ttl=SUMMARY_CACHE_TTL
+            )
+    
+    @staticmethod
+    def _batch_custom_id(index: int) -> str:
+        """Batch kérés azonosító - az index alapján a válaszok visszarendezhetők"""
+        return f"geo-summary-{index}"
+    
+    def _build_messages(self, formatted_data: str) -> List[Dict[str, str]]:
+        """
+        Chat üzenetek összeállítása a formázott JSON adatokból
+        """
+        return [
+            SYSTEM_MESSAGE,
+            {
+                "role": "user", 
+                "content": USER_PROMPT_TEMPLATE.format(data=formatted_data)
+            }
+        ]
+    
+    def _parse_ai_response(self, ai_response: str) -> Tuple[str, str]:
+        """
+        AI válasz feldolgozása - JSON, vagy ha az nem valid, manuális szétválasztás
+        """
+        return self._parse_ai_response_checked(ai_response)[0]
+    
+    def _parse_ai_response_checked(self, ai_response: str) -> Tuple[Tuple[str, str], bool]:
+        """
+        AI válasz feldolgozása sikerjelzéssel
+        
+        Returns:
+            Tuple[Tuple[str, str], bool]: ((összefoglaló, javaslatok), True, ha a válasz valid JSON
+                objektum volt mindkét mezővel - csak az ilyen eredmény cache-elhető)
+        """
+        ai_response = (ai_response or "").strip()
+        
+        try:
+            # JSON parsing
+            parsed_response = json.loads(ai_response)
+            if not isinstance(parsed_response, dict):
+                raise json.JSONDecodeError("A válasz nem JSON objektum", ai_response, 0)
+            summary = parsed_response.get("summary", "Nem sikerült generálni az összefoglalót.")
+            recommendations = parsed_response.get("recommendations", "Nem sikerült generálni a javaslatokat.")
+            complete = bool(parsed_response.get("summary")) and bool(parsed_response.get("recommendations"))
+            
+            return (summary, recommendations), complete
+            
+        except json.JSONDecodeError:
+            # Ha nem valid JSON, próbáljuk szétválasztani manuálisan
+            logger.warning("AI válasz nem valid JSON, manuális feldolgozás...")
+            return self._parse_ai_response_manually(ai_response), False
     
     def _format_json_for_ai(self, data: Dict[str, Any]) -> str:
         """
         Formázza a JSON adatokat AI számára - TELJES adathalmaz átadása
         """
         try:
-            # Teljes JSON átadása - ne veszítsünk el adatokat
+            # Teljes JSON átadása - ne veszítsünk el adatokat. A hibás eredményeket kiszűrjük; karakter
+            # limitnél csak a limitig szükséges eredmények kerülnek be (a kimenet ugyanaz, mint a teljes JSON
+            # levágva). tiktoken esetén minden eredmény megmarad, a token keretet a mezők elhagyása biztosítja.
+            item_limit = JSON_CHAR_LIMIT if self._encoding is None else None
             if isinstance(data, list):
-                full_data = data
+                full_data = _valid_items_within_limit(data, item_limit)
             elif isinstance(data, dict) and 'results' in data:
                 # Ha van results mező, azt és a meta információkat is küldjük
+                results = data['results'] or []
                 full_data = {
-                    "results": data['results'],
+                    "results": _valid_items_within_limit(results, item_limit),
                     "analysis_metadata": {
                         "analysis_date": data.get("analysis_date"),
                         "enhancement_stats": data.get("enhancement_stats", {}),
-                        "total_urls": len(data.get('results', [])) if data.get('results') else 0
+                        "total_urls": len(results)
                     }
                 }
             else:
                 full_data = data
             
-            # Csak a hibás eredményeket szűrjük ki
-            if isinstance(full_data, dict) and 'results' in full_data:
-                full_data['results'] = [
-                    item for item in full_data['results'] 
-                    if isinstance(item, dict) and 'error' not in item
-                ]
-            elif isinstance(full_data, list):
-                full_data = [
-                    item for item in full_data 
-                    if isinstance(item, dict) and 'error' not in item
-                ]
-            
-            # Teljes JSON visszaadása - 8000 karakter limit a token korlátok miatt
-            json_string = json.dumps(full_data, indent=2, ensure_ascii=False)
-            
-            # 8000 karakteres limit a GPT-4 token korlátok miatt
-            if len(json_string) > 8000:
-                logger.warning(f"Nagy JSON méret ({len(json_string)} karakter), limitálás 8000 karakterre")
-                return json_string[:8000] + "\n... [truncated for token limit]"
+            json_string = _dumps_indented(full_data)
+            
+            # Pontos token keret, ha a tiktoken elérhető - előbb a részletes mezők esnek ki, nem az adatok vége
+            if self._encoding is not None:
+                return self._fit_to_token_budget(full_data, json_string)
+            
+            # Karakter limit a modell kontextus mérete miatt
+            if len(json_string) > JSON_CHAR_LIMIT:
+                logger.warning(f"Nagy JSON méret (>{JSON_CHAR_LIMIT} karakter), limitálás {JSON_CHAR_LIMIT} karakterre")
+                return json_string[:JSON_CHAR_LIMIT] + "\n... [truncated for token limit]"
             
             return json_string
             
         except Exception as e:
             logger.error(f"Hiba a JSON formázás során: {str(e)}")
             # Fallback: teljes adat string reprezentációja
-            return str(data)[:8000]
+            return str(data)[:JSON_CHAR_LIMIT]
+    
+    def _fit_to_token_budget(self, full_data: Any, json_string: str) -> str:
+        """
+        JSON illesztése a MAX_INPUT_TOKENS keretbe - kevésbé fontos mezők elhagyásával, végső esetben token pontos vágással
+        """
+        if len(self._encoding.encode(json_string)) <= MAX_INPUT_TOKENS:
+            return json_string
+        
+        dropped = []
+        for key in LOW_PRIORITY_RESULT_KEYS:
+            full_data = _drop_result_key(full_data, key)
+            dropped.append(key)
+            json_string = _dumps_indented(full_data)
+            if len(self._encoding.encode(json_string)) <= MAX_INPUT_TOKENS:
+                logger.warning(f"Token keret ({MAX_INPUT_TOKENS}) miatt kihagyott mezők: {', '.join(dropped)}")
+                return json_string
+        
+        tokens = self._encoding.encode(json_string)
+        logger.warning(f"Nagy JSON méret ({len(tokens)} token), limitálás {MAX_INPUT_TOKENS} tokenre")
+        return self._encoding.decode(tokens[:MAX_INPUT_TOKENS]) + "\n... [truncated for token limit]"
     
     def _parse_ai_response_manually(self, response: str) -> Tuple[str, str]:
         """
         Manuális feldolgozás, ha az AI válasz nem valid JSON
         """
         try:
-            # Próbáljuk megtalálni az összefoglalót és javaslatokat
+            # Próbáljuk megtalálni az összefoglalót és javaslatokat - a sorok listába gyűlnek,
+            # a szöveg a végén egyetlen join-nal épül (nem soronkénti string összefűzéssel)
             lines = response.split('\n')
-            summary = ""
-            recommendations = ""
+            summary_lines = []
+            recommendation_lines = []
             current_section = None
             
             for line in lines:
@@ -160,18 +752,21 @@ Kérlek, válaszolj JSON formátumban az alábbi struktúrával:
                     continue
                     
                 # Keresés kulcsszavakra
-                if any(keyword in line.lower() for keyword in ["összefoglaló", "summary", "áttekintés"]):
+                if SUMMARY_SECTION_RE.search(line):
                     current_section = "summary"
                     continue
-                elif any(keyword in line.lower() for keyword in ["javaslat", "recommendation", "tanács", "ajánlás"]):
+                elif RECOMMENDATIONS_SECTION_RE.search(line):
                     current_section = "recommendations"
                     continue
                 
                 # Tartalom hozzáadása
                 if current_section == "summary":
-                    summary += line + " "
+                    summary_lines.append(line)
                 elif current_section == "recommendations":
-                    recommendations += line + " "
+                    recommendation_lines.append(line)
+            
+            summary = " ".join(summary_lines)
+            recommendations = " ".join(recommendation_lines)
             
             # Ha nem találtunk semmit, osszuk fel a választ felezve
             if not summary and not recommendations:
@@ -185,6 +780,12 @@ Kérlek, válaszolj JSON formátumban az alábbi struktúrával:
             logger.error(f"Hiba a manuális feldolgozás során: {str(e)}")
             return "Hiba történt a válasz feldolgozása során.", "Nem sikerült feldolgozni a javaslatokat."
 
+@lru_cache(maxsize=1)
+def _default_generator() -> AISummaryGenerator:
+    """Modul szintű, újrahasznosított generátor - egy OpenAI kliens és kapcsolat pool minden fájlhoz"""
+    return AISummaryGenerator()
+
+
 def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
     """
     Segédfüggvény: AI összefoglaló generálása JSON fájlból
@@ -196,10 +797,9 @@ def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
         Tuple[str, str]: (összefoglaló, javaslatok)
     """
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json_file(json_file_path)
         
-        generator = AISummaryGenerator()
+        generator = _default_generator()
         return generator.generate_summary_and_recommendations(data)
         
     except FileNotFoundError:
@@ -1,34 +1,254 @@
+import asyncio
+import hashlib
 import json
-from openai import OpenAI
-from typing import Dict, Any, Optional, Tuple, List
+import mmap
+import re
+from functools import lru_cache
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from typing import Dict, Any, Iterator, Optional, Tuple, List
 import os
 from dotenv import load_dotenv
 import logging
 
+from cache_manager import CacheManager
+
+# Opcionális: orjson gyorsabb JSON szerializáláshoz és parse-hoz
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Opcionális: Aho-Corasick automata a manuális feldolgozás töréspont kereséséhez
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
-def get_openai_api_key():
-    """Biztonságos API kulcs lekérés Streamlit függőségek nélkül"""
+# Alapértelmezett modell - az OPENAI_MODEL környezeti változóval felülírható
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Fix prompt részek - hívásról hívásra bájtazonosak, a változó adat mindig a végére kerül,
+# így az OpenAI automatikus prompt cache-e a közös elejét újrahasznosíthatja
+SYSTEM_PROMPT = "Te egy GEO (Generative Engine Optimization) szakértő vagy. KRITIKUS: Válaszolj CSAK valid JSON formátumban: {\"summary\": \"...\", \"recommendations\": \"...\"}"
+USER_PROMPT_PREFIX = """GEO audit eredmények elemzése:
+
+1. ÖSSZEFOGLALÓ (max 600 szó): AI readiness score, meta adatok, schema, tartalom, platform kompatibilitás
+2. JAVASLATOK (max 600 szó): Prioritizált javítási terv
+
+FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
+{"summary": "...", "recommendations": "..."}
+
+Adatok:
+"""
+
+# Structured Outputs: a válasz sémáját az API kényszeríti ki (strict JSON schema) - streameléssel,
+# async és több oldalas kéréssel is működik, a modell nem térhet el a mezőktől
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "recommendations": {"type": "string"}
+    },
+    "required": ["summary", "recommendations"],
+    "additionalProperties": False
+}
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "geo_summary", "strict": True, "schema": SUMMARY_SCHEMA}
+}
+PACKED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "geo_summaries",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"id": {"type": "integer"}, **SUMMARY_SCHEMA["properties"]},
+                        "required": ["id", "summary", "recommendations"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["results"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Sémás válasz mindig valid JSON objektum - a manuális szétválasztás csak végső tartalék
+# (pl. max_tokens miatt csonka válasz esetén); False esetén ilyenkor hibaüzenet a válasz
+MANUAL_PARSE_FALLBACK = True
+
+# Manuális (nem JSON) válasz feldolgozás mintái - import időben egyszer fordulnak le
+CODE_FENCE_RE = re.compile(r'```json|```')
+JSON_PREFIX_RE = re.compile(r'^json\s*', re.IGNORECASE)
+JSON_CHARS_RE = re.compile(r'[{}"]')
+WHITESPACE_RE = re.compile(r'\s+')
+LEADING_PUNCT_RE = re.compile(r'^[:\-\s]*')
+RECOMMENDATIONS_PREFIX_RE = re.compile(r'^(?:javaslatok|recommendations|ajánlások)[:\s]*', re.IGNORECASE)
+SECTION_PATTERNS = [
+    (re.compile(sum_pattern, re.IGNORECASE | re.DOTALL), re.compile(rec_pattern, re.IGNORECASE | re.DOTALL))
+    for sum_pattern, rec_pattern in [
+        # JSON-szerű szerkezet
+        (r'summary[:\s]+(.*?)(?:recommendations|javaslat)', r'recommendations[:\s]+(.*)'),
+        # Számozott lista
+        (r'1\.\s*(?:összefoglaló|summary)[:\s]*(.*?)(?:2\.|recommendations|javaslat)', 
+         r'2\.\s*(?:javaslatok|recommendations)[:\s]*(.*)'),
+        # Nagybetűs címek
+        (r'ÖSSZEFOGLALÓ[:\s]*(.*?)(?:JAVASLATOK|RECOMMENDATIONS)', 
+         r'(?:JAVASLATOK|RECOMMENDATIONS)[:\s]*(.*)'),
+        # Természetes szöveg
+        (r'(?:összefoglaló|summary)[:\s]*(.*?)(?:javaslatok|recommendations|ajánlások)', 
+         r'(?:javaslatok|recommendations|ajánlások)[:\s]*(.*)'),
+    ]
+]
+
+# A kompakt elemzésben átlagolt platformok
+COMPACT_PLATFORMS = ("chatgpt", "claude", "gemini", "bing_chat")
+
+# Több oldal egy kérésben (generate_many): a rendszer prompt és az utasítások kérésenként csak egyszer
+# kerülnek kiszámlázásra. A válasz token kerete az oldalak számával arányosan nő.
+PACKED_MAX_ITEMS = 4
+PACKED_PROMPT_PREFIX = """GEO audit eredmények elemzése, {count} oldal - mindegyiket külön:
+
+1. ÖSSZEFOGLALÓ (max 600 szó): AI readiness score, meta adatok, schema, tartalom, platform kompatibilitás
+2. JAVASLATOK (max 600 szó): Prioritizált javítási terv
+
+FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással - a "results" tömbben oldalanként egy elem, az oldal "id" értékével:
+{{"results": [{{"id": 1, "summary": "...", "recommendations": "..."}}]}}
+
+Adatok (oldalanként, "---" sorral elválasztva):
+"""
+
+# Válasz felezésénél keresett természetes töréspontok, prioritási sorrendben (kisbetűsen)
+BREAK_WORDS = ('javaslatok', 'recommendations', 'ajánlások', '2.', 'következtetések')
+
+
+def _build_break_words_automaton():
+    """A BREAK_WORDS Aho-Corasick automatája - None, ha a pyahocorasick nem elérhető"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in BREAK_WORDS:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_BREAK_WORDS_AUTOMATON = _build_break_words_automaton()
+
+
+def _first_break_positions(text: str) -> Dict[str, int]:
+    """Minden töréspont szó első előfordulása a kisbetűs szövegben - automatával egyetlen bejárás"""
+    if _BREAK_WORDS_AUTOMATON is None:
+        return {word: text.find(word) for word in BREAK_WORDS}
+    
+    positions = {}
+    for end, word in _BREAK_WORDS_AUTOMATON.iter(text):
+        if word not in positions:
+            positions[word] = end - len(word) + 1
+            if len(positions) == len(BREAK_WORDS):
+                break
+    return positions
+
+# Ekkora audit JSON fájltól olvas az orjson memory-mapped fájlból (kisebb fájlnál a sima olvasás gyorsabb)
+MMAP_MIN_BYTES = 1024 * 1024
+
+# Párhuzamos (async) generálás alapértelmezett percenkénti kérés limitje
+DEFAULT_QPM = 500
+
+# Generált összefoglalók cache-e: ugyanarra a kompakt adatra nem fut újra az API hívás
+SUMMARY_CACHE_DIR = ".ai_summary_cache"
+SUMMARY_CACHE_TTL = 7 * 24 * 3600  # 7 nap
+
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> None:
+    """A .env fájl megkeresése és betöltése - processzenként csak egyszer fut le"""
     load_dotenv()
+
+
+def get_openai_api_key():
+    """Biztonságos API kulcs lekérés Streamlit függőségek nélkül - a kulcsot mindig a környezetből olvassa"""
+    _load_dotenv_once()
     return os.getenv("OPENAI_API_KEY")
 
+def _dumps_compact(data: Any) -> str:
+    """Tömör (szóköz nélküli) JSON a prompthoz - orjson-nal, ha elérhető, a stdlib json ugyanezt a formát adja"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # pl. nem támogatott típus - a stdlib json dönt
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads(content):
+    """JSON parse orjson-nal, ha elérhető - amit az orjson elutasít (pl. NaN), azt a stdlib json dönti el"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    return json.loads(content)
+
+
+def _load_json_file(json_file_path: str) -> Any:
+    """JSON fájl betöltése bináris olvasással (orjson esetén dekódolás nélkül) - nagy fájlnál
+    az orjson közvetlenül a memóriába leképezett fájlt olvassa, külön bytes másolat nélkül"""
+    with open(json_file_path, 'rb') as f:
+        if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                try:
+                    return orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    pass  # pl. NaN - a stdlib json dönt
+        return _loads(f.read())
+
+
+def _schema_count(schema: Dict[str, Any]) -> int:
+    """Schema elemek száma - a count típusonkénti szótár vagy egyetlen szám is lehet"""
+    count = schema.get("count", 0)
+    return sum(count.values()) if isinstance(count, dict) else (count or 0)
+
 class AISummaryGenerator:
     """
     OpenAI API-val történő összefoglaló és javaslat generálás - TURBÓZOTT VERZIÓ
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, enable_cache: bool = True):
         """
         Inicializálja az AI Summary Generator-t
         
         Args:
             api_key: OpenAI API kulcs (ha nincs megadva, környezetből veszi)
+            enable_cache: Generált összefoglalók cache-elése a kompakt adatok hash-e alapján
         """
         self.api_key = api_key or get_openai_api_key()
         if not self.api_key:
             raise ValueError("OpenAI API kulcs szükséges. Állítsd be a OPENAI_API_KEY environment változót.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # Keep-alive kapcsolat pool - a TCP/TLS kézfogás csak az első hívásnál fut
+        self.client = OpenAI(
+            api_key=self.api_key,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+                timeout=60
+            )
+        )
+        self.model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+        self.cache_manager = CacheManager(SUMMARY_CACHE_DIR) if enable_cache else None
     
     def generate_summary_and_recommendations(self, json_data: Dict[str, Any]) -> Tuple[str, str]:
         """
@@ -41,75 +261,274 @@ class AISummaryGenerator:
             Tuple[str, str]: (összefoglaló, javaslatok)
         """
         try:
-            # Kompakt adatok kinyerése a token limit miatt
-            compact_data = self._create_compact_analysis(json_data)
-            
-            # Rövid prompt a token limit betartásához
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Te egy GEO (Generative Engine Optimization) szakértő vagy. KRITIKUS: Válaszolj CSAK valid JSON formátumban: {\"summary\": \"...\", \"recommendations\": \"...\"}"
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"""GEO audit eredmények elemzése:
-
-1. ÖSSZEFOGLALÓ (max 600 szó): AI readiness score, meta adatok, schema, tartalom, platform kompatibilitás
-2. JAVASLATOK (max 600 szó): Prioritizált javítási terv
-
-Adatok:
-{json.dumps(compact_data, ensure_ascii=False)}
-
-FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
-{{"summary": "...", "recommendations": "..."}}"""
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000  # Biztonságos token limit
-            )
-            
-            # Válasz feldolgozása
-            ai_response = response.choices[0].message.content.strip()
-            logger.info(f"OpenAI válasz első 200 karakter: {ai_response[:200]}...")
+            # A streamelt válasz összefűzése, majd feldolgozása
+            return self._process_response("".join(self.generate_summary_and_recommendations_stream(json_data)))[0]
+                
+        except Exception as e:
+            logger.error(f"Hiba az AI összefoglaló generálása során: {str(e)}")
+            return self._error_result()
+    
+    def generate_summary_and_recommendations_stream(self, json_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Streamelt generálás - a nyers (JSON) válasz darabjai azonnal, ahogy megérkeznek
+        
+        Args:
+            json_data: Az elemzés eredményét tartalmazó JSON adatok
             
-            # Tisztítás
-            cleaned_response = ai_response
+        Yields:
+            str: A válasz következő darabja (cache találatnál a teljes válasz egyben)
             
-            # Markdown code block eltávolítása
-            if "```json" in cleaned_response:
-                cleaned_response = cleaned_response.split("```json")[-1].split("```")[0].strip()
-            elif "```" in cleaned_response:
-                parts = cleaned_response.split("```")
-                if len(parts) >= 2:
-                    cleaned_response = parts[1].strip()
+        Raises:
+            Exception: API hiba esetén - a hibaszövegek a nem streamelt változatban vannak
+        """
+        # Kompakt adatok kinyerése a token limit miatt
+        compact_data = self._create_compact_analysis(json_data)
+        
+        cache_key = self._get_cache_key(compact_data)
+        cached = self._get_cached_summary(cache_key)
+        if cached:
+            summary, recommendations = cached
+            yield json.dumps({"summary": summary, "recommendations": recommendations}, ensure_ascii=False)
+            return
+        
+        # OpenAI API hívás - stream=True, az első token után már jön a válasz
+        chunks = []
+        finish_reason = None
+        response = self.client.chat.completions.create(
+            messages=self._build_messages(compact_data),
+            stream=True,
+            **self._chat_params()
+        )
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            content = choice.delta.content
+            if content:
+                chunks.append(content)
+                yield content
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        # A teljes válasz feldolgozása - cache-be csak a sikeresen parse-olt, nem levágott válasz kerül
+        result, parsed = self._process_response("".join(chunks))
+        if parsed and finish_reason == "stop":
+            self._set_cached_summary(cache_key, result)
+    
+    async def generate_summary_and_recommendations_async(self, json_data: Dict[str, Any],
+                                                         aclient: AsyncOpenAI) -> Tuple[str, str]:
+        """
+        Async változat - a várakozás alatt a többi kérés is futhat
+        
+        Args:
+            json_data: Az elemzés eredményét tartalmazó JSON adatok
+            aclient: A generate_batch által megosztott AsyncOpenAI kliens
             
-            cleaned_response = cleaned_response.strip()
-            if cleaned_response.startswith("json"):
-                cleaned_response = cleaned_response[4:].strip()
+        Returns:
+            Tuple[str, str]: (összefoglaló, javaslatok)
+        """
+        try:
+            compact_data = self._create_compact_analysis(json_data)
             
-            logger.info(f"Tisztított válasz első 200 karakter: {cleaned_response[:200]}...")
+            cache_key = self._get_cache_key(compact_data)
+            cached = self._get_cached_summary(cache_key)
+            if cached:
+                return cached
             
-            try:
-                # JSON parsing
-                parsed_response = json.loads(cleaned_response)
-                summary = parsed_response.get("summary", "Nem sikerült generálni az összefoglalót.")
-                recommendations = parsed_response.get("recommendations", "Nem sikerült generálni a javaslatokat.")
-
-                return summary, recommendations
-                
-            except json.JSONDecodeError as e:
-                # Ha nem valid JSON, próbáljuk szétválasztani manuálisan
-                logger.warning(f"AI válasz nem valid JSON ({e}), manuális feldolgozás...")
-                logger.warning(f"Problémás JSON: {cleaned_response[:500]}...")
-                return self._parse_ai_response_manually(ai_response)
+            response = await aclient.chat.completions.create(
+                messages=self._build_messages(compact_data),
+                **self._chat_params()
+            )
+            choice = response.choices[0]
+            result, parsed = self._process_response(choice.message.content)
+            if parsed and choice.finish_reason == "stop":
+                self._set_cached_summary(cache_key, result)
+            return result
                 
         except Exception as e:
             logger.error(f"Hiba az AI összefoglaló generálása során: {str(e)}")
-            error_summary = "Hiba történt az AI összefoglaló generálása során. Kérlek, ellenőrizd az OpenAI API kulcsot és próbáld újra."
-            error_recommendations = "Az AI javaslatok nem elérhetők. Manuálisan ellenőrizd az eredményeket és készíts optimalizálási tervet."
-            return error_summary, error_recommendations
+            return self._error_result()
+    
+    async def generate_batch(self, json_datas: List[Dict[str, Any]], qpm: int = DEFAULT_QPM) -> List[Tuple[str, str]]:
+        """
+        Több elemzés összefoglalója párhuzamos API hívásokkal
+        
+        Args:
+            json_datas: Elemzési eredmények listája
+            qpm: Percenkénti kérés limit - ebből számolódik az egyidejű kérések száma
+            
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        if not json_datas:
+            return []
+        
+        semaphore = asyncio.Semaphore(max(1, qpm // 60))
+        
+        # Az async kliens a futó event loop-hoz kötődik, ezért hívásonként készül és záródik
+        async with AsyncOpenAI(api_key=self.api_key) as aclient:
+            async def bounded(json_data):
+                async with semaphore:
+                    return await self.generate_summary_and_recommendations_async(json_data, aclient)
+            
+            return list(await asyncio.gather(*(bounded(json_data) for json_data in json_datas)))
+    
+    def generate_many(self, json_datas: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Több elemzés összefoglalója úgy, hogy egy kérés több oldalt is tartalmaz
+        
+        Args:
+            json_datas: Elemzési eredmények listája
+            
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        compacts = [self._create_compact_analysis(json_data) for json_data in json_datas]
+        
+        # Cache találatok előbb - csak a hiányzó oldalak kerülnek a közös kérésekbe
+        results = [self._get_cached_summary(self._get_cache_key(compact)) for compact in compacts]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        for start in range(0, len(pending), PACKED_MAX_ITEMS):
+            group = pending[start:start + PACKED_MAX_ITEMS]
+            packed = self._generate_packed([compacts[i] for i in group]) if len(group) > 1 else {}
+            for item_id, i in enumerate(group, 1):
+                # Egyelemű csoport, hiányzó vagy hibás elem: egyenkénti hívás
+                results[i] = packed.get(item_id) or self.generate_summary_and_recommendations(json_datas[i])
+        
+        return results
+    
+    def _generate_packed(self, compacts: List[Dict[str, Any]]) -> Dict[int, Tuple[str, str]]:
+        """
+        Egyetlen chat completion több oldalra - id -> (összefoglaló, javaslatok), hiba esetén üres.
+        A teljes (nem levágott) válasz elemei oldalanként a cache-be kerülnek, ugyanazzal a kulccsal,
+        mint az egyenkénti generálásnál
+        """
+        count = len(compacts)
+        content = PACKED_PROMPT_PREFIX.format(count=count) + "\n---\n".join(
+            _dumps_compact({"id": item_id, "adatok": compact}) for item_id, compact in enumerate(compacts, 1)
+        )
+        chat_params = self._chat_params()
+        chat_params["max_tokens"] *= count
+        chat_params["response_format"] = PACKED_RESPONSE_FORMAT
+        
+        try:
+            # Streamelt hívás: a 60 mp-es HTTP timeout így darabonként érvényes, nem a (többszörös
+            # max_tokens miatt) hosszú teljes generálásra
+            response = self.client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": content}
+                ],
+                stream=True,
+                **chat_params
+            )
+            chunks = []
+            finish_reason = None
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.delta.content:
+                    chunks.append(choice.delta.content)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+            
+            parsed_response = _loads("".join(chunks))
+            items = parsed_response.get("results") if isinstance(parsed_response, dict) else parsed_response
+        except Exception as e:
+            logger.warning(f"Közös (több oldalas) AI válasz hiba, egyenkénti feldolgozás: {str(e)}")
+            return {}
+        
+        if not isinstance(items, list):
+            logger.warning("A közös AI válasz nem a várt JSON tömb, egyenkénti feldolgozás...")
+            return {}
+        
+        # Az id alapján párosítunk, így a sorrendcsere vagy egy kimaradt oldal sem keveri össze az eredményeket
+        packed = {}
+        for item in items:
+            if (isinstance(item, dict) and isinstance(item.get("id"), int) and 1 <= item["id"] <= count and
+                    item.get("summary") and item.get("recommendations")):
+                packed[item["id"]] = (item["summary"], item["recommendations"])
+                if finish_reason == "stop":
+                    self._set_cached_summary(self._get_cache_key(compacts[item["id"] - 1]), packed[item["id"]])
+        return packed
+    
+    def _build_messages(self, compact_data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Chat üzenetek összeállítása - rövid prompt a token limit betartásához, az adatok a végén"""
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": USER_PROMPT_PREFIX + _dumps_compact(compact_data)}
+        ]
+    
+    def _chat_params(self) -> Dict[str, Any]:
+        """Chat completion paraméterek - a szinkron és az async hívás is ezeket használja"""
+        return {
+            "model": self.model,
+            "temperature": 0.7,
+            "max_tokens": 2000,  # Biztonságos token limit
+            "response_format": RESPONSE_FORMAT  # A válasz garantáltan a SUMMARY_SCHEMA szerinti objektum
+        }
+    
+    def _process_response(self, ai_response: str) -> Tuple[Tuple[str, str], bool]:
+        """
+        AI válasz tisztítása és feldolgozása - JSON, vagy ha az nem valid, manuális szétválasztás
+        
+        Returns:
+            Tuple[Tuple[str, str], bool]: ((összefoglaló, javaslatok), True, ha a válasz valid JSON
+                objektum volt mindkét mezővel - a manuális szétválasztás és a hibaüzenet nem cache-elhető)
+        """
+        ai_response = ai_response.strip()
+        logger.info(f"OpenAI válasz első 200 karakter: {ai_response[:200]}...")
+        
+        try:
+            # A sémás válasz közvetlenül parse-olható, markdown tisztítás nélkül
+            parsed_response = _loads(ai_response)
+            if not isinstance(parsed_response, dict):
+                raise json.JSONDecodeError("A válasz nem JSON objektum", ai_response, 0)
+            summary = parsed_response.get("summary", "Nem sikerült generálni az összefoglalót.")
+            recommendations = parsed_response.get("recommendations", "Nem sikerült generálni a javaslatokat.")
+            parsed = bool(parsed_response.get("summary")) and bool(parsed_response.get("recommendations"))
+
+            return (summary, recommendations), parsed
+            
+        except json.JSONDecodeError as e:
+            # Csak csonka (max_tokens-nél megszakadt) válasznál fordulhat elő
+            logger.warning(f"AI válasz nem valid JSON ({e})")
+            logger.warning(f"Problémás JSON: {ai_response[:500]}...")
+            if not MANUAL_PARSE_FALLBACK:
+                return self._error_result(), False
+            return self._parse_ai_response_manually(ai_response), False
+    
+    def _get_cache_key(self, compact_data: Dict[str, Any]) -> str:
+        """Cache kulcs: BLAKE2b a chat paraméterekből, a prompt szövegekből és a kompakt adatokból"""
+        key_string = json.dumps({"params": self._chat_params(), "prompts": [SYSTEM_PROMPT, USER_PROMPT_PREFIX],
+                                 "data": compact_data}, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(key_string.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _get_cached_summary(self, cache_key: str) -> Optional[Tuple[str, str]]:
+        """Cache-elt (összefoglaló, javaslatok) pár, ha van"""
+        if not self.cache_manager:
+            return None
+        cached = self.cache_manager.get_cached_result(cache_key)
+        if not cached:
+            return None
+        return cached.get("summary"), cached.get("recommendations")
+    
+    def _set_cached_summary(self, cache_key: str, result: Tuple[str, str]) -> None:
+        """Generált összefoglaló mentése a cache-be"""
+        if self.cache_manager:
+            summary, recommendations = result
+            self.cache_manager.set_cached_result(
+                cache_key, {"summary": summary, "recommendations": recommendations}, ttl=SUMMARY_CACHE_TTL
+            )
+    
+    @staticmethod
+    def _error_result() -> Tuple[str, str]:
+        """Hibaüzenet pár API vagy feldolgozási hiba esetén"""
+        error_summary = "Hiba történt az AI összefoglaló generálása során. Kérlek, ellenőrizd az OpenAI API kulcsot és próbáld újra."
+        error_recommendations = "Az AI javaslatok nem elérhetők. Manuálisan ellenőrizd az eredményeket és készíts optimalizálási tervet."
+        return error_summary, error_recommendations
     
     def _create_compact_analysis(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -124,48 +543,55 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
             else:
                 results = [data] if isinstance(data, dict) else []
             
-            # Biztonságos szűrés
-            valid_results = []
-            for r in results:
-                if isinstance(r, dict) and 'url' in r:
-                    valid_results.append(r)
-            
-            if not valid_results:
-                return {"error": "Nincs elemzendő adat"}
-            
             compact = {
                 "summary": {
-                    "urls_count": len(valid_results),
-                    "urls": [r.get("url", "N/A")[:50] for r in valid_results[:3]]  # Max 3 URL, rövidítve
+                    "urls_count": 0,
+                    "urls": []
                 },
                 "scores": [],
                 "key_issues": [],
                 "platforms": {}
             }
             
-            # Minden URL-hez kompakt adatok
-            for result in valid_results[:2]:  # Max 2 URL a token limit miatt
+            # Egyetlen menet: szűrés, számlálás, az első 3 URL és az első 2 eredmény kompakt adatai -
+            # a többi érvényes eredményt csak megszámoljuk, köztes lista nélkül
+            urls_count = 0
+            platform_totals = {}  # platform -> (pontszám összeg, darab), futó átlaghoz
+            for result in results:
+                if not isinstance(result, dict) or 'url' not in result:
+                    continue  # Biztonságos szűrés
+                
+                urls_count += 1
+                if urls_count <= 3:  # Max 3 URL, rövidítve
+                    compact["summary"]["urls"].append(result.get("url", "N/A")[:50])
+                if urls_count > 2:  # Max 2 URL a token limit miatt
+                    continue
+                
                 url = result.get("url", "Unknown")[:30]  # Rövidített URL
                 
+                # Az al-szótárak egyszer kerülnek kikeresésre - "or {}": hiányzó vagy null szekció esetén
+                # sem dől el az egész kompakt elemzés, és nem készül felesleges üres szótár
+                meta = result.get("meta_and_headings") or {}
+                readability = (result.get("content_quality") or {}).get("readability") or {}
                 url_data = {
                     "url": url,
                     "ai_score": result.get("ai_readiness_score", 0),
-                    "meta_title_ok": bool(result.get("meta_and_headings", {}).get("title_optimal")),
-                    "meta_desc_ok": bool(result.get("meta_and_headings", {}).get("description_optimal")),
-                    "schema_count": sum(result.get("schema", {}).get("count", {}).values()) if isinstance(result.get("schema", {}).get("count"), dict) else result.get("schema", {}).get("count", 0),
-                    "word_count": result.get("content_quality", {}).get("readability", {}).get("word_count", 0),
-                    "mobile_ok": bool(result.get("mobile_friendly", {}).get("has_viewport")),
+                    "meta_title_ok": bool(meta.get("title_optimal")),
+                    "meta_desc_ok": bool(meta.get("description_optimal")),
+                    "schema_count": _schema_count(result.get("schema") or {}),
+                    "word_count": readability.get("word_count", 0),
+                    "mobile_ok": bool((result.get("mobile_friendly") or {}).get("has_viewport")),
                 }
                 
                 # Platform pontszámok
-                platforms = result.get("platform_analysis", {})
+                platforms = result.get("platform_analysis") or {}
                 if platforms and not platforms.get("error"):
-                    for platform in ["chatgpt", "claude", "gemini", "bing_chat"]:
-                        if platform in platforms:
-                            score = platforms[platform].get("compatibility_score", 0)
-                            if platform not in compact["platforms"]:
-                                compact["platforms"][platform] = []
-                            compact["platforms"][platform].append(score)
+                    for platform in COMPACT_PLATFORMS:
+                        platform_data = platforms.get(platform)
+                        if platform_data is not None:
+                            score = platform_data.get("compatibility_score", 0)
+                            total, count = platform_totals.get(platform, (0, 0))
+                            platform_totals[platform] = (total + score, count + 1)
                 
                 compact["scores"].append(url_data)
                 
@@ -187,10 +613,13 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
                         "issues": issues[:3]  # Max 3 probléma
                     })
             
+            if not urls_count:
+                return {"error": "Nincs elemzendő adat"}
+            compact["summary"]["urls_count"] = urls_count
+            
             # Platform átlagok
-            for platform, scores in compact["platforms"].items():
-                if scores:
-                    compact["platforms"][platform] = round(sum(scores) / len(scores), 1)
+            compact["platforms"] = {platform: round(total / count, 1)
+                                    for platform, (total, count) in platform_totals.items()}
             
             return compact
             
@@ -198,333 +627,33 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
             logger.error(f"Hiba a kompakt adatok kinyerése során: {str(e)}")
             return {"error": "Adatfeldolgozási hiba"}
 
-    def _extract_structured_analysis(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Intelligens adatkinyerés és strukturálás - TELJES adathalmaz feldolgozása
-        Prioritizálja és strukturálja az adatokat az AI számára
-        """
-        try:
-            # Ha van results mező, azt használjuk, egyébként az egész data-t
-            if isinstance(data, dict) and 'results' in data:
-                results = data.get('results', [])
-            elif isinstance(data, list):
-                results = data
-            else:
-                results = [data] if isinstance(data, dict) else []
-            
-            # Szűrjük ki a hibás eredményeket - biztonságos ellenőrzés
-            valid_results = []
-            for r in results:
-                if isinstance(r, dict) and 'error' not in r and 'url' in r:
-                    valid_results.append(r)
-            
-            if not valid_results:
-                # Ha nincs valid results, próbáljuk az eredeti data-t
-                if isinstance(data, dict) and 'url' in data:
-                    valid_results = [data]
-                else:
-                    return {"error": "Nincs érvényes elemzési eredmény"}
-            
-            # Strukturált adatok összeállítása
-            structured_data = {
-                "overview": {
-                    "total_urls": len(valid_results),
-                    "analysis_date": data.get("analysis_date", "N/A"),
-                    "urls_analyzed": [r.get("url", "N/A") for r in valid_results]
-                },
-                "scores": {},
-                "technical_seo": {},
-                "content_quality": {},
-                "ai_metrics": {},
-                "platform_compatibility": {},
-                "schema_analysis": {},
-                "performance": {},
-                "critical_issues": [],
-                "quick_wins": [],
-                "detailed_results": []
-            }
-            
-            # Minden URL részletes feldolgozása
-            for result in valid_results:
-                url = result.get("url", "Unknown")
-                
-                # AI Readiness Score
-                ai_score = result.get("ai_readiness_score", 0)
-                
-                # Részletes eredmény struktúra
-                detailed = {
-                    "url": url,
-                    "ai_readiness_score": ai_score,
-                    "ai_level": self._get_ai_level(ai_score)
-                }
-                
-                # Meta adatok
-                meta = result.get("meta_and_headings", {})
-                detailed["meta"] = {
-                    "title": {
-                        "exists": bool(meta.get("title")),
-                        "length": meta.get("title_length", 0),
-                        "optimal": meta.get("title_optimal", False)
-                    },
-                    "description": {
-                        "exists": bool(meta.get("description")),
-                        "length": meta.get("description_length", 0),
-                        "optimal": meta.get("description_optimal", False)
-                    },
-                    "headings": meta.get("headings", {}),
-                    "h1_count": meta.get("h1_count", 0),
-                    "heading_hierarchy_valid": meta.get("heading_hierarchy_valid", False),
-                    "og_tags": meta.get("has_og_tags", False),
-                    "twitter_card": meta.get("has_twitter_card", False)
-                }
-                
-                # Schema elemzés
-                schema = result.get("schema", {})
-                detailed["schema"] = {
-                    "count": sum(schema.get("count", {}).values()) if isinstance(schema.get("count"), dict) else schema.get("count", 0),
-                    "types": list(schema.get("count", {}).keys()) if isinstance(schema.get("count"), dict) else [],
-                    "has_breadcrumbs": schema.get("has_breadcrumbs", False),
-                    "has_search_action": schema.get("has_search_action", False),
-                    "validation_status": schema.get("validation_status", "standard"),
-                    "google_validation": schema.get("google_validation", {}),
-                    "completeness_score": schema.get("schema_completeness_score", 0),
-                    "effectiveness": schema.get("effectiveness_analysis", {})
-                }
-                
-                # AI metrikák
-                ai_metrics = result.get("ai_metrics", {})
-                ai_summary = result.get("ai_metrics_summary", {})
-                detailed["ai_metrics"] = {
-                    "weighted_average": ai_summary.get("weighted_average", 0),
-                    "individual_scores": ai_summary.get("individual_scores", {}),
-                    "level": ai_summary.get("level", "Unknown")
-                }
-                
-                # Tartalom minőség
-                content = result.get("content_quality", {})
-                if content and not content.get("error"):
-                    detailed["content"] = {
-                        "overall_score": content.get("overall_quality_score", 0),
-                        "word_count": content.get("readability", {}).get("word_count", 0),
-                        "readability_score": content.get("readability", {}).get("readability_score", 0),
-                        "vocabulary_richness": content.get("keyword_analysis", {}).get("vocabulary_richness", 0),
-                        "depth_score": content.get("content_depth", {}).get("depth_score", 0),
-                        "authority_score": content.get("authority_signals", {}).get("authority_score", 0),
-                        "semantic_score": content.get("semantic_richness", {}).get("semantic_score", 0)
-                    }
-                
-                # Platform kompatibilitás
-                platforms = result.get("platform_analysis", {})
-                if platforms and not platforms.get("error"):
-                    platform_scores = {}
-                    for platform_name, platform_data in platforms.items():
-                        if platform_name != "summary" and isinstance(platform_data, dict):
-                            platform_scores[platform_name] = {
-                                "compatibility_score": platform_data.get("compatibility_score", 0),
-                                "hybrid_score": platform_data.get("hybrid_score", 0),
-                                "ai_score": platform_data.get("ai_score", 0),
-                                "optimization_level": platform_data.get("optimization_level", "N/A"),
-                                "ai_enhanced": platform_data.get("ai_enhanced", False)
-                            }
-                    detailed["platforms"] = platform_scores
-                
-                # AI Content Evaluation (Enhanced)
-                ai_eval = result.get("ai_content_evaluation", {})
-                if ai_eval and not ai_eval.get("error"):
-                    detailed["ai_evaluation"] = {
-                        "overall_score": ai_eval.get("overall_ai_score", 0),
-                        "platform_scores": ai_eval.get("ai_quality_scores", {}),
-                        "has_evaluation": True
-                    }
-                
-                # PageSpeed
-                psi = result.get("pagespeed_insights", {})
-                if psi:
-                    detailed["performance"] = {
-                        "mobile": psi.get("mobile", {}),
-                        "desktop": psi.get("desktop", {})
-                    }
-                
-                # Technikai SEO
-                detailed["technical"] = {
-                    "robots_allowed": result.get("robots_txt", {}).get("can_fetch", False),
-                    "sitemap_exists": result.get("sitemap", {}).get("exists", False),
-                    "mobile_viewport": result.get("mobile_friendly", {}).get("has_viewport", False),
-                    "responsive_images": result.get("mobile_friendly", {}).get("responsive_images", False),
-                    "html_size_kb": result.get("html_size_kb", 0)
-                }
-                
-                # Kritikus problémák azonosítása
-                if ai_score < 40:
-                    structured_data["critical_issues"].append({
-                        "url": url,
-                        "score": ai_score,
-                        "main_issues": self._identify_main_issues(detailed)
-                    })
-                
-                # Quick wins azonosítása
-                quick_wins = self._identify_quick_wins(detailed)
-                if quick_wins:
-                    structured_data["quick_wins"].extend(quick_wins)
-                
-                # Részletes eredmény hozzáadása
-                structured_data["detailed_results"].append(detailed)
-            
-            # Összesített statisztikák számítása
-            if valid_results:
-                all_scores = [r.get("ai_readiness_score", 0) for r in valid_results]
-                structured_data["scores"] = {
-                    "average_ai_readiness": sum(all_scores) / len(all_scores),
-                    "min_score": min(all_scores),
-                    "max_score": max(all_scores),
-                    "excellent_count": len([s for s in all_scores if s >= 85]),
-                    "good_count": len([s for s in all_scores if 60 <= s < 85]),
-                    "average_count": len([s for s in all_scores if 40 <= s < 60]),
-                    "poor_count": len([s for s in all_scores if s < 40])
-                }
-                
-                # Platform átlagok
-                platform_averages = {}
-                platform_names = ["chatgpt", "claude", "gemini", "bing_chat"]
-                for platform in platform_names:
-                    scores = []
-                    for r in structured_data["detailed_results"]:
-                        if "platforms" in r and platform in r["platforms"]:
-                            scores.append(r["platforms"][platform]["compatibility_score"])
-                    if scores:
-                        platform_averages[platform] = sum(scores) / len(scores)
-                
-                structured_data["platform_compatibility"] = platform_averages
-            
-            return structured_data
-            
-        except Exception as e:
-            logger.error(f"Hiba a strukturált adatok kinyerése során: {str(e)}")
-            # Fallback: eredeti adat visszaadása
-            return data
-    
-    def _get_ai_level(self, score: float) -> str:
-        """AI readiness szint meghatározása"""
-        if score >= 85:
-            return "Kiváló"
-        elif score >= 60:
-            return "Jó"
-        elif score >= 40:
-            return "Közepes"
-        else:
-            return "Fejlesztendő"
-    
-    def _identify_main_issues(self, detailed: Dict) -> List[str]:
-        """Fő problémák azonosítása"""
-        issues = []
-        
-        # Meta problémák
-        if not detailed.get("meta", {}).get("title", {}).get("optimal"):
-            issues.append("Title tag nem optimális")
-        if not detailed.get("meta", {}).get("description", {}).get("optimal"):
-            issues.append("Meta description hiányzik vagy nem optimális")
-        
-        # Schema problémák
-        if detailed.get("schema", {}).get("count", 0) == 0:
-            issues.append("Nincs Schema.org markup")
-        
-        # Tartalom problémák
-        if detailed.get("content", {}).get("word_count", 0) < 300:
-            issues.append("Kevés tartalom")
-        
-        # Technikai problémák
-        if not detailed.get("technical", {}).get("mobile_viewport"):
-            issues.append("Nincs mobile viewport")
-        
-        return issues[:5]  # Max 5 fő probléma
-    
-    def _identify_quick_wins(self, detailed: Dict) -> List[Dict]:
-        """Gyors nyerések azonosítása"""
-        quick_wins = []
-        url = detailed.get("url", "")
-        
-        # Title optimalizálás
-        title_data = detailed.get("meta", {}).get("title", {})
-        if title_data.get("exists") and not title_data.get("optimal"):
-            if title_data.get("length", 0) < 30 or title_data.get("length", 0) > 60:
-                quick_wins.append({
-                    "url": url,
-                    "type": "Title optimalizálás",
-                    "current": f"{title_data.get('length', 0)} karakter",
-                    "target": "30-60 karakter",
-                    "impact": "Magas",
-                    "effort": "Alacsony"
-                })
-        
-        # Meta description
-        desc_data = detailed.get("meta", {}).get("description", {})
-        if not desc_data.get("exists") or desc_data.get("length", 0) < 120:
-            quick_wins.append({
-                "url": url,
-                "type": "Meta description hozzáadása",
-                "current": f"{desc_data.get('length', 0)} karakter",
-                "target": "120-160 karakter",
-                "impact": "Közepes",
-                "effort": "Alacsony"
-            })
-        
-        # Schema.org
-        if detailed.get("schema", {}).get("count", 0) == 0:
-            quick_wins.append({
-                "url": url,
-                "type": "Schema.org markup hozzáadása",
-                "current": "0 schema elem",
-                "target": "Minimum FAQ vagy Article schema",
-                "impact": "Magas",
-                "effort": "Közepes"
-            })
-        
-        return quick_wins
-    
     def _parse_ai_response_manually(self, response: str) -> Tuple[str, str]:
         """
         Manuális feldolgozás, ha az AI válasz nem valid JSON
         """
         try:
-            import re
-            
             logger.info(f"Manuális parsing indítása, válasz hossza: {len(response)} karakter")
             logger.info(f"Válasz első 300 karakter: {response[:300]}...")
             
             # Tisztítás - JSON és markdown elemek eltávolítása
             cleaned = response
-            cleaned = re.sub(r'```json|```', '', cleaned)
-            cleaned = re.sub(r'^json\s*', '', cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r'[{}"]', '', cleaned)  # JSON karakterek eltávolítása
-            
-            # Különböző pattern-ek próbálása
-            patterns = [
-                # JSON-szerű szerkezet
-                (r'summary[:\s]+(.*?)(?:recommendations|javaslat)', r'recommendations[:\s]+(.*)'),
-                # Számozott lista
-                (r'1\.\s*(?:összefoglaló|summary)[:\s]*(.*?)(?:2\.|recommendations|javaslat)', 
-                 r'2\.\s*(?:javaslatok|recommendations)[:\s]*(.*)'),
-                # Nagybetűs címek
-                (r'ÖSSZEFOGLALÓ[:\s]*(.*?)(?:JAVASLATOK|RECOMMENDATIONS)', 
-                 r'(?:JAVASLATOK|RECOMMENDATIONS)[:\s]*(.*)'),
-                # Természetes szöveg
-                (r'(?:összefoglaló|summary)[:\s]*(.*?)(?:javaslatok|recommendations|ajánlások)', 
-                 r'(?:javaslatok|recommendations|ajánlások)[:\s]*(.*)'),
-            ]
+            cleaned = CODE_FENCE_RE.sub('', cleaned)
+            cleaned = JSON_PREFIX_RE.sub('', cleaned)
+            cleaned = JSON_CHARS_RE.sub('', cleaned)  # JSON karakterek eltávolítása
             
             summary = None
             recommendations = None
             
-            # Próbáljuk meg az összes pattern-t
-            for sum_pattern, rec_pattern in patterns:
+            # Különböző pattern-ek próbálása
+            for sum_pattern, rec_pattern in SECTION_PATTERNS:
                 if not summary:
-                    sum_match = re.search(sum_pattern, cleaned, re.IGNORECASE | re.DOTALL)
+                    sum_match = sum_pattern.search(cleaned)
                     if sum_match:
                         summary = sum_match.group(1).strip()
                         logger.info(f"Summary pattern találat, hossz: {len(summary)}")
                 
                 if not recommendations:
-                    rec_match = re.search(rec_pattern, cleaned, re.IGNORECASE | re.DOTALL)
+                    rec_match = rec_pattern.search(cleaned)
                     if rec_match:
                         recommendations = rec_match.group(1).strip()
                         logger.info(f"Recommendations pattern találat, hossz: {len(recommendations)}")
@@ -537,11 +666,11 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
                 logger.info("Pattern matching sikertelen, válasz felezése...")
                 
                 # Keresünk természetes töréspontokat
-                break_words = ['javaslatok', 'recommendations', 'ajánlások', '2.', 'következtetések']
                 break_point = len(cleaned) // 2
+                positions = _first_break_positions(cleaned.lower())
                 
-                for word in break_words:
-                    pos = cleaned.lower().find(word.lower())
+                for word in BREAK_WORDS:
+                    pos = positions.get(word, -1)
                     if pos > 100:  # Minimum 100 karakter legyen az első részben
                         break_point = pos
                         break
@@ -553,14 +682,14 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
             
             # További tisztítás
             if summary:
-                summary = re.sub(r'\s+', ' ', summary)  # Többszörös szóközök
-                summary = re.sub(r'^[:\-\s]*', '', summary)  # Kezdő karakterek
+                summary = WHITESPACE_RE.sub(' ', summary)  # Többszörös szóközök
+                summary = LEADING_PUNCT_RE.sub('', summary)  # Kezdő karakterek
                 
             if recommendations:
-                recommendations = re.sub(r'\s+', ' ', recommendations)  # Többszörös szóközök
-                recommendations = re.sub(r'^[:\-\s]*', '', recommendations)  # Kezdő karakterek
+                recommendations = WHITESPACE_RE.sub(' ', recommendations)  # Többszörös szóközök
+                recommendations = LEADING_PUNCT_RE.sub('', recommendations)  # Kezdő karakterek
                 # Javaslatok szó eltávolítása az elejéről
-                recommendations = re.sub(r'^(?:javaslatok|recommendations|ajánlások)[:\s]*', '', recommendations, flags=re.IGNORECASE)
+                recommendations = RECOMMENDATIONS_PREFIX_RE.sub('', recommendations)
             
             # Végső ellenőrzés
             if not summary or len(summary) < 50:
@@ -586,6 +715,12 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával, semmi mással:
                 "Automatikus javaslat generálás sikertelen. Manuális elemzés szükséges."
             )
 
+@lru_cache(maxsize=1)
+def _default_generator() -> AISummaryGenerator:
+    """Modul szintű, újrahasznosított generátor - egy OpenAI kliens és kapcsolat pool minden fájlhoz"""
+    return AISummaryGenerator()
+
+
 def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
     """
     Segédfüggvény: AI összefoglaló generálása JSON fájlból
@@ -597,10 +732,9 @@ def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
         Tuple[str, str]: (összefoglaló, javaslatok)
     """
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json_file(json_file_path)
         
-        generator = AISummaryGenerator()
+        generator = _default_generator()
         return generator.generate_summary_and_recommendations(data)
         
     except FileNotFoundError:
@@ -610,6 +744,41 @@ def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
         logger.error(f"Hiba a fájl feldolgozása során: {str(e)}")
         return "Hiba történt a fájl feldolgozása során.", "Ellenőrizd a fájl formátumát és próbáld újra."
 
+def generate_ai_summaries_from_files(json_file_paths: List[str], qpm: int = DEFAULT_QPM) -> List[Tuple[str, str]]:
+    """
+    Segédfüggvény: AI összefoglalók több JSON fájlból, párhuzamos (async) API hívásokkal
+    
+    Args:
+        json_file_paths: A JSON fájlok elérési útjai
+        qpm: Percenkénti kérés limit
+        
+    Returns:
+        List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+    """
+    results = [None] * len(json_file_paths)
+    pending, datas = [], []
+    for i, json_file_path in enumerate(json_file_paths):
+        try:
+            datas.append(_load_json_file(json_file_path))
+            pending.append(i)
+        except FileNotFoundError:
+            logger.error(f"JSON fájl nem található: {json_file_path}")
+            results[i] = ("A JSON fájl nem található.", "Kérlek, futtasd le előbb az elemzést.")
+        except Exception as e:
+            logger.error(f"Hiba a fájl feldolgozása során: {str(e)}")
+            results[i] = ("Hiba történt a fájl feldolgozása során.", "Ellenőrizd a fájl formátumát és próbáld újra.")
+    
+    if datas:
+        try:
+            summaries = asyncio.run(_default_generator().generate_batch(datas, qpm))
+        except Exception as e:
+            logger.error(f"Hiba a fájlok feldolgozása során: {str(e)}")
+            summaries = [("Hiba történt a fájl feldolgozása során.", "Ellenőrizd a fájl formátumát és próbáld újra.")] * len(datas)
+        for i, result in zip(pending, summaries):
+            results[i] = result
+    
+    return results
+
 if __name__ == "__main__":
     # Teszt futtatás
     test_data = {
@@ -1,34 +1,364 @@
+import asyncio
+import hashlib
 import json
-from openai import OpenAI
-from typing import Dict, Any, Optional, Tuple, List, Union
+import time
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+import httpx
+from openai import OpenAI, AsyncOpenAI, BadRequestError, RateLimitError, APITimeoutError, APIConnectionError
+from typing import Dict, Any, Optional, Tuple, List, Union, AsyncIterator, Iterable
 import os
 from dotenv import load_dotenv
 import logging
+import re
+import numpy as np
+from cache_manager import CacheManager
 
 logger = logging.getLogger(__name__)
 
+# Párhuzamos (async) generálás: egyidejű kérések alapértelmezett száma
+MAX_CONCURRENT_REQUESTS = 10
+
+# Megosztott HTTP kapcsolat pool: minden generátor példány ugyanazt a keep-alive klienst használja,
+# így a kérésenkénti példányosítás sem fizet újra TCP/TLS kézfogást
+HTTP_POOL_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+HTTP_TIMEOUT = 60.0
+
+# Átmeneti API hibák újrapróbálása: legfeljebb MAX_RETRIES kísérlet, exponenciális visszalépés
+# (vagy a szerver Retry-After fejléce), MAX_RETRY_DELAY másodperces felső korláttal. Az SDK kliensek
+# max_retries=0-val készülnek, így az újrapróbálás csak itt történik
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError)
+MAX_RETRIES = 3
+MAX_RETRY_DELAY = 30.0
+
+# Generált összefoglalók cache-e: ugyanarra a kompakt összefoglalóra nem fut újra az API hívás
+SUMMARY_CACHE_DIR = ".ai_summary_cache"
+SUMMARY_CACHE_TTL = 7 * 24 * 3600  # 7 nap
+
+# A prompt adatrészének becsült token korlátja - felette ultra kompakt összefoglaló megy
+PROMPT_TOKEN_LIMIT = 4000
+# Egy további URL bejegyzés minimális tömör JSON hossza az URL és a problémák szövege nélkül:
+# {"url":"","score":0,"main_issues":[]} + elválasztó vessző
+ADDITIONAL_URL_MIN_CHARS = 38
+# Manuális parse: ennél nem hosszabb összefoglaló esetén a teljes válasz kerül visszaadásra
+MANUAL_SUMMARY_MIN_CHARS = 50
+
+# Alapértelmezett modellek - a strukturált JSON -> két szöveges mező feladathoz a gpt-4o-mini elég,
+# a korábbi "gpt-4-turbo-preview" a model paraméterrel továbbra is választható
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_FALLBACK_MODEL = "gpt-4o"
+# Alacsonyabb temperature: determinisztikusabb, könnyebben feldolgozható JSON
+SUMMARY_TEMPERATURE = 0.3
+
+# Elsődleges (JSON módú) és tartalék kérés promptjai - a statikus részek egyszer készülnek,
+# hívásonként csak a felhasználói sablon .format-ja fut
+PRIMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """Te egy GEO (Generative Engine Optimization) szakértő vagy.
+Válaszolj CSAK valid JSON formátumban a megadott struktúrában."""
+}
+PRIMARY_USER_TEMPLATE = """Elemezd ezt a GEO audit eredményt és készíts részletes összefoglalót és javaslatokat.
+
+AUDIT EREDMÉNYEK:
+{json_str}
+
+Készíts:
+1. Részletes ÖSSZEFOGLALÓ (600-800 szó), amely tartalmazza:
+   - AI Readiness Score értékelése (átlag: {avg_score}/100)
+   - URL-enkénti teljesítmény
+   - Főbb problémák gyakorisága
+   - Platform kompatibilitás
+   - Technikai hiányosságok
+
+2. Konkrét JAVASLATOK (600-800 szó), prioritizálva:
+   - Kritikus javítások
+   - Quick wins (gyors eredmények)
+   - Platform-specifikus optimalizációk
+   - Várható score javulás
+
+Válaszolj PONTOSAN ebben a JSON struktúrában:
+{{
+    "summary": "Ide írd a részletes összefoglalót. Használj konkrét számokat, százalékokat. Említsd meg az átlagos AI score-t, a legjobb és legrosszabb teljesítményű URL-eket, a leggyakoribb problémákat.",
+    "recommendations": "Ide írd a prioritizált javaslatokat. Kezdd a kritikus problémákkal, majd a quick wins lehetőségekkel. Adj konkrét megoldásokat és becsüld meg a várható javulást."
+}}"""
+
+FALLBACK_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """Te egy GEO szakértő vagy. 
+KRITIKUS: Válaszod CSAK valid JSON lehet {"summary": "...", "recommendations": "..."} formátumban!
+Ne használj markdown-t, csak tiszta JSON-t!"""
+}
+FALLBACK_USER_TEMPLATE = """GEO audit elemzése:
+
+{json_str}
+
+Átlag AI Score: {avg_score}/100
+URL-ek száma: {urls_analyzed}
+
+Top problémák: {top_issues}
+
+FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
+{{"summary": "részletes összefoglaló szöveg", "recommendations": "konkrét javaslatok szövege"}}"""
+
+# Válasz feldolgozás: markdown kódblokk tartalma, illetve az első {...} blokk
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+_JSON_BLOCK_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Fallback (AI nélküli) javaslatok statikus részei - hívásonként nem épülnek újra
+FALLBACK_CRITICAL_RECOMMENDATIONS = (
+    "KRITIKUS PRIORITÁS:",
+    "1. Schema.org markup azonnali implementálása minden oldalon",
+    "2. Meta title és description optimalizálás (30-60 és 120-160 karakter)",
+    "3. Mobile viewport meta tag hozzáadása",
+)
+FALLBACK_ISSUE_SOLUTIONS = {
+    "Title nem optimális": "Optimalizáld a title tageket 30-60 karakterre, használj kulcsszavakat",
+    "Description hiányzik/rossz": "Adj hozzá meta description-t 120-160 karakterrel",
+    "Nincs Schema markup": "Implementálj FAQ vagy Article schema-t JSON-LD formátumban",
+    "Kevés tartalom": "Bővítsd a tartalmat minimum 300-500 szóra",
+    "Nincs sitemap": "Hozz létre XML sitemap-et és add hozzá a robots.txt-hez",
+    "Nincs mobile viewport": "Add hozzá: <meta name='viewport' content='width=device-width, initial-scale=1'>",
+    "H1 probléma": "Használj pontosan 1 db H1 címsort oldalanként"
+}
+FALLBACK_PLATFORM_RECOMMENDATIONS = (
+    "\n\nPlatform-specifikus optimalizáció:",
+    "- ChatGPT: Strukturált tartalom, Q&A formátum, lépésenkénti útmutatók",
+    "- Claude: Részletes kontextus, hivatkozások, hosszú formátumú tartalom",
+    "- Gemini: Friss információk, multimédia, schema markup",
+    "- Bing Chat: Külső források, időszerű tartalom, fact-checking",
+)
+
+# Manuális feldolgozás: (összefoglaló, javaslatok) minta párok, egyszer fordítva
+MANUAL_SECTION_PATTERNS = [
+    (re.compile(sum_pattern, re.IGNORECASE | re.DOTALL), re.compile(rec_pattern, re.IGNORECASE | re.DOTALL))
+    for sum_pattern, rec_pattern in [
+        # JSON-szerű struktúra idézőjelek nélkül
+        (r'summary\s*:\s*(.*?)(?:recommendations|javaslat|$)', r'recommendations\s*:\s*(.*)'),
+        # Számozott lista
+        (r'1\.\s*(?:ÖSSZEFOGLALÓ|Summary|Összefoglaló)[:\s]*(.*?)(?:2\.|recommendations|javaslat|$)', 
+         r'2\.\s*(?:JAVASLATOK|Recommendations|Javaslatok)[:\s]*(.*)'),
+        # Markdown fejlécek
+        (r'#+\s*(?:Összefoglaló|Summary|ÖSSZEFOGLALÓ)(.*?)(?:#+\s*(?:Javaslatok|Recommendations)|$)', 
+         r'#+\s*(?:Javaslatok|Recommendations|JAVASLATOK)(.*)'),
+        # Nagybetűs elválasztók
+        (r'ÖSSZEFOGLALÓ[:\s]*(.*?)(?:JAVASLATOK|RECOMMENDATIONS|$)', 
+         r'(?:JAVASLATOK|RECOMMENDATIONS)[:\s]*(.*)'),
+        # Bármilyen szöveg "summary" és "recommendations" között
+        (r'(?:summary|összefoglaló)[:\s]*(.*?)(?:recommendations|javaslatok|ajánlások)', 
+         r'(?:recommendations|javaslatok|ajánlások)[:\s]*(.*)'),
+    ]
+]
+
+# Manuális szakasz tisztítás regexei
+SUMMARY_PREFIX_RE = re.compile(r'^(summary|összefoglaló)[:\s]*', re.IGNORECASE)
+RECOMMENDATIONS_PREFIX_RE = re.compile(r'^(recommendations|javaslatok|ajánlások)[:\s]*', re.IGNORECASE)
+
 def get_openai_api_key():
     """Biztonságos API kulcs lekérés Streamlit függőségek nélkül"""
     load_dotenv()
     return os.getenv("OPENAI_API_KEY")
 
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Várakozás újrapróbálás előtt: a szerver Retry-After fejléce, különben exponenciális visszalépés"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_RETRY_DELAY)
+        except ValueError:
+            pass
+    return min(2 ** attempt, MAX_RETRY_DELAY)
+
+def _call_with_retries(func, *args, **kwargs):
+    """Szinkron API hívás (pl. Batch API végpontok) átmeneti hibáknál újrapróbálással"""
+    for attempt in range(MAX_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            delay = _retry_delay(e, attempt)
+            logger.warning(f"Átmeneti API hiba ({type(e).__name__}), újrapróbálás {delay:.1f} mp múlva...")
+            time.sleep(delay)
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """Folyamat szintű, lustán létrehozott HTTP kliens - szálbiztos, a példányok közösen használják, és a
+    folyamat végéig nyitva marad (az élő generátorok mind ezt tartják, ezért nem zárható le közben)"""
+    return httpx.Client(limits=HTTP_POOL_LIMITS, timeout=HTTP_TIMEOUT)
+
+def _schema_count(result: Dict[str, Any]) -> Union[int, float]:
+    """Schema elemek száma - a count típusonkénti szótár vagy egyetlen szám is lehet"""
+    count = result.get("schema", {}).get("count")
+    if isinstance(count, dict):
+        return sum(count.values())
+    return count if isinstance(count, (int, float)) else 0
+
+def _clean_manual_section(text: str, prefix_re: re.Pattern) -> str:
+    """
+    Manuálisan kinyert szakasz tisztítása: JSON maradványok, escape-elt whitespace,
+    markdown jelek és a szakaszcím eltávolítása, szóközök összevonása
+    """
+    # JSON maradványok - karakterenként str.replace: a magyar (nem ASCII) szövegen a str.translate
+    # karakterenkénti táblakeresésre vált, a replace viszont memchr alapú keresés
+    text = text.replace('"', '').replace('{', '').replace('}', '').replace("'", "")
+    text = text.replace('\\n', '\n').replace('\\t', ' ')
+    # Markdown
+    text = text.replace('#', '').replace('*', '').replace('`', '')
+    # Többszörös szóközök - egyetlen split/join menet a regex helyett (a szélső whitespace is eltűnik,
+    # így a szakaszcím akkor is levágható, ha előtte markdown jel állt)
+    text = ' '.join(text.split())
+    # Címek és kulcsszavak eltávolítása
+    text = prefix_re.sub('', text)
+    return text.strip()
+
+def _dumps_compact(data: Any) -> str:
+    """Tömör JSON szöveg a prompthoz - a modellnek a behúzás csak felesleges token"""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def _loads_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """JSON objektum betöltése; None, ha a szöveg nem (objektum) JSON"""
+    try:
+        # strict=False: a stringekben lévő nyers sortöréseket is elfogadja
+        parsed = json.loads(text, strict=False)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+def _parse_json_response(text: str) -> Dict[str, Any]:
+    """
+    Tűrő JSON parse: közvetlen json.loads, majd a kódblokk, végül az első {...} blokk
+    
+    Args:
+        text: A modell válasza
+        
+    Returns:
+        Dict[str, Any]: A válasz JSON objektuma
+        
+    Raises:
+        ValueError: Ha egyik lépés sem ad JSON objektumot
+    """
+    # Közvetlen parse - JSON módban ez a szokásos eset, regex nélkül
+    parsed = _loads_json_object(text)
+    
+    # Markdown kódblokk tartalma
+    if parsed is None:
+        fence_match = _FENCE_RE.search(text)
+        if fence_match:
+            parsed = _loads_json_object(fence_match.group(1))
+    
+    # Az első {...} blokk (pl. magyarázó szöveg a JSON körül)
+    if parsed is None:
+        block_match = _JSON_BLOCK_RE.search(text)
+        if block_match:
+            parsed = _loads_json_object(block_match.group(0))
+    
+    if parsed is not None:
+        return parsed
+    raise ValueError("A válasz nem tartalmaz értelmezhető JSON objektumot")
+
+class _StreamingJsonFields:
+    """
+    Inkrementális JSON parser streamelt válaszhoz: a kért legfelső szintű string mezőket
+    a záró idézőjel megérkezésekor adja vissza, a már feldolgozott szöveget nem olvassa újra
+    """
+    
+    def __init__(self, fields: Iterable[str]):
+        self.pending = set(fields)
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._after_colon = False
+        self._key: Optional[str] = None
+        self._chars: List[str] = []
+    
+    @property
+    def text(self) -> str:
+        """Az eddig beérkezett teljes válasz"""
+        return "".join(self._parts)
+    
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Új válaszrészlet feldolgozása
+        
+        Args:
+            text: A stream következő darabja
+            
+        Returns:
+            List[Tuple[str, str]]: Az ebben a darabban lezárult (mező, érték) párok
+        """
+        self._parts.append(text)
+        completed = []
+        for char in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(completed)
+                    continue
+                self._chars.append(char)
+            elif char == '"':
+                self._in_string = True
+                self._chars = []
+            elif char in '{[':
+                self._depth += 1
+                self._after_colon = False
+            elif char in '}]':
+                self._depth -= 1
+            elif char == ':':
+                self._after_colon = True
+            elif char == ',':
+                self._after_colon = False
+        return completed
+    
+    def _close_string(self, completed: List[Tuple[str, str]]) -> None:
+        """Lezárult string: kulcs, vagy - kettőspont után - egy mező értéke"""
+        raw = "".join(self._chars)
+        if not self._after_colon:
+            self._key = raw
+            return
+        
+        self._after_colon = False
+        if self._depth == 1 and self._key in self.pending:
+            self.pending.discard(self._key)
+            completed.append((self._key, json.loads(f'"{raw}"', strict=False)))
+
 class AISummaryGenerator:
     """
     OpenAI API-val történő összefoglaló és javaslat generálás - OPTIMALIZÁLT VERZIÓ
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, enable_cache: bool = True,
+                 model: str = DEFAULT_MODEL, fallback_model: str = DEFAULT_FALLBACK_MODEL):
         """
         Inicializálja az AI Summary Generator-t
         
         Args:
             api_key: OpenAI API kulcs (ha nincs megadva, környezetből veszi)
+            enable_cache: Generált összefoglalók cache-elése a kompakt összefoglaló hash-e alapján
+            model: Az elsődleges (JSON módú) kérés modellje
+            fallback_model: A tartalék kérés modellje, ha a JSON mód nem támogatott
         """
         self.api_key = api_key or get_openai_api_key()
         if not self.api_key:
             raise ValueError("OpenAI API kulcs szükséges. Állítsd be a OPENAI_API_KEY environment változót.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, max_retries=0, http_client=_shared_http_client())
+        self.model = model
+        self.fallback_model = fallback_model
+        
+        self.cache_manager = CacheManager(SUMMARY_CACHE_DIR) if enable_cache else None
+        
+        # JSON mód (response_format) támogatás: None = még nem derült ki
+        self._supports_json_mode: Optional[bool] = None
+        
+        # Beküldött batch-ek: batch_id -> {custom_id: (URL, cache kulcs)}
+        self._batch_urls: Dict[str, Dict[str, Tuple[str, str]]] = {}
     
     def generate_summary_and_recommendations(self, json_data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Tuple[str, str]:
         """
@@ -40,198 +370,543 @@ class AISummaryGenerator:
         Returns:
             Tuple[str, str]: (összefoglaló, javaslatok)
         """
+        analysis_summary = None
         try:
-            # Kompakt, de teljes körű adatkinyerés
-            analysis_summary = self._create_compact_summary(json_data)
-            
-            # Token méret ellenőrzés és optimalizálás
-            json_str = json.dumps(analysis_summary, indent=2, ensure_ascii=False)
-            estimated_tokens = len(json_str) // 4  # Durva becslés
+            analysis_summary, json_str = self._prepare_summary(json_data)
+            primary_request, fallback_request = self._build_requests(analysis_summary, json_str)
             
-            # Ha túl nagy, további tömörítés
-            if estimated_tokens > 4000:
-                analysis_summary = self._ultra_compact_summary(analysis_summary)
-                json_str = json.dumps(analysis_summary, indent=2, ensure_ascii=False)
+            cache_key = self._get_cache_key(primary_request, fallback_request)
+            cached = self._get_cached_summary(cache_key)
+            if cached:
+                return cached
             
             # OpenAI API hívás - ERŐS JSON KÉNYSZERÍTÉS
-            try:
-                # Először próbáljuk response_format paraméterrel (GPT-4-turbo támogatja)
-                response = self.client.chat.completions.create(
-                    model="gpt-4-turbo-preview",  # vagy "gpt-4-1106-preview"
-                    response_format={"type": "json_object"},  # JSON mód
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": """Te egy GEO (Generative Engine Optimization) szakértő vagy.
-Válaszolj CSAK valid JSON formátumban a megadott struktúrában."""
-                        },
-                        {
-                            "role": "user", 
-                            "content": f"""Elemezd ezt a GEO audit eredményt és készíts részletes összefoglalót és javaslatokat.
-
-AUDIT EREDMÉNYEK:
-{json_str}
-
-Készíts:
-1. Részletes ÖSSZEFOGLALÓ (600-800 szó), amely tartalmazza:
-   - AI Readiness Score értékelése (átlag: {analysis_summary.get('overview', {}).get('avg_ai_score', 0)}/100)
-   - URL-enkénti teljesítmény
-   - Főbb problémák gyakorisága
-   - Platform kompatibilitás
-   - Technikai hiányosságok
-
-2. Konkrét JAVASLATOK (600-800 szó), prioritizálva:
-   - Kritikus javítások
-   - Quick wins (gyors eredmények)
-   - Platform-specifikus optimalizációk
-   - Várható score javulás
-
-Válaszolj PONTOSAN ebben a JSON struktúrában:
-{{
-    "summary": "Ide írd a részletes összefoglalót. Használj konkrét számokat, százalékokat. Említsd meg az átlagos AI score-t, a legjobb és legrosszabb teljesítményű URL-eket, a leggyakoribb problémákat.",
-    "recommendations": "Ide írd a prioritizált javaslatokat. Kezdd a kritikus problémákkal, majd a quick wins lehetőségekkel. Adj konkrét megoldásokat és becsüld meg a várható javulást."
-}}"""
-                        }
-                    ],
-                    temperature=0.7,
-                    max_tokens=2500
-                )
-            except Exception as e:
-                # Ha nem támogatja a response_format-ot, használjuk a standard módot
-                logger.info(f"JSON response format nem támogatott, standard mód: {e}")
-                response = self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": """Te egy GEO szakértő vagy. 
-KRITIKUS: Válaszod CSAK valid JSON lehet {"summary": "...", "recommendations": "..."} formátumban!
-Ne használj markdown-t, csak tiszta JSON-t!"""
-                        },
-                        {
-                            "role": "user", 
-                            "content": f"""GEO audit elemzése:
-
-{json_str}
-
-Átlag AI Score: {analysis_summary.get('overview', {}).get('avg_ai_score', 0)}/100
-URL-ek száma: {analysis_summary.get('overview', {}).get('urls_analyzed', 0)}
-
-Top problémák: {', '.join([f"{issue[0]} ({issue[1]}x)" for issue in analysis_summary.get('common_issues', [])[:3]])}
-
-FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
-{{"summary": "részletes összefoglaló szöveg", "recommendations": "konkrét javaslatok szövege"}}"""
-                        }
-                    ],
-                    temperature=0.7,
-                    max_tokens=2500
-                )
+            response = self._create_completion(primary_request, fallback_request)
             
-            # Válasz feldolgozása - ROBUSZTUSABB JSON PARSING
-            ai_response = response.choices[0].message.content.strip()
-            logger.info(f"OpenAI válasz első 200 karakter: {ai_response[:200]}...")
+            result, parsed = self._process_response(response.choices[0].message.content)
+            if parsed:
+                self._set_cached_summary(cache_key, result)
+            return result
+                
+        except Exception as e:
+            logger.error(f"Hiba az AI összefoglaló generálása során: {str(e)}")
+            # Negyedik próbálkozás: fallback summary generálás
+            logger.info("Fallback summary generálás...")
+            return self._fallback_result(analysis_summary)
+    
+    def generate_summaries_concurrent(self, audits: List[Union[Dict[str, Any], List[Dict[str, Any]]]],
+                                      concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Tuple[str, str]]:
+        """
+        Több audit összefoglalója párhuzamos API hívásokkal - szinkron wrapper a generate_many köré
+        
+        Args:
+            audits: Audit eredmények listája (mindegyik dict vagy list, mint a generate_summary_and_recommendations-nél)
+            concurrency: Egyidejűleg futó kérések maximális száma
             
-            # Tisztítsuk meg a választ minden felesleges karaktertől
-            cleaned_response = ai_response
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        return asyncio.run(self.generate_many(audits, concurrency))
+    
+    async def generate_many(self, audits: List[Union[Dict[str, Any], List[Dict[str, Any]]]],
+                            concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Tuple[str, str]]:
+        """
+        Több audit összefoglalója AsyncOpenAI-val - a hálózati várakozások átfednek,
+        a szemafor a párhuzamos kérések számát (RPM/TPM limit) korlátozza
+        
+        Args:
+            audits: Audit eredmények listája
+            concurrency: Egyidejűleg futó kérések maximális száma
             
-            # Markdown code block eltávolítása
-            if "```json" in cleaned_response:
-                cleaned_response = cleaned_response.split("```json")[-1].split("```")[0].strip()
-            elif "```" in cleaned_response:
-                parts = cleaned_response.split("```")
-                if len(parts) >= 2:
-                    cleaned_response = parts[1].strip()
+        Returns:
+            List[Tuple[str, str]]: (összefoglaló, javaslatok) párok a bemenet sorrendjében
+        """
+        if not audits:
+            return []
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Az async kliens a futó event loop-hoz kötődik, ezért hívásonként készül és záródik
+        async with AsyncOpenAI(api_key=self.api_key, max_retries=0) as aclient:
+            async def bounded(audit):
+                async with semaphore:
+                    return await self.agenerate_summary_and_recommendations(audit, aclient)
             
-            # További tisztítás
-            cleaned_response = cleaned_response.strip()
-            if cleaned_response.startswith("json"):
-                cleaned_response = cleaned_response[4:].strip()
+            return list(await asyncio.gather(*(bounded(audit) for audit in audits)))
+    
+    async def agenerate_summary_and_recommendations(self, json_data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                                    aclient: AsyncOpenAI) -> Tuple[str, str]:
+        """
+        Async változat - ugyanaz a prompt, modell fallback és válasz feldolgozás, mint a szinkron hívásnál
+        
+        Args:
+            json_data: Az elemzés eredményét tartalmazó JSON adatok (dict vagy list)
+            aclient: A generate_many által megosztott AsyncOpenAI kliens
             
-            logger.info(f"Tisztított válasz első 200 karakter: {cleaned_response[:200]}...")
+        Returns:
+            Tuple[str, str]: (összefoglaló, javaslatok)
+        """
+        analysis_summary = None
+        try:
+            analysis_summary, json_str = self._prepare_summary(json_data)
+            primary_request, fallback_request = self._build_requests(analysis_summary, json_str)
+            
+            cache_key = self._get_cache_key(primary_request, fallback_request)
+            cached = self._get_cached_summary(cache_key)
+            if cached:
+                return cached
+            
+            response = await self._acreate_completion(aclient, primary_request, fallback_request)
+            
+            result, parsed = self._process_response(response.choices[0].message.content)
+            if parsed:
+                self._set_cached_summary(cache_key, result)
+            return result
             
-            # Első próbálkozás: tiszta JSON parse
-            try:
-                parsed_response = json.loads(cleaned_response)
-                summary = parsed_response.get("summary", "")
-                recommendations = parsed_response.get("recommendations", "")
-                
-                # Ellenőrizzük, hogy valódi tartalom-e
-                if summary and recommendations and len(summary) > 100 and len(recommendations) > 100:
-                    logger.info("JSON parsing sikeres")
-                    return summary, recommendations
-                else:
-                    logger.warning("JSON parse sikeres de túl rövid vagy üres a tartalom")
-                    raise ValueError("Incomplete response")
-                    
-            except (json.JSONDecodeError, ValueError) as e:
-                logger.warning(f"JSON parse hiba: {e}")
-                logger.warning(f"Problémás JSON: {cleaned_response[:500]}...")
-                
-                # Második próbálkozás: regex alapú kinyerés
-                import re
-                
-                # Többféle pattern próbálkozás
-                patterns = [
-                    # Standard JSON
-                    (r'"summary"\s*:\s*"([^"]*(?:\\.[^"]*)*)"', r'"recommendations"\s*:\s*"([^"]*(?:\\.[^"]*)*)"'),
-                    # Aposztróf
-                    (r"'summary'\s*:\s*'([^']*(?:\\.[^']*)*)'", r"'recommendations'\s*:\s*'([^']*(?:\\.[^']*)*)'"),
-                    # Többsoros JSON
-                    (r'"summary"\s*:\s*"([\s\S]*?)"(?:,\s*"recommendations")', r'"recommendations"\s*:\s*"([\s\S]*?)"(?:\s*\})'),
-                ]
-                
-                summary = None
-                recommendations = None
-                
-                for sum_pattern, rec_pattern in patterns:
-                    if not summary:
-                        sum_match = re.search(sum_pattern, cleaned_response, re.DOTALL)
-                        if sum_match:
-                            summary = sum_match.group(1)
-                            # Escape karakterek kezelése
-                            summary = summary.replace('\\n', '\n').replace('\\"', '"').replace('\\t', '    ')
-                    
-                    if not recommendations:
-                        rec_match = re.search(rec_pattern, cleaned_response, re.DOTALL)
-                        if rec_match:
-                            recommendations = rec_match.group(1)
-                            recommendations = recommendations.replace('\\n', '\n').replace('\\"', '"').replace('\\t', '    ')
-                
-                if summary and recommendations:
-                    logger.info("Regex alapú JSON kinyerés sikeres")
-                    return summary, recommendations
-                
-                # Harmadik próbálkozás: manuális feldolgozás
-                logger.warning("Regex parsing sikertelen, manuális feldolgozás...")
-                return self._parse_ai_response_manually(ai_response)
-                
         except Exception as e:
             logger.error(f"Hiba az AI összefoglaló generálása során: {str(e)}")
-            # Negyedik próbálkozás: fallback summary generálás
             logger.info("Fallback summary generálás...")
-            return self._fallback_summary_generation(analysis_summary)
-                
+            return self._fallback_result(analysis_summary)
+    
+    async def stream_summary_and_recommendations(self, json_data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                                 aclient: Optional[AsyncOpenAI] = None) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Streamelt generálás: a mezőket akkor adja vissza, amint a válaszban lezárultak, így az
+        összefoglaló már a javaslatok generálása közben megjeleníthető
+        
+        Args:
+            json_data: Az elemzés eredményét tartalmazó JSON adatok (dict vagy list)
+            aclient: Megosztott AsyncOpenAI kliens (ha nincs megadva, a hívás idejére készül egy)
+            
+        Yields:
+            Tuple[str, str]: ("summary", összefoglaló), majd ("recommendations", javaslatok)
+        """
+        if aclient is None:
+            async with AsyncOpenAI(api_key=self.api_key, max_retries=0) as aclient:
+                async for item in self.stream_summary_and_recommendations(json_data, aclient):
+                    yield item
+            return
+        
+        parser = _StreamingJsonFields(("summary", "recommendations"))
+        emitted: Dict[str, str] = {}
+        analysis_summary = None
+        try:
+            analysis_summary, json_str = self._prepare_summary(json_data)
+            primary_request, fallback_request = self._build_requests(analysis_summary, json_str)
+            
+            cache_key = self._get_cache_key(primary_request, fallback_request)
+            cached = self._get_cached_summary(cache_key)
+            if cached:
+                yield "summary", cached[0]
+                yield "recommendations", cached[1]
+                return
+            
+            # Az újrapróbálás a stream megnyitására vonatkozik; a stream közbeni hiba a fallback ágra fut
+            stream = await self._acreate_completion(aclient, primary_request, fallback_request, stream=True)
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for field, value in parser.feed(chunk.choices[0].delta.content or ""):
+                    emitted[field] = value
+                    yield field, value
+            
+            # Ha a válasz nem tiszta JSON volt, a teljes szövegből dolgozunk tovább
+            if len(emitted) == 2:
+                result = (emitted["summary"], emitted["recommendations"])
+                parsed = bool(result[0]) and bool(result[1])
+            else:
+                result, parsed = self._process_response(parser.text)
+            if parsed:
+                self._set_cached_summary(cache_key, result)
+            
         except Exception as e:
-            logger.error(f"Kritikus hiba az AI összefoglaló generálása során: {str(e)}")
+            logger.error(f"Hiba az AI összefoglaló generálása során: {str(e)}")
+            logger.info("Fallback summary generálás...")
+            result = self._fallback_result(analysis_summary)
+        
+        # A még ki nem adott mezők
+        for field, value in zip(("summary", "recommendations"), result):
+            if field not in emitted:
+                yield field, value
+    
+    def generate_summary_batch(self, audits: List[Union[Dict[str, Any], List[Dict[str, Any]]]],
+                               poll_interval: int = 30) -> Dict[str, Tuple[str, str]]:
+        """
+        Nem interaktív (pl. éjszakai) futások: összefoglalók az OpenAI Batch API-n keresztül -
+        fél áron, az interaktív RPM limittől független kvótával
+        
+        Args:
+            audits: Audit eredmények listája
+            poll_interval: Állapot lekérdezések közötti várakozás másodpercben
+            
+        Returns:
+            Dict[str, Tuple[str, str]]: URL -> (összefoglaló, javaslatok)
+        """
+        if not audits:
+            return {}
+        
+        # Cache találatok előbb - csak a hiányzó auditok kerülnek a batch-be
+        # A kulcsok az eredeti listabeli pozícióból készülnek, így a batch válaszok ugyanahhoz az audithoz kerülnek
+        keys = [self._audit_url(audit, index) for index, audit in enumerate(audits)]
+        results = {}
+        pending = []
+        pending_keys = []
+        for key, audit in zip(keys, audits):
+            cached = self._get_cached_summary(self._get_cache_key(*self._build_requests(*self._prepare_summary(audit))))
+            if cached:
+                results[key] = cached
+            else:
+                pending.append(audit)
+                pending_keys.append(key)
+        
+        if pending:
+            try:
+                results.update(self.collect_batch(self.submit_batch(pending, pending_keys), poll_interval))
+            except Exception as e:
+                logger.warning(f"Batch API hiba, szinkron feldolgozás: {str(e)}")
+        
+        # Sikertelen (vagy a batch-ből hiányzó) kérések pótlása szinkron hívással
+        for url, audit in zip(keys, audits):
+            if url not in results:
+                results[url] = self.generate_summary_and_recommendations(audit)
+        
+        return results
+    
+    def submit_batch(self, audits: List[Union[Dict[str, Any], List[Dict[str, Any]]]],
+                     keys: Optional[List[str]] = None) -> str:
+        """
+        Batch kérés beküldése - JSONL feltöltés és batch indítás
+        
+        Args:
+            audits: Audit eredmények listája (azonos kulcsú auditokból csak az első kerül be)
+            keys: Opcionális, az auditokkal párhuzamos eredmény kulcsok (alapértelmezés: URL,
+                ennek hiányában "audit-<pozíció>" az audits listában)
+            
+        Returns:
+            str: A batch azonosítója
+        """
+        lines = []
+        batch_urls = {}
+        if keys is None:
+            keys = [self._audit_url(audit, index) for index, audit in enumerate(audits)]
+        for url, audit in zip(keys, audits):
+            custom_id = self._batch_custom_id(url)
+            if custom_id in batch_urls:
+                continue
+            
+            # A batch-ben nincs modell fallback: a JSON módú kérés megy, hacsak már ki nem derült, hogy nem támogatott
+            primary_request, fallback_request = self._build_requests(*self._prepare_summary(audit))
+            request = fallback_request if self._supports_json_mode is False else primary_request
+            batch_urls[custom_id] = (url, self._get_cache_key(primary_request, fallback_request))
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": request
+            }, ensure_ascii=False))
+        
+        batch_file = _call_with_retries(
+            self.client.files.create,
+            file=("geo_summary_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = _call_with_retries(
+            self.client.batches.create,
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        self._batch_urls[batch.id] = batch_urls
+        logger.info(f"Batch elküldve: {batch.id} ({len(lines)} kérés)")
+        return batch.id
+    
+    def collect_batch(self, batch_id: str, poll_interval: int = 30) -> Dict[str, Tuple[str, str]]:
+        """
+        Batch befejezésének megvárása és az eredmények visszarendezése URL-ekhez
+        
+        Args:
+            batch_id: A submit_batch által visszaadott azonosító
+            poll_interval: Állapot lekérdezések közötti várakozás másodpercben
+            
+        Returns:
+            Dict[str, Tuple[str, str]]: URL -> (összefoglaló, javaslatok); a sikertelen kérések hiányoznak.
+            Más generátor példány által beküldött batch esetén a kulcs a custom_id.
+        """
+        batch = _call_with_retries(self.client.batches.retrieve, batch_id)
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = _call_with_retries(self.client.batches.retrieve, batch_id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"A batch nem fejeződött be sikeresen: {batch_id} ({batch.status})")
+        
+        batch_urls = self._batch_urls.pop(batch_id, {})
+        results = {}
+        for line in _call_with_retries(self.client.files.content, batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            custom_id = item.get("custom_id")
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                logger.error(f"Batch kérés hiba ({custom_id}): {item.get('error')}")
+                continue
             
-            # Végső fallback: legalább alapinformációkat adjunk
+            content = response["body"]["choices"][0]["message"]["content"]
+            result, parsed = self._process_response(content)
+            url, cache_key = batch_urls.get(custom_id, (custom_id, None))
+            if cache_key and parsed:
+                self._set_cached_summary(cache_key, result)
+            results[url] = result
+        
+        return results
+    
+    def _create_completion(self, primary_request: Dict[str, Any], fallback_request: Dict[str, Any], **options):
+        """
+        Chat completion hívás átmeneti hibáknál (rate limit, timeout, kapcsolat) újrapróbálással -
+        a többi hiba (pl. hibás kérés, hitelesítés) azonnal a hívóhoz kerül
+        
+        Args:
+            primary_request: JSON módú elsődleges kérés
+            fallback_request: Tartalék kérés, ha a JSON mód nem támogatott
+            **options: További create paraméterek (pl. stream=True)
+            
+        Returns:
+            A chat completion válasz (vagy stream)
+        """
+        for attempt in range(MAX_RETRIES):
             try:
-                # Ha van analysis_summary, használjuk a fallback generátort
-                if 'analysis_summary' in locals():
-                    return self._fallback_summary_generation(analysis_summary)
-            except:
-                pass
+                if self._supports_json_mode is False:
+                    return self.client.chat.completions.create(**fallback_request, **options)
+                try:
+                    # Először próbáljuk response_format paraméterrel
+                    response = self.client.chat.completions.create(**primary_request, **options)
+                    self._supports_json_mode = True
+                    return response
+                except BadRequestError as e:
+                    # Ha nem támogatja a response_format-ot, használjuk a standard módot
+                    if not self._json_mode_unsupported(e):
+                        raise
+                    return self.client.chat.completions.create(**fallback_request, **options)
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"Átmeneti API hiba ({type(e).__name__}), újrapróbálás {delay:.1f} mp múlva...")
+                time.sleep(delay)
+    
+    async def _acreate_completion(self, aclient: AsyncOpenAI, primary_request: Dict[str, Any],
+                                  fallback_request: Dict[str, Any], **options):
+        """
+        A _create_completion async változata - ugyanaz a JSON mód választás és újrapróbálás
+        
+        Args:
+            aclient: AsyncOpenAI kliens
+            primary_request: JSON módú elsődleges kérés
+            fallback_request: Tartalék kérés, ha a JSON mód nem támogatott
+            **options: További create paraméterek (pl. stream=True)
             
-            # Ha semmi sem működik, általános hibaüzenet
+        Returns:
+            A chat completion válasz (vagy async stream)
+        """
+        for attempt in range(MAX_RETRIES):
+            try:
+                if self._supports_json_mode is False:
+                    return await aclient.chat.completions.create(**fallback_request, **options)
+                try:
+                    response = await aclient.chat.completions.create(**primary_request, **options)
+                    self._supports_json_mode = True
+                    return response
+                except BadRequestError as e:
+                    if not self._json_mode_unsupported(e):
+                        raise
+                    return await aclient.chat.completions.create(**fallback_request, **options)
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"Átmeneti API hiba ({type(e).__name__}), újrapróbálás {delay:.1f} mp múlva...")
+                await asyncio.sleep(delay)
+    
+    def _fallback_result(self, analysis_summary: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        """Fallback összefoglaló - ha a kompakt összefoglaló sem készült el, általános hibaüzenet"""
+        if analysis_summary is None:
             return (
                 "Az AI összefoglaló generálása sikertelen volt. Kérlek ellenőrizd az OpenAI API kulcsot és a kapcsolatot.",
                 "A javaslatok automatikus generálása nem sikerült. Tekintsd át manuálisan az elemzési eredményeket."
             )
+        return self._fallback_summary_generation(analysis_summary)
+    
+    def _json_mode_unsupported(self, error: BadRequestError) -> bool:
+        """
+        A hiba a response_format támogatás hiányát jelzi-e - ha igen, a további hívások
+        egyből a tartalék kérést küldik (nincs újabb próbálkozás a JSON móddal)
+        """
+        if "response_format" not in str(error):
+            return False
+        logger.info(f"JSON response format nem támogatott, standard mód: {error}")
+        self._supports_json_mode = False
+        return True
+    
+    def _get_cache_key(self, primary_request: Dict[str, Any], fallback_request: Dict[str, Any]) -> str:
+        """Cache kulcs: BLAKE2b a két kérésből - a modellt, a prompt szövegeket és a kompakt összefoglalót is lefedi"""
+        key_string = json.dumps([primary_request, fallback_request], sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(key_string.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _get_cached_summary(self, cache_key: str) -> Optional[Tuple[str, str]]:
+        """Cache-elt (összefoglaló, javaslatok) pár, ha van"""
+        if not self.cache_manager:
+            return None
+        cached = self.cache_manager.get_cached_result(cache_key)
+        if not cached:
+            return None
+        return cached.get("summary"), cached.get("recommendations")
+    
+    def _set_cached_summary(self, cache_key: str, result: Tuple[str, str]) -> None:
+        """Generált összefoglaló mentése a cache-be"""
+        if self.cache_manager:
+            summary, recommendations = result
+            self.cache_manager.set_cached_result(
+                cache_key, {"summary": summary, "recommendations": recommendations}, ttl=SUMMARY_CACHE_TTL
+            )
+    
+    @staticmethod
+    def _audit_url(audit: Union[Dict[str, Any], List[Dict[str, Any]]], index: int) -> str:
+        """Az audit azonosító URL-je (lista vagy {"results": [...]} riport esetén az első eredményé)"""
+        if isinstance(audit, dict) and isinstance(audit.get("results"), list):
+            audit = audit["results"]
+        first = audit[0] if isinstance(audit, list) and audit else audit
+        url = first.get("url") if isinstance(first, dict) else None
+        return url or f"audit-{index}"
+    
+    @staticmethod
+    def _batch_custom_id(url: str) -> str:
+        """Batch kérés azonosító - az URL hash-e alapján a válaszok visszarendezhetők"""
+        return "geo-" + hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _prepare_summary(self, json_data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Tuple[Dict[str, Any], str]:
+        """
+        Kompakt összefoglaló és annak JSON szövege, szükség esetén ultra kompakt formában
+        
+        Args:
+            json_data: Az elemzés eredményét tartalmazó JSON adatok (dict vagy list)
+            
+        Returns:
+            Tuple[Dict[str, Any], str]: (összefoglaló, JSON szöveg a prompthoz)
+        """
+        # Kompakt, de teljes körű adatkinyerés
+        analysis_summary, min_chars = self._build_compact_summary(json_data)
+        
+        # Ha már a méret alsó becslése is a korlát felett van, a teljes összefoglaló szerializálása kimarad
+        if min_chars // 4 > PROMPT_TOKEN_LIMIT:
+            analysis_summary = self._ultra_compact_summary(analysis_summary)
+            return analysis_summary, _dumps_compact(analysis_summary)
+        
+        # Token méret ellenőrzés és optimalizálás - a prompt is a tömör (behúzás nélküli) JSON-t kapja,
+        # így egyetlen szerializálás adja a becslést és a küldött szöveget
+        json_str = _dumps_compact(analysis_summary)
+        estimated_tokens = len(json_str) // 4  # Durva becslés
+        
+        # Ha túl nagy, további tömörítés
+        if estimated_tokens > PROMPT_TOKEN_LIMIT:
+            analysis_summary = self._ultra_compact_summary(analysis_summary)
+            json_str = _dumps_compact(analysis_summary)
+        
+        return analysis_summary, json_str
+    
+    def _build_requests(self, analysis_summary: Dict[str, Any], json_str: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Chat completion kérések összeállítása
+        
+        Args:
+            analysis_summary: A _prepare_summary által visszaadott összefoglaló
+            json_str: Az összefoglaló JSON szövege
+            
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: (JSON módú elsődleges kérés, standard módú tartalék kérés)
+        """
+        overview = analysis_summary.get('overview', {})
+        avg_score = overview.get('avg_ai_score', 0)
+        
+        primary_request = {
+            "model": self.model,
+            "response_format": {"type": "json_object"},  # JSON mód
+            "messages": [
+                PRIMARY_SYSTEM_MESSAGE,
+                {"role": "user", "content": PRIMARY_USER_TEMPLATE.format(json_str=json_str, avg_score=avg_score)}
+            ],
+            "temperature": SUMMARY_TEMPERATURE,
+            "max_tokens": 2500
+        }
+        
+        top_issues = ', '.join([f"{issue[0]} ({issue[1]}x)" for issue in analysis_summary.get('common_issues', [])[:3]])
+        fallback_request = {
+            "model": self.fallback_model,
+            "messages": [
+                FALLBACK_SYSTEM_MESSAGE,
+                {"role": "user", "content": FALLBACK_USER_TEMPLATE.format(
+                    json_str=json_str, avg_score=avg_score,
+                    urls_analyzed=overview.get('urls_analyzed', 0), top_issues=top_issues
+                )}
+            ],
+            "temperature": SUMMARY_TEMPERATURE,
+            "max_tokens": 2500
+        }
+        return primary_request, fallback_request
+    
+    def _process_response(self, ai_response: str) -> Tuple[Tuple[str, str], bool]:
+        """
+        AI válasz feldolgozása: tűrő JSON parse, végül manuális szétválasztás
+        
+        Args:
+            ai_response: A modell nyers válasza
+            
+        Returns:
+            Tuple[Tuple[str, str], bool]: ((összefoglaló, javaslatok), True, ha az eredmény a JSON
+                parse-ból jött mindkét mezővel - csak ez cache-elhető, a manuális szétválasztás nem)
+        """
+        ai_response = ai_response.strip()
+        logger.info(f"OpenAI válasz első 200 karakter: {ai_response[:200]}...")
+        
+        try:
+            parsed_response = _parse_json_response(ai_response)
+            summary = parsed_response.get("summary", "")
+            recommendations = parsed_response.get("recommendations", "")
+            
+            if summary and recommendations and isinstance(summary, str) and isinstance(recommendations, str):
+                if len(summary) <= 100 or len(recommendations) <= 100:
+                    logger.warning("JSON parse sikeres, de rövid a tartalom")
+                logger.info("JSON parsing sikeres")
+                return (summary, recommendations), True
+            
+            logger.warning("JSON parse sikeres, de hiányos a tartalom")
+            
+        except ValueError as e:
+            logger.warning(f"JSON parse hiba: {e}")
+            logger.warning(f"Problémás JSON: {ai_response[:500]}...")
+        
+        # Manuális feldolgozás
+        logger.warning("JSON parsing sikertelen, manuális feldolgozás...")
+        return self._parse_ai_response_manually(ai_response), False
     
     def _create_compact_summary(self, data: Union[Dict, List]) -> Dict[str, Any]:
         """
         Kompakt összefoglaló készítése - maximum 4000 token méretű
         """
+        return self._build_compact_summary(data)[0]
+    
+    def _build_compact_summary(self, data: Union[Dict, List]) -> Tuple[Dict[str, Any], int]:
+        """
+        Kompakt összefoglaló a tömör JSON hosszának alsó becslésével együtt - a becslés az URL-ek
+        felvételekor halmozódik, így a korlát feletti méret szerializálás nélkül is kiderül
+        
+        Args:
+            data: Az elemzés eredménye (dict vagy list)
+            
+        Returns:
+            Tuple[Dict[str, Any], int]: (összefoglaló, a tömör JSON szöveg hosszának alsó korlátja)
+        """
         try:
             # Normalizáljuk az adatot - lehet dict vagy list
             if isinstance(data, dict):
@@ -251,69 +926,77 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
             ]
             
             if not valid_results:
-                return {"error": "Nincs érvényes elemzési eredmény"}
+                return {"error": "Nincs érvényes elemzési eredmény"}, 0
+            
+            # Score-ok egy menetben tömbbe - az átlag és a sávok vektorizáltan számolódnak
+            all_scores = [r.get('ai_readiness_score', 0) for r in valid_results]
+            scores = np.fromiter(all_scores, dtype=np.float64, count=len(all_scores))
+            
+            # URL-enkénti problémák és gyors javítások egyszer számolva (részletes URL-ek, további URL-ek, gyakoriság)
+            issues_and_wins = [self._get_issues_and_wins(r) for r in valid_results]
+            all_top_issues = [issues for issues, _ in issues_and_wins]
             
             # Kompakt összefoglaló struktúra
             summary = {
                 "overview": {
                     "urls_analyzed": len(valid_results),
-                    "avg_ai_score": round(sum(r.get('ai_readiness_score', 0) for r in valid_results) / len(valid_results), 1)
+                    "avg_ai_score": round(float(scores.mean()), 1)
                 },
                 "urls": []
             }
             
             # Minden URL kompakt összefoglalója (max 3 URL részletesen)
-            for result in valid_results[:3]:  # Limitáljuk 3 URL-re a méret miatt
-                url_summary = self._extract_url_essentials(result)
+            for result, (top_issues, quick_wins) in zip(valid_results[:3], issues_and_wins):  # Limitáljuk 3 URL-re a méret miatt
+                url_summary = self._extract_url_essentials(result, top_issues, quick_wins)
                 summary["urls"].append(url_summary)
             
             # Ha több mint 3 URL van, csak az alapokat adjuk hozzá
+            # Méret alsó becslés: csak a további URL-ek listája nő az URL-ek számával
+            min_chars = 0
             if len(valid_results) > 3:
                 summary["additional_urls"] = []
-                for result in valid_results[3:]:
+                for result, top_issues in zip(valid_results[3:], all_top_issues[3:]):
+                    url = result.get("url", "N/A")
+                    main_issues = top_issues[:2]  # Csak 2 fő probléma
                     summary["additional_urls"].append({
-                        "url": result.get("url", "N/A"),
+                        "url": url,
                         "score": result.get("ai_readiness_score", 0),
-                        "main_issues": self._get_top_issues(result)[:2]  # Csak 2 fő probléma
+                        "main_issues": main_issues
                     })
+                    min_chars += ADDITIONAL_URL_MIN_CHARS + (len(url) if isinstance(url, str) else 0)
+                    min_chars += sum(len(issue) + 2 for issue in main_issues)
             
-            # Globális statisztikák
-            all_scores = [r.get('ai_readiness_score', 0) for r in valid_results]
+            # Globális statisztikák - min/max az eredeti értékkel (típussal) kerül a promptba
             summary["statistics"] = {
-                "min_score": min(all_scores),
-                "max_score": max(all_scores),
-                "excellent": len([s for s in all_scores if s >= 85]),
-                "good": len([s for s in all_scores if 60 <= s < 85]),
-                "poor": len([s for s in all_scores if s < 40])
+                "min_score": all_scores[int(scores.argmin())],
+                "max_score": all_scores[int(scores.argmax())],
+                "excellent": int((scores >= 85).sum()),
+                "good": int(((scores >= 60) & (scores < 85)).sum()),
+                "poor": int((scores < 40).sum())
             }
             
-            # Top problémák összesítése
-            all_issues = []
-            for r in valid_results:
-                all_issues.extend(self._get_top_issues(r))
-            
-            # Probléma gyakoriság
-            issue_freq = {}
-            for issue in all_issues:
-                issue_freq[issue] = issue_freq.get(issue, 0) + 1
+            # Top 5 leggyakoribb probléma (egyenlő gyakoriságnál az első előfordulás sorrendjében)
+            summary["common_issues"] = Counter(chain.from_iterable(all_top_issues)).most_common(5)
             
-            # Top 5 leggyakoribb probléma
-            summary["common_issues"] = sorted(
-                issue_freq.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:5]
-            
-            return summary
+            return summary, min_chars
             
         except Exception as e:
             logger.error(f"Kompakt összefoglaló készítése sikertelen: {str(e)}")
-            return {"error": str(e)}
+            return {"error": str(e)}, 0
     
-    def _extract_url_essentials(self, result: Dict) -> Dict[str, Any]:
+    def _extract_url_essentials(self, result: Dict, precomputed_issues: Optional[List[str]] = None,
+                                precomputed_wins: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Egy URL lényegi adatainak kinyerése - kompakt formában
+        
+        Args:
+            result: Egy URL elemzési eredménye
+            precomputed_issues: A már kiszámolt top problémák (ha nincs megadva, itt számolódik)
+            precomputed_wins: A már kiszámolt gyors javítások (ha nincs megadva, itt számolódik)
         """
+        if precomputed_issues is None or precomputed_wins is None:
+            precomputed_issues, precomputed_wins = self._get_issues_and_wins(result)
+        
         url = result.get("url", "N/A")
         score = result.get("ai_readiness_score", 0)
         
@@ -327,12 +1010,7 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
         }
         
         # Schema
-        schema = result.get("schema", {})
-        schema_count = 0
-        if isinstance(schema.get("count"), dict):
-            schema_count = sum(schema["count"].values())
-        elif isinstance(schema.get("count"), (int, float)):
-            schema_count = schema["count"]
+        schema_count = _schema_count(result)
         
         # Content
         content = result.get("content_quality", {})
@@ -369,8 +1047,8 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
             "platforms": platform_scores,
             "mobile_perf": perf_mobile,
             "tech_ok": tech_ok,
-            "top_issues": self._get_top_issues(result)[:3],  # Max 3 issue
-            "quick_wins": self._get_quick_wins(result)[:2]   # Max 2 quick win
+            "top_issues": precomputed_issues[:3],  # Max 3 issue
+            "quick_wins": precomputed_wins[:2]   # Max 2 quick win
         }
     
     def _ultra_compact_summary(self, summary: Dict) -> Dict[str, Any]:
@@ -404,27 +1082,46 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
     
     def _get_top_issues(self, result: Dict) -> List[str]:
         """Top problémák azonosítása"""
+        return self._get_issues_and_wins(result)[0]
+    
+    def _get_quick_wins(self, result: Dict) -> List[str]:
+        """Gyors javítások"""
+        return self._get_issues_and_wins(result)[1]
+    
+    def _get_issues_and_wins(self, result: Dict) -> Tuple[List[str], List[str]]:
+        """
+        Top problémák és gyors javítások egyetlen bejárással - a meta, schema és sitemap adatok egyszer olvasódnak
+        
+        Args:
+            result: Egy URL elemzési eredménye
+            
+        Returns:
+            Tuple[List[str], List[str]]: (problémák, max 3 gyors javítás)
+        """
         issues = []
+        wins = []
         
         # Meta
         meta = result.get("meta_and_headings", {})
         if not meta.get("title_optimal"):
             issues.append("Title nem optimális")
+            wins.append("Title tag optimalizálás (30-60 karakter)")
         if not meta.get("description_optimal"):
             issues.append("Description hiányzik/rossz")
+        if not meta.get("description"):
+            wins.append("Meta description hozzáadása")
         if meta.get("h1_count", 0) != 1:
             issues.append(f"H1 probléma ({meta.get('h1_count', 0)} db)")
         
         # Schema
-        schema = result.get("schema", {})
-        schema_count = 0
-        if isinstance(schema.get("count"), dict):
-            schema_count = sum(schema["count"].values())
-        elif isinstance(schema.get("count"), (int, float)):
-            schema_count = schema["count"]
+        schema_count = _schema_count(result)
         
         if schema_count == 0:
             issues.append("Nincs Schema markup")
+            wins.append("FAQ vagy Article Schema hozzáadása")
+        
+        if not meta.get("has_og_tags"):
+            wins.append("Open Graph tagek hozzáadása")
         
         # Content
         content = result.get("content_quality", {})
@@ -438,6 +1135,7 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
             issues.append("Robots.txt tiltás")
         if not result.get("sitemap", {}).get("exists"):
             issues.append("Nincs sitemap")
+            wins.append("XML sitemap létrehozása")
         if not result.get("mobile_friendly", {}).get("has_viewport"):
             issues.append("Nincs mobile viewport")
         
@@ -448,34 +1146,7 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
             if mobile_perf < 50:
                 issues.append(f"Gyenge mobil sebesség ({mobile_perf})")
         
-        return issues
-    
-    def _get_quick_wins(self, result: Dict) -> List[str]:
-        """Gyors javítások"""
-        wins = []
-        
-        meta = result.get("meta_and_headings", {})
-        if not meta.get("title_optimal"):
-            wins.append("Title tag optimalizálás (30-60 karakter)")
-        
-        if not meta.get("description"):
-            wins.append("Meta description hozzáadása")
-        
-        schema = result.get("schema", {})
-        schema_count = 0
-        if isinstance(schema.get("count"), dict):
-            schema_count = sum(schema["count"].values())
-        
-        if schema_count == 0:
-            wins.append("FAQ vagy Article Schema hozzáadása")
-        
-        if not meta.get("has_og_tags"):
-            wins.append("Open Graph tagek hozzáadása")
-        
-        if not result.get("sitemap", {}).get("exists"):
-            wins.append("XML sitemap létrehozása")
-        
-        return wins[:3]  # Max 3
+        return issues, wins[:3]  # Max 3 gyors javítás
     
     def _fallback_summary_generation(self, analysis_summary: Dict) -> Tuple[str, str]:
         """
@@ -541,29 +1212,15 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
             
             # Kritikus javítások
             if avg_score < 40:
-                rec_parts.append("KRITIKUS PRIORITÁS:")
-                rec_parts.append("1. Schema.org markup azonnali implementálása minden oldalon")
-                rec_parts.append("2. Meta title és description optimalizálás (30-60 és 120-160 karakter)")
-                rec_parts.append("3. Mobile viewport meta tag hozzáadása")
+                rec_parts.extend(FALLBACK_CRITICAL_RECOMMENDATIONS)
             
             # Általános javaslatok az issues alapján
             rec_parts.append("\nFőbb teendők a problémák alapján:")
             
-            issue_solutions = {
-                "Title nem optimális": "Optimalizáld a title tageket 30-60 karakterre, használj kulcsszavakat",
-                "Description hiányzik/rossz": "Adj hozzá meta description-t 120-160 karakterrel",
-                "Nincs Schema markup": "Implementálj FAQ vagy Article schema-t JSON-LD formátumban",
-                "Kevés tartalom": "Bővítsd a tartalmat minimum 300-500 szóra",
-                "Nincs sitemap": "Hozz létre XML sitemap-et és add hozzá a robots.txt-hez",
-                "Nincs mobile viewport": "Add hozzá: <meta name='viewport' content='width=device-width, initial-scale=1'>",
-                "H1 probléma": "Használj pontosan 1 db H1 címsort oldalanként"
-            }
-            
-            rec_num = 1
-            for issue, count in issues[:5]:
-                if issue in issue_solutions:
-                    rec_parts.append(f"{rec_num}. {issue_solutions[issue]} (Érint: {count} oldalt)")
-                    rec_num += 1
+            solutions = [(FALLBACK_ISSUE_SOLUTIONS[issue], count) for issue, count in issues[:5]
+                         if issue in FALLBACK_ISSUE_SOLUTIONS]
+            rec_parts.extend(f"{rec_num}. {solution} (Érint: {count} oldalt)"
+                             for rec_num, (solution, count) in enumerate(solutions, 1))
             
             # Quick wins
             if urls and urls[0].get("quick_wins"):
@@ -572,11 +1229,7 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
                     rec_parts.append(f"- {win}")
             
             # Platform-specifikus
-            rec_parts.append("\n\nPlatform-specifikus optimalizáció:")
-            rec_parts.append("- ChatGPT: Strukturált tartalom, Q&A formátum, lépésenkénti útmutatók")
-            rec_parts.append("- Claude: Részletes kontextus, hivatkozások, hosszú formátumú tartalom")
-            rec_parts.append("- Gemini: Friss információk, multimédia, schema markup")
-            rec_parts.append("- Bing Chat: Külső források, időszerű tartalom, fact-checking")
+            rec_parts.extend(FALLBACK_PLATFORM_RECOMMENDATIONS)
             
             # Várható javulás
             improvement = min(100 - avg_score, 30)
@@ -598,41 +1251,21 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
         Robusztus manuális feldolgozás különböző AI válasz formátumokhoz
         """
         try:
-            import re
-            
             logger.info(f"Manuális parsing indítása, válasz hossza: {len(response)} karakter")
             
-            # Különböző elválasztók keresése
-            patterns = [
-                # JSON-szerű struktúra idézőjelek nélkül
-                (r'summary\s*:\s*(.*?)(?:recommendations|javaslat|$)', r'recommendations\s*:\s*(.*)'),
-                # Számozott lista
-                (r'1\.\s*(?:ÖSSZEFOGLALÓ|Summary|Összefoglaló)[:\s]*(.*?)(?:2\.|recommendations|javaslat|$)', 
-                 r'2\.\s*(?:JAVASLATOK|Recommendations|Javaslatok)[:\s]*(.*)'),
-                # Markdown fejlécek
-                (r'#+\s*(?:Összefoglaló|Summary|ÖSSZEFOGLALÓ)(.*?)(?:#+\s*(?:Javaslatok|Recommendations)|$)', 
-                 r'#+\s*(?:Javaslatok|Recommendations|JAVASLATOK)(.*)'),
-                # Nagybetűs elválasztók
-                (r'ÖSSZEFOGLALÓ[:\s]*(.*?)(?:JAVASLATOK|RECOMMENDATIONS|$)', 
-                 r'(?:JAVASLATOK|RECOMMENDATIONS)[:\s]*(.*)'),
-                # Bármilyen szöveg "summary" és "recommendations" között
-                (r'(?:summary|összefoglaló)[:\s]*(.*?)(?:recommendations|javaslatok|ajánlások)', 
-                 r'(?:recommendations|javaslatok|ajánlások)[:\s]*(.*)'),
-            ]
-            
             summary = None
             recommendations = None
             
             # Próbáljuk meg az összes pattern-t
-            for sum_pattern, rec_pattern in patterns:
+            for sum_pattern, rec_pattern in MANUAL_SECTION_PATTERNS:
                 if not summary:
-                    sum_match = re.search(sum_pattern, response, re.IGNORECASE | re.DOTALL)
+                    sum_match = sum_pattern.search(response)
                     if sum_match:
                         summary = sum_match.group(1).strip()
                         logger.info(f"Summary pattern match találat, hossz: {len(summary)}")
                 
                 if not recommendations:
-                    rec_match = re.search(rec_pattern, response, re.IGNORECASE | re.DOTALL)
+                    rec_match = rec_pattern.search(response)
                     if rec_match:
                         recommendations = rec_match.group(1).strip()
                         logger.info(f"Recommendations pattern match találat, hossz: {len(recommendations)}")
@@ -663,33 +1296,15 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
                     recommendations = response[break_point:].strip()
             
             # Tisztítás
-            # Eltávolítjuk a felesleges karaktereket és formázásokat
-            if summary:
-                # JSON maradványok
-                summary = summary.replace('"', '').replace('{', '').replace('}', '').replace("'", "")
-                summary = summary.replace('\\n', '\n').replace('\\t', ' ')
-                # Markdown
-                summary = re.sub(r'[#*`]', '', summary)
-                # Többszörös szóközök
-                summary = re.sub(r'\s+', ' ', summary)
-                # Címek és kulcsszavak eltávolítása
-                summary = re.sub(r'^(summary|összefoglaló)[:\s]*', '', summary, flags=re.IGNORECASE)
-                summary = summary.strip()
-            
-            if recommendations:
-                # JSON maradványok
-                recommendations = recommendations.replace('"', '').replace('{', '').replace('}', '').replace("'", "")
-                recommendations = recommendations.replace('\\n', '\n').replace('\\t', ' ')
-                # Markdown
-                recommendations = re.sub(r'[#*`]', '', recommendations)
-                # Többszörös szóközök
-                recommendations = re.sub(r'\s+', ' ', recommendations)
-                # Címek és kulcsszavak eltávolítása
-                recommendations = re.sub(r'^(recommendations|javaslatok|ajánlások)[:\s]*', '', recommendations, flags=re.IGNORECASE)
-                recommendations = recommendations.strip()
+            # Eltávolítjuk a felesleges karaktereket és formázásokat. A tisztítás sosem növeli a hosszt,
+            # így a már eleve túl rövid összefoglalót (és a hozzá tartozó javaslatokat) nem tisztítjuk
+            if summary and len(summary) > MANUAL_SUMMARY_MIN_CHARS:
+                summary = _clean_manual_section(summary, SUMMARY_PREFIX_RE)
             
             # Ellenőrzés
-            if summary and len(summary) > 50:
+            if summary and len(summary) > MANUAL_SUMMARY_MIN_CHARS:
+                if recommendations:
+                    recommendations = _clean_manual_section(recommendations, RECOMMENDATIONS_PREFIX_RE)
                 logger.info("Manuális parsing sikeres")
                 return (summary, recommendations or "A javaslatok automatikus generálása részben sikertelen. Kérlek tekintsd át manuálisan az elemzési eredményeket.")
             else:
@@ -708,12 +1323,15 @@ FONTOS: Válaszolj CSAK ezzel a JSON struktúrával:
                 "Automatikus javaslat generálás sikertelen. Manuális elemzés szükséges."
             )
 
-def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
+def generate_ai_summary_from_file(json_file_path: str,
+                                  generator: Optional[AISummaryGenerator] = None) -> Tuple[str, str]:
     """
     Segédfüggvény: AI összefoglaló generálása JSON fájlból
     
     Args:
         json_file_path: A JSON fájl elérési útja
+        generator: Újrahasznosítható generátor példány (pl. Streamlit cache_resource-ból);
+            ha nincs megadva, új példány készül
         
     Returns:
         Tuple[str, str]: (összefoglaló, javaslatok)
@@ -722,7 +1340,8 @@ def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
         with open(json_file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        generator = AISummaryGenerator()
+        if generator is None:
+            generator = AISummaryGenerator()
         return generator.generate_summary_and_recommendations(data)
         
     except FileNotFoundError:
@@ -734,91 +1353,10 @@ def generate_ai_summary_from_file(json_file_path: str) -> Tuple[str, str]:
 
 if __name__ == "__main__":
     # Teszt futtatás
-    # Példa: lista formátumú input (ahogy a való életben is érkezik)
-    test_data = [
-        {
-            "url": "https://example.com",
-            "ai_readiness_score": 75.5,
-            "meta_and_headings": {
-                "title": "Test Title - Example Site",
-                "title_length": 25,
-                "title_optimal": False,
-                "description": "This is a test description for the example website",
-                "description_length": 50,
-                "description_optimal": False,
-                "h1_count": 1,
-                "heading_hierarchy_valid": True,
-                "has_og_tags": True,
-                "has_twitter_card": False,
-                "headings": {"h1": 1, "h2": 3, "h3": 5}
-            },
-            "schema": {
-                "count": {"Article": 1, "BreadcrumbList": 1},
-                "has_breadcrumbs": True,
-                "validation_status": "enhanced",
-                "schema_completeness_score": 85
-            },
-            "content_quality": {
-                "overall_quality_score": 72,
-                "readability": {
-                    "word_count": 500,
-                    "readability_score": 80
-                },
-                "keyword_analysis": {
-                    "vocabulary_richness": 0.65
-                }
-            },
-            "platform_analysis": {
-                "chatgpt": {
-                    "compatibility_score": 75,
-                    "hybrid_score": 78,
-                    "ai_score": 80
-                },
-                "claude": {
-                    "compatibility_score": 70,
-                    "hybrid_score": 72,
-                    "ai_score": 74
-                }
-            },
-            "robots_txt": {"can_fetch": True},
-            "sitemap": {"exists": True},
-            "mobile_friendly": {"has_viewport": True},
-            "pagespeed_insights": {
-                "mobile": {"performance": 65, "seo": 88}
-            }
-        },
-        {
-            "url": "https://example2.com",
-            "ai_readiness_score": 45.2,
-            "meta_and_headings": {
-                "title": "Short",
-                "title_length": 5,
-                "title_optimal": False,
-                "description": None,
-                "description_length": 0,
-                "description_optimal": False,
-                "h1_count": 0,
-                "heading_hierarchy_valid": False,
-                "has_og_tags": False,
-                "has_twitter_card": False
-            },
-            "schema": {
-                "count": {},
-                "has_breadcrumbs": False,
-                "validation_status": "standard"
-            },
-            "content_quality": {
-                "overall_quality_score": 35,
-                "readability": {
-                    "word_count": 150,
-                    "readability_score": 45
-                }
-            },
-            "robots_txt": {"can_fetch": True},
-            "sitemap": {"exists": False},
-            "mobile_friendly": {"has_viewport": False}
-        }
-    ]
+    # Példa: lista formátumú input (ahogy a való életben is érkezik) - a modul melletti JSON mintafájlból
+    sample_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_summary_sample_data.json")
+    with open(sample_path, "r", encoding="utf-8") as f:
+        test_data = json.load(f)
     
     try:
         generator = AISummaryGenerator()
@@ -1,13 +1,27 @@
 import streamlit as st
+import io
 import json
 import os
 from main import analyze_urls_enhanced, GEOAnalyzer
 from report import generate_html_report, generate_csv_export
 from advanced_reporting import AdvancedReportGenerator  
 import time
+from pathlib import Path
 from config import GOOGLE_API_KEY, OPENAI_API_KEY
 import pandas as pd
 
+@st.cache_resource
+def get_summary_generator():
+    """AI összefoglaló generátor - ugyanaz az ai_summary példány, amit a report.py fájlból generálása is használ,
+    egy példány a Streamlit újrafuttatások között (OpenAI kliens + HTTP kapcsolatkészlet)"""
+    from ai_summary import _default_generator
+    return _default_generator()
+
+@st.cache_data(ttl=5)
+def load_cache_stats():
+    """Cache statisztikák - a cache mappa bejárása és a fájlok JSON parse-olása rövid ideig gyorsítótárazva"""
+    return GEOAnalyzer(use_cache=True).get_cache_stats()
+
 st.set_page_config(
     page_title="GEOcheck",
     page_icon="🚀",
@@ -67,8 +81,7 @@ if use_cache:
     st.sidebar.subheader("💾 Cache állapot")
     if st.sidebar.button("Cache statisztikák"):
         try:
-            analyzer = GEOAnalyzer(use_cache=True)
-            cache_stats = analyzer.get_cache_stats()
+            cache_stats = load_cache_stats()
             if cache_stats.get('cache_enabled'):
                 st.sidebar.success(f"Cache fájlok: {cache_stats.get('total_files', 0)}")
                 st.sidebar.info(f"Méret: {cache_stats.get('total_size_mb', 0)} MB")
@@ -81,6 +94,7 @@ if use_cache:
         try:
             analyzer = GEOAnalyzer(use_cache=True)
             clear_result = analyzer.clear_all_cache()
+            load_cache_stats.clear()
             if clear_result.get('status') == 'success':
                 st.sidebar.success(f"✅ {clear_result.get('message', 'Cache törölve')}")
             else:
@@ -106,7 +120,7 @@ with col1:
             height=200,
             placeholder="https://example.com\nhttps://another-site.com\nhttps://third-site.com"
         )
-        url_list = [url.strip() for url in urls_text.split('\n') if url.strip()]
+        url_list = [url for url in (line.strip() for line in urls_text.splitlines()) if url]
     
     else:
         uploaded_file = st.file_uploader(
@@ -117,8 +131,13 @@ with col1:
         
         url_list = []
         if uploaded_file:
-            content = str(uploaded_file.read(), "utf-8")
-            url_list = [url.strip() for url in content.split('\n') if url.strip()]
+            # Soronkénti dekódolás: nem készül a teljes fájlból egy str és egy sorlista másolat
+            text_stream = io.TextIOWrapper(uploaded_file, encoding="utf-8")
+            try:
+                url_list = [url.strip() for url in text_stream if url.strip()]
+            finally:
+                # A wrapper ne zárja le a feltöltött fájl objektumot
+                text_stream.detach()
 
 with col2:
     st.header("📊 Elemzés indítása")
@@ -129,6 +148,8 @@ with col2:
         if not url_list:
             st.error("❌ Nem adtál meg URL-eket!")
         else:
+            # Előző futás letöltései ne maradjanak meg egy sikertelen új elemzés mellett
+            st.session_state.pop("downloads", None)
             # Progress bar és status
             progress_bar = st.progress(0)
             status_text = st.empty()
@@ -148,7 +169,7 @@ with col2:
                 progress_bar.progress(20)
                 
                 # Enhanced elemzés futtatása
-                analyze_urls_enhanced(
+                results = analyze_urls_enhanced(
                     url_list=url_list,
                     api_key=api_key if not skip_pagespeed else None,
                     output_file=json_filename,
@@ -159,19 +180,26 @@ with col2:
                     use_ai=use_ai_evaluation,
                     force_refresh=force_refresh
                 )
+                # Az elemzés új cache bejegyzéseket írhatott
+                load_cache_stats.clear()
                 
                 progress_bar.progress(70)
                 status_text.text("📋 AI jelentés lekérése...")
                 
                 # HTML jelentés
-                generate_html_report(json_filename, html_filename)
+                generate_html_report(
+                    json_filename,
+                    html_filename,
+                    summary_generator=get_summary_generator() if OPENAI_API_KEY else None,
+                    data=results
+                )
                 
                 progress_bar.progress(90)
                 status_text.text("📊 CSV export...")
                 
                 # CSV export
                 csv_filename = f"geo_enhanced_export_{timestamp}.csv"
-                generate_csv_export(json_filename, csv_filename)
+                generate_csv_export(json_filename, csv_filename, data=results)
                 
                 progress_bar.progress(100)
                 
@@ -179,42 +207,52 @@ with col2:
                 elapsed_time = time.time() - start_time
                 status_text.text(f"✅ GEO elemzés befejezve! ({elapsed_time:.1f} másodperc)")
                 
-                # Download gombok
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    with open(json_filename, 'rb') as f:
-                        st.download_button(
-                            "📄 JSON jelentés letöltése",
-                            f,
-                            file_name=json_filename,
-                            mime="application/json"
-                        )
-                
-                with col2:
-                    with open(html_filename, 'rb') as f:
-                        st.download_button(
-                            "📊 HTML jelentés letöltése",
-                            f,
-                            type="primary",
-                            file_name=html_filename,
-                            mime="text/html"
-                        )
-                
-                with col3:
-                    with open(csv_filename, 'rb') as f:
-                        st.download_button(
-                            "📈 CSV jelentés letöltése",
-                            f,
-                            file_name=csv_filename,
-                            mime="text/csv"
-                        )
+                # Letölthető fájlok beolvasása egyszer - a gombok a session_state-ből szolgálják ki
+                # a további újrafuttatásokat (pl. egy másik letöltés kattintása) fájlolvasás nélkül
+                st.session_state["downloads"] = {
+                    "json": (json_filename, Path(json_filename).read_bytes()),
+                    "html": (html_filename, Path(html_filename).read_bytes()),
+                    "csv": (csv_filename, Path(csv_filename).read_bytes()),
+                }
             
             except Exception as e:
                 st.error(f"❌ Hiba történt az enhanced elemzés során: {str(e)}")
                 status_text.text("❌ Enhanced elemzés megszakítva")
                 import traceback
                 st.code(traceback.format_exc())
+    
+    # Download gombok
+    downloads = st.session_state.get("downloads")
+    if downloads:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            json_name, json_bytes = downloads["json"]
+            st.download_button(
+                "📄 JSON jelentés letöltése",
+                json_bytes,
+                file_name=json_name,
+                mime="application/json"
+            )
+        
+        with col2:
+            html_name, html_bytes = downloads["html"]
+            st.download_button(
+                "📊 HTML jelentés letöltése",
+                html_bytes,
+                type="primary",
+                file_name=html_name,
+                mime="text/html"
+            )
+        
+        with col3:
+            csv_name, csv_bytes = downloads["csv"]
+            st.download_button(
+                "📈 CSV jelentés letöltése",
+                csv_bytes,
+                file_name=csv_name,
+                mime="text/csv"
+            )
 
 st.markdown("")
 col1, col2 = st.columns([1, 1])
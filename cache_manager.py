@@ -85,28 +85,38 @@ class CacheManager:
         return deleted_count
     
     def get_cache_stats(self) -> Dict:
-        """Cache statisztikák"""
-        cache_files = list(self.cache_dir.glob("*.json"))
-        total_size = sum(f.stat().st_size for f in cache_files if f.exists())
-        
+        """Cache statisztikák - egyetlen os.scandir bejárással (méret, érvényesség egy menetben)"""
+        total_files = 0
+        total_size = 0
         valid_count = 0
         expired_count = 0
+        now = time.time()
         
-        for cache_file in cache_files:
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                if time.time() > cache_data.get('expires_at', 0):
-                    expired_count += 1
-                else:
-                    valid_count += 1
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.json'):
+                        continue
+                    total_files += 1
                     
-            except (json.JSONDecodeError, KeyError, OSError):
-                expired_count += 1
+                    try:
+                        total_size += entry.stat().st_size
+                        with open(entry.path, 'r', encoding='utf-8') as f:
+                            cache_data = json.load(f)
+                        
+                        if now > cache_data.get('expires_at', 0):
+                            expired_count += 1
+                        else:
+                            valid_count += 1
+                            
+                    except (json.JSONDecodeError, KeyError, OSError):
+                        expired_count += 1
+        except FileNotFoundError:
+            # A cache mappa időközben törlődött - üres statisztika
+            pass
         
         return {
-            "total_files": len(cache_files),
+            "total_files": total_files,
             "valid_files": valid_count,
             "expired_files": expired_count,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
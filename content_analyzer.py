@@ -6,6 +6,13 @@ from collections import Counter
 import urllib.parse
 
 
+# Class alapú CSS selectorok (case-insensitive) - regex class_ szűrés helyett egy selector bejárás
+_MAIN_CONTENT_SELECTOR = 'div[class*="content" i], div[class*="main" i], div[class*="post" i]'
+_DATE_CLASS_SELECTOR = '[class*="date" i], [class*="published" i], [class*="updated" i]'
+_CTA_LINK_SELECTOR = 'a[class*="btn" i], a[class*="button" i], a[class*="cta" i]'
+_COMMENT_CLASS_SELECTOR = '[class*="comment" i], [class*="discussion" i]'
+
+
 class ContentQualityAnalyzer:
     """Tartalom minőség és releváns elemzés AI optimalizáláshoz"""
     
@@ -44,7 +51,7 @@ class ContentQualityAnalyzer:
     
     def analyze_content_quality(self, html: str, url: str) -> Dict:
         """Teljes tartalom minőség elemzés"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         # Tiszta szöveg kinyerése
         text_content = self._extract_clean_text(soup)
@@ -68,7 +75,7 @@ class ContentQualityAnalyzer:
             script.decompose()
         
         # Főtartalom keresése
-        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main|post', re.I))
+        main_content = soup.find('main') or soup.find('article') or soup.select_one(_MAIN_CONTENT_SELECTOR)
         
         if main_content:
             text = main_content.get_text()
@@ -219,7 +226,7 @@ class ContentQualityAnalyzer:
         
         # Dátum információk
         date_elements = soup.find_all(['time', '[datetime]']) + \
-                       soup.find_all(attrs={'class': re.compile(r'date|published|updated', re.I)})
+                       soup.select(_DATE_CLASS_SELECTOR)
         has_dates = len(date_elements) > 0
         
         # Kapcsolat és social linkek
@@ -284,7 +291,7 @@ class ContentQualityAnalyzer:
         
         # CTA elemek
         cta_elements = len(soup.find_all(['button', '[role="button"]'])) + \
-                      len(soup.find_all('a', class_=re.compile(r'btn|button|cta', re.I)))
+                      len(soup.select(_CTA_LINK_SELECTOR))
         
         return {
             "intent_scores": intent_scores,
@@ -379,7 +386,7 @@ class ContentQualityAnalyzer:
         buttons = len(soup.find_all(['button', 'input[type="submit"]', 'input[type="button"]']))
         
         # Közösségi funkciók
-        comments = len(soup.find_all(class_=re.compile(r'comment|discussion', re.I)))
+        comments = len(soup.select(_COMMENT_CLASS_SELECTOR))
         sharing = len(soup.find_all(['[data-share]', '[class*="share"]']))
         
         # Navigációs elemek
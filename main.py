@@ -6,6 +6,7 @@ from urllib.robotparser import RobotFileParser
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Tuple, List, Optional
 import time
+import heapq
 from dotenv import load_dotenv
 import os
 import re
@@ -20,6 +21,20 @@ from ai_evaluator import AIContentEvaluator
 from schema_validator import SchemaValidator
 from config import GOOGLE_API_KEY
 
+def _schema_has_key(data, key: str) -> bool:
+    """Kulcs keresés a JSON-LD fában - iteratív bejárás, str() szerializálás nélkül, az első találatnál kilép"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if key in node:
+                return True
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return False
+
+
 # .env fájl betöltése - most már a config.py kezeli
 # load_dotenv()  # Ezt már nem kell, mert a config.py kezeli
 # GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")  # Ezt már nem kell
@@ -141,7 +156,7 @@ class GEOAnalyzer:
     
     def check_schema(self, html: str) -> Dict[str, any]:
         """Enhanced Schema.org ellenőrzés"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         schemas = soup.find_all("script", type="application/ld+json")
         
         schema_info = {
@@ -185,8 +200,8 @@ class GEOAnalyzer:
                     if schema_type:
                         schema_info["details"].append({
                             "type": schema_type,
-                            "has_image": "@image" in str(item) or "image" in item,
-                            "has_rating": "aggregateRating" in str(item) or "aggregateRating" in item
+                            "has_image": "image" in item or _schema_has_key(item, "@image"),
+                            "has_rating": _schema_has_key(item, "aggregateRating")
                         })
                         
             except json.JSONDecodeError as e:
@@ -200,7 +215,7 @@ class GEOAnalyzer:
     
     def check_meta_and_headings(self, html: str) -> Dict:
         """Metaadatok és heading struktúra részletes elemzése"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         # Title elemzés
         title = soup.title.string.strip() if soup.title and soup.title.string else None
@@ -255,7 +270,7 @@ class GEOAnalyzer:
     
     def check_mobile_friendly(self, html: str) -> Dict:
         """Mobile-friendly részletes ellenőrzés"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         result = {
             "has_viewport": False,
@@ -550,7 +565,7 @@ class GEOAnalyzer:
                 print("  🤖 AI Content Evaluation...")
                 try:
                     # Tiszta szöveg kinyerése
-                    soup = BeautifulSoup(html, 'html.parser')
+                    soup = BeautifulSoup(html, 'lxml')
                     for script in soup(["script", "style", "nav", "footer"]):
                         script.decompose()
                     clean_text = soup.get_text()
@@ -695,8 +710,14 @@ def analyze_urls_enhanced(url_list: List[str], api_key: Optional[str] = None,
                          output_file: str = "geo_enhanced_analysis.json",
                          parallel: bool = True, skip_pagespeed: bool = False,
                          max_workers: int = 2, use_cache: bool = True, 
-                         use_ai: bool = False, force_refresh: bool = False) -> None:
-    """Enhanced fő elemző függvény - AI és cache támogatással"""
+                         use_ai: bool = False, force_refresh: bool = False) -> List[Dict]:
+    """
+    Enhanced fő elemző függvény - AI és cache támogatással
+
+    Returns:
+        List[Dict]: Az elemzési eredmények (ugyanaz a lista, ami az output_file-ba kerül),
+            így a hívó újraolvasás nélkül feldolgozhatja
+    """
     
     analyzer = GEOAnalyzer(api_key, use_cache=use_cache, use_ai=use_ai)
     
@@ -742,32 +763,46 @@ def analyze_urls_enhanced(url_list: List[str], api_key: Optional[str] = None,
     print(f"💾 Jelentés: {output_file}")
     print(f"{'='*60}")
     
-    # Enhanced összefoglaló statisztikák
-    valid_results = [r for r in results if 'ai_readiness_score' in r and 'error' not in r]
-    error_results = [r for r in results if 'error' in r]
-    ai_enhanced_results = [r for r in valid_results if r.get('ai_content_evaluation')]
-    schema_enhanced_results = [r for r in valid_results if r.get('schema', {}).get('validation_status') == 'enhanced']
-    cached_results = [r for r in valid_results if r.get('cached')]
+    # Enhanced összefoglaló statisztikák - egyetlen menetben
+    valid_results = []
+    error_results = []
+    ai_enhanced_count = schema_enhanced_count = cached_count = 0
+    score_total = 0
+    for r in results:
+        if 'error' in r:
+            error_results.append(r)
+            continue
+        if 'ai_readiness_score' not in r:
+            continue
+        valid_results.append(r)
+        score_total += r['ai_readiness_score']
+        if r.get('ai_content_evaluation'):
+            ai_enhanced_count += 1
+        if r.get('schema', {}).get('validation_status') == 'enhanced':
+            schema_enhanced_count += 1
+        if r.get('cached'):
+            cached_count += 1
     
     if valid_results:
-        avg_score = sum(r['ai_readiness_score'] for r in valid_results) / len(valid_results)
+        avg_score = score_total / len(valid_results)
         print(f"\n📊 Enhanced Összefoglaló:")
         print(f"  • Sikeres elemzések: {len(valid_results)}/{len(results)}")
         print(f"  • Átlagos AI-readiness score: {avg_score:.1f}/100")
-        print(f"  • 🤖 AI Enhanced eredmények: {len(ai_enhanced_results)}")
-        print(f"  • 🏗️ Schema Enhanced eredmények: {len(schema_enhanced_results)}")
-        print(f"  • 💾 Cache találatok: {len(cached_results)}")
+        print(f"  • 🤖 AI Enhanced eredmények: {ai_enhanced_count}")
+        print(f"  • 🏗️ Schema Enhanced eredmények: {schema_enhanced_count}")
+        print(f"  • 💾 Cache találatok: {cached_count}")
         
         if use_cache:
-            cache_hit_rate = (len(cached_results) / len(valid_results)) * 100
+            cache_hit_rate = (cached_count / len(valid_results)) * 100
             print(f"  • Cache hit rate: {cache_hit_rate:.1f}%")
         
-        # Top 3 és Bottom 3
-        sorted_results = sorted(valid_results, key=lambda x: x['ai_readiness_score'], reverse=True)
+        # Top 3 és Bottom 3 - teljes rendezés helyett heap alapú kiválasztás
+        score_key = lambda x: x['ai_readiness_score']
+        top_results = heapq.nlargest(3, valid_results, key=score_key)
         
-        if sorted_results:
+        if top_results:
             print("\n🏆 Legjobb oldalak:")
-            for r in sorted_results[:3]:
+            for r in top_results:
                 flags = []
                 if r.get('ai_content_evaluation'):
                     flags.append('🤖')
@@ -779,9 +814,11 @@ def analyze_urls_enhanced(url_list: List[str], api_key: Optional[str] = None,
                 flag_str = "".join(flags)
                 print(f"  • {r['url']}: {r['ai_readiness_score']}/100 {flag_str}")
         
-        if len(sorted_results) > 3:
+        if len(valid_results) > 3:
             print("\n🔧 Fejlesztendő oldalak:")
-            for r in sorted_results[-3:]:
+            # Fordított bejárás: egyenlő pontszámnál ugyanazokat adja, mint a csökkenő rendezés vége
+            bottom_results = heapq.nsmallest(3, reversed(valid_results), key=score_key)
+            for r in reversed(bottom_results):
                 if r['ai_readiness_score'] < 50:
                     print(f"  • {r['url']}: {r['ai_readiness_score']}/100")
     
@@ -802,6 +839,8 @@ def analyze_urls_enhanced(url_list: List[str], api_key: Optional[str] = None,
                 print(f"  • Cache méret: {cache_stats.get('total_size_mb', 0)} MB")
         except Exception as e:
             print(f"⚠️ Cache statisztikák hiba: {e}")
+    
+    return results
 
 
 # Backwards compatibility
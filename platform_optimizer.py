@@ -1429,7 +1429,7 @@ class MultiPlatformGEOAnalyzer:
     
     def analyze_all_platforms(self, html: str, url: str) -> Dict:
         """Összes platform elemzése VALÓS ML scoring-gal"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         text_content = self._extract_clean_text(soup)
         
         results = {}
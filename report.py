@@ -1,10 +1,18 @@
 import json
 import csv
 import re
+from bisect import bisect_right
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import html
 
+# Opcionális: orjson gyorsabb eredményfájl betöltéshez
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # --------------------------------
 # Súgó szövegek (Mit jelent melyik mutató?)
 # --------------------------------
@@ -94,6 +102,20 @@ HELP_TEXTS = {
     "analysis_method": "Milyen módszerrel történt az elemzés: valós AI API vagy heurisztikus fallback."
 }
 
+def _load_json_file(json_file: str) -> Any:
+    """JSON fájl betöltése bináris olvasással és orjson parse-szal, ha elérhető -
+    amit az orjson elutasít (pl. a json.dump által írt NaN), azt a stdlib json olvassa be"""
+    with open(json_file, 'rb') as f:
+        content = f.read()
+    
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content.decode('utf-8'))
+
+
 def help_icon(key: str) -> str:
     """Súgó ikon generálása tooltip-pel"""
     help_text = HELP_TEXTS.get(key, "")
@@ -103,24 +125,29 @@ def help_icon(key: str) -> str:
     escaped_text = html.escape(help_text)
     return f'<span class="help-icon ms-1" data-bs-toggle="tooltip" data-bs-placement="top" title="{escaped_text}">❓</span>'
 
+# Pontszám sávok: bisect_right(SCORE_THRESHOLDS, score) adja a szint / CSS osztály indexét (>= 40 / 60 / 85)
+SCORE_THRESHOLDS = (40, 60, 85)
+SCORE_LEVELS = ("Fejlesztendő", "Közepes", "Jó", "Kiváló")
+SCORE_CLASSES = ("score-poor", "score-average", "score-good", "score-excellent")
+
+def _score_band(score: float) -> int:
+    """Pontszám sáv indexe; NaN a legalsó sávba kerül (mint a korábbi >= összehasonlításoknál)"""
+    if score != score:
+        return 0
+    return bisect_right(SCORE_THRESHOLDS, score)
+
 # Helper függvények
 def level_from_score(score: float) -> str:
     """AI Readiness szint meghatározása pontszám alapján"""
     if score is None: 
         return "Ismeretlen"
-    if score >= 85: return "Kiváló"
-    if score >= 60: return "Jó"
-    if score >= 40: return "Közepes"
-    return "Fejlesztendő"
+    return SCORE_LEVELS[_score_band(score)]
 
 def badge_class(score: float) -> str:
     """CSS osztály meghatározása pontszám alapján"""
     if score is None: 
         return "score-average"
-    if score >= 85: return "score-excellent"
-    if score >= 60: return "score-good"
-    if score >= 40: return "score-average"
-    return "score-poor"
+    return SCORE_CLASSES[_score_band(score)]
 
 def fmt(x, digits=1):
     """Biztonságos formázás"""
@@ -161,19 +188,30 @@ def detect_enhanced_analysis(data: List[Dict]) -> Dict:
     }
 
 def generate_html_report(json_file: str = "ai_readiness_full_report.json", 
-                        output_file: str = "report.html") -> None:
+                        output_file: str = "report.html",
+                        summary_generator=None,
+                        data=None) -> None:
     """
     Enhanced HTML jelentés generálása - automatikus enhanced/standard felismeréssel
+
+    Args:
+        json_file: Az elemzési eredmények JSON fájlja
+        output_file: A generált HTML fájl neve
+        summary_generator: Opcionális, már létrehozott ai_summary.AISummaryGenerator
+            (pl. a Streamlit app gyorsítótárazott példánya); ha nincs megadva, az
+            ai_summary.generate_ai_summary_from_file a modul saját példányát használja
+        data: Opcionális, már memóriában lévő elemzési eredmény (pl. az
+            analyze_urls_enhanced visszatérési értéke); megadásakor a fájl nem kerül újraolvasásra
     """
-    try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Hiba: {json_file} nem található!")
-        return
-    except json.JSONDecodeError:
-        print(f"❌ Hiba: {json_file} nem érvényes JSON!")
-        return
+    if data is None:
+        try:
+            data = _load_json_file(json_file)
+        except FileNotFoundError:
+            print(f"❌ Hiba: {json_file} nem található!")
+            return
+        except json.JSONDecodeError:
+            print(f"❌ Hiba: {json_file} nem érvényes JSON!")
+            return
 
     # Enhanced analysis detektálása
     # Ha a data dict és tartalmaz results kulcsot, akkor azt használjuk
@@ -983,8 +1021,12 @@ def generate_html_report(json_file: str = "ai_readiness_full_report.json",
             
             if (os.getenv("OPENAI_API_KEY") and 
                 (force_generation or not json_file.startswith('test_'))):
-                from ai_summary import generate_ai_summary_from_file
-                summary, recommendations = generate_ai_summary_from_file(json_file)
+                if summary_generator is not None:
+                    # A már betöltött adatot használjuk, nem olvassuk újra a fájlt
+                    summary, recommendations = summary_generator.generate_summary_and_recommendations(data)
+                else:
+                    from ai_summary import generate_ai_summary_from_file
+                    summary, recommendations = generate_ai_summary_from_file(json_file)
         except Exception as e:
             # Ha hiba van, marad az alapértelmezett szöveg
             if force_generation:
@@ -2070,15 +2112,24 @@ def generate_html_report(json_file: str = "ai_readiness_full_report.json",
 
 
 def generate_csv_export(json_file: str = "ai_readiness_full_report.json",
-                        output_file: str = "ai_readiness_report.csv") -> None:
-    """Enhanced CSV export generálása"""
+                        output_file: str = "ai_readiness_report.csv",
+                        data=None) -> None:
+    """
+    Enhanced CSV export generálása
+
+    Args:
+        json_file: Az elemzési eredmények JSON fájlja
+        output_file: A generált CSV fájl neve
+        data: Opcionális, már memóriában lévő elemzési eredmény; megadásakor
+            a fájl nem kerül újraolvasásra
+    """
     
-    try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"❌ Hiba: {e}")
-        return
+    if data is None:
+        try:
+            data = _load_json_file(json_file)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"❌ Hiba: {e}")
+            return
     
     # Data normalizálás
     if isinstance(data, dict) and 'results' in data:
@@ -1,6 +1,7 @@
 import json
 import csv
 import re
+from bisect import bisect_right
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import html
@@ -103,24 +104,29 @@ def help_icon(key: str) -> str:
     escaped_text = html.escape(help_text)
     return f'<span class="help-icon ms-1" data-bs-toggle="tooltip" data-bs-placement="top" title="{escaped_text}">❓</span>'
 
+# Pontszám sávok: bisect_right(SCORE_THRESHOLDS, score) adja a szint / CSS osztály indexét (>= 40 / 60 / 85)
+SCORE_THRESHOLDS = (40, 60, 85)
+SCORE_LEVELS = ("Fejlesztendő", "Közepes", "Jó", "Kiváló")
+SCORE_CLASSES = ("score-poor", "score-average", "score-good", "score-excellent")
+
+def _score_band(score: float) -> int:
+    """Pontszám sáv indexe; NaN a legalsó sávba kerül (mint a korábbi >= összehasonlításoknál)"""
+    if score != score:
+        return 0
+    return bisect_right(SCORE_THRESHOLDS, score)
+
 # Helper függvények
 def level_from_score(score: float) -> str:
     """AI Readiness szint meghatározása pontszám alapján"""
     if score is None: 
         return "Ismeretlen"
-    if score >= 85: return "Kiváló"
-    if score >= 60: return "Jó"
-    if score >= 40: return "Közepes"
-    return "Fejlesztendő"
+    return SCORE_LEVELS[_score_band(score)]
 
 def badge_class(score: float) -> str:
     """CSS osztály meghatározása pontszám alapján"""
     if score is None: 
         return "score-average"
-    if score >= 85: return "score-excellent"
-    if score >= 60: return "score-good"
-    if score >= 40: return "score-average"
-    return "score-poor"
+    return SCORE_CLASSES[_score_band(score)]
 
 def fmt(x, digits=1):
     """Biztonságos formázás"""
@@ -211,7 +211,7 @@ class SchemaValidator:
     
     def _validate_locally(self, html: str) -> Dict:
         """Lokális Schema.org validáció a specifikáció alapján"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         schemas = self._extract_schemas(soup)
         
         validation_results = []
@@ -612,7 +612,7 @@ class SchemaValidator:
             
             if response.status_code == 200:
                 # Parse results
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.text, 'lxml')
                 errors = soup.find_all(class_="error")
                 warnings = soup.find_all(class_="warning")
                 
@@ -655,7 +655,7 @@ class SchemaValidator:
             
             # Parse eredmények
             page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, 'lxml')
             
             # Rich results detektálása
             valid_items = soup.find_all(class_="valid-item")